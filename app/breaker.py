@@ -0,0 +1,181 @@
+"""Per-source retries with backoff, circuit breakers that rest failing job boards,
+and the time budget each source gets per scan."""
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+import httpx
+
+from app.config import (
+    RETRY_ATTEMPTS,
+    RETRY_BACKOFF_SECONDS,
+    RETRY_MAX_BACKOFF_SECONDS,
+    RETRY_STATUSES,
+    BREAKER_FAILURE_STATUSES,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_COOLDOWN_SECONDS,
+    BREAKER_MAX_COOLDOWN_SECONDS,
+)
+from app.database import get_source_health, save_source_health
+from app.metrics import SCRAPER_REQUEST_SECONDS
+from app.scans import SourceStats
+
+logger = logging.getLogger(__name__)
+
+
+class SourceUnavailable(Exception):
+    """The source's circuit is open: no requests until its cooldown ends."""
+
+
+class DeadlineExceeded(SourceUnavailable):
+    """The source's time budget for this scan is spent."""
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+@dataclass
+class CircuitBreaker:
+    """Health of one source across scans (persisted, so every worker agrees).
+
+    closed: requests flow. After BREAKER_FAILURE_THRESHOLD consecutive failed
+    requests it opens and the source is skipped until retry_at. The first scan
+    after that runs it half-open: a success closes the circuit, a failure
+    reopens it with the cooldown doubled (up to BREAKER_MAX_COOLDOWN_SECONDS)."""
+
+    source: str
+    state: str = "closed"  # closed | open | half_open
+    failures: int = 0
+    cooldown_seconds: float = BREAKER_COOLDOWN_SECONDS
+    opened_at: Optional[str] = None
+    retry_at: Optional[str] = None
+    last_error: Optional[str] = None
+    last_failure_at: Optional[str] = None
+    last_success_at: Optional[str] = None
+
+    @classmethod
+    def load(cls, source: str) -> "CircuitBreaker":
+        row = get_source_health().get(source)
+        return cls(**row) if row else cls(source=source)
+
+    def save(self):
+        save_source_health(asdict(self))
+
+    def allow(self) -> bool:
+        if self.state == "open":
+            if self.retry_at and _now().isoformat() < self.retry_at:
+                return False
+            self.state = "half_open"
+        return True
+
+    def record_success(self):
+        self.state = "closed"
+        self.failures = 0
+        self.retry_at = None
+        self.cooldown_seconds = BREAKER_COOLDOWN_SECONDS
+        self.last_success_at = _now().isoformat()
+
+    def record_failure(self, error: str):
+        now = _now()
+        self.failures += 1
+        self.last_error = error
+        self.last_failure_at = now.isoformat()
+        if self.state == "half_open":
+            self.cooldown_seconds = min(self.cooldown_seconds * 2, BREAKER_MAX_COOLDOWN_SECONDS)
+        elif self.failures < BREAKER_FAILURE_THRESHOLD:
+            return
+        self.state = "open"
+        self.opened_at = now.isoformat()
+        self.retry_at = (now + timedelta(seconds=self.cooldown_seconds)).isoformat()
+        logger.warning(
+            "%s: circuit open after %d failures (%s), retrying after %s",
+            self.source, self.failures, error, self.retry_at,
+        )
+
+
+def _backoff(attempt: int, resp: Optional[httpx.Response]) -> float:
+    """Exponential backoff with full jitter, stretched to honour Retry-After."""
+    delay = random.uniform(0, min(RETRY_MAX_BACKOFF_SECONDS, RETRY_BACKOFF_SECONDS * 2 ** attempt))
+    retry_after = resp.headers.get("Retry-After", "") if resp is not None else ""
+    if retry_after.isdigit():
+        delay = max(delay, min(float(retry_after), RETRY_MAX_BACKOFF_SECONDS))
+    return delay
+
+
+class SourceClient:
+    """Stands in for the shared httpx client inside one source's scraper:
+    retries transient failures and reports every outcome to the source's breaker.
+
+    With a deadline (event loop time) a request still running when it passes
+    is cancelled, and later ones fail at once, with DeadlineExceeded; the
+    client is then `truncated`. Every attempt is counted in `stats`, and each
+    request that ends in an error or a status other than 200 in `failed`: the
+    listings behind it weren't seen, so they mustn't count as missed. Time
+    spent in retry backoff and politeness delays adds up in `waited`."""
+
+    def __init__(self, client: httpx.AsyncClient, breaker: CircuitBreaker, deadline: Optional[float] = None):
+        self._client = client
+        self.breaker = breaker
+        self.deadline = deadline
+        self.truncated = False
+        self.failed = 0
+        self.waited = 0.0
+        self.stats = SourceStats()
+
+    async def get(self, url: str, **kwargs) -> httpx.Response:
+        if not self.breaker.allow():
+            raise SourceUnavailable(f"{self.breaker.source} circuit open until {self.breaker.retry_at}")
+        resp: Optional[httpx.Response] = None
+        error: Optional[Exception] = None
+        try:
+            # httpx timeouts apply per network operation; this bounds the whole request
+            async with asyncio.timeout_at(self.deadline):
+                for attempt in range(RETRY_ATTEMPTS):
+                    if attempt:
+                        await self.pause(_backoff(attempt - 1, resp))
+                    start = time.perf_counter()
+                    try:
+                        resp = await self._client.get(url, **kwargs)
+                        error = None
+                    except httpx.TransportError as e:  # timeouts, refused and reset connections
+                        self._record(start, "error")
+                        resp, error = None, e
+                        continue
+                    except asyncio.CancelledError:
+                        self._record(start, "cancelled")
+                        raise
+                    self._record(start, str(resp.status_code), len(resp.content))
+                    if resp.status_code not in RETRY_STATUSES:
+                        break
+        except TimeoutError:
+            # Our budget, not the source's fault: the breaker isn't told
+            self.truncated = True
+            raise DeadlineExceeded(f"{self.breaker.source} is out of time for this scan")
+        if error is not None or resp.status_code != 200:
+            self.failed += 1
+        if error is not None:
+            self.breaker.record_failure(f"{type(error).__name__}: {error}")
+            raise error
+        if resp.status_code in BREAKER_FAILURE_STATUSES:
+            self.breaker.record_failure(f"HTTP {resp.status_code}")
+        else:
+            self.breaker.record_success()
+        return resp
+
+    async def pause(self, seconds: float):
+        start = time.perf_counter()
+        try:
+            await asyncio.sleep(seconds)
+        finally:
+            self.waited += time.perf_counter() - start
+
+    def _record(self, start: float, status: str, size: int = 0):
+        seconds = time.perf_counter() - start
+        self.stats.record_request(seconds, status, size)
+        SCRAPER_REQUEST_SECONDS.observe(seconds, self.breaker.source, status)
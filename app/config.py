@@ -110,6 +110,10 @@ DUTCH_WORDS = {
 DUTCH_WORD_THRESHOLD_TITLE = 2
 DUTCH_WORD_THRESHOLD_BODY = 5
 
+# Character-trigram language-ID model: blends into the detection confidence and
+# flags long texts the word list misses as "dutch_preferred"
+DUTCH_NGRAM_ENABLED = False
+
 # Scoring weights — higher = better match for Katya's profile
 ROLE_SCORES = {
     # Finance (highest — 12 years experience)
@@ -194,6 +198,16 @@ CITY_BONUS = {
 # Salary
 DEFAULT_MIN_SALARY = 3000  # EUR bruto/month
 
+# Multipliers that normalise hourly/daily/weekly/yearly amounts to monthly gross
+# (40-hour week, 52 weeks a year)
+SALARY_PERIOD_TO_MONTH = {
+    "hour": 40 * 52 / 12,
+    "day": 5 * 52 / 12,
+    "week": 52 / 12,
+    "month": 1,
+    "year": 1 / 12,
+}
+
 # Scraper settings
 REQUEST_TIMEOUT = 15
 USER_AGENT = (
@@ -208,6 +222,103 @@ USER_AGENTS = [
     "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_0) AppleWebKit/605.1.15 (KHTML, like Gecko) Version/17.0 Safari/605.1.15",
 ]
 SCRAPE_INTERVAL_HOURS = 6
+# Incremental scans skip listings already in the database (no rescoring) and
+# stop paginating at a page of only known listings. POST /api/scrape?full=true
+# forces a full pass.
+INCREMENTAL_SCAN = True
+# Time budgets: requests still running when a source's or the whole scan's
+# budget runs out are cancelled, what was collected is kept, and the scan
+# reports the sources it cut short. POST /api/scrape?budget= overrides the scan's.
+SCAN_BUDGET_SECONDS = 15 * 60
+SOURCE_BUDGET_SECONDS = 4 * 60
+# Near-duplicate clustering: MinHash over title trigrams, LSH with BANDS x ROWS
+# permutations. Titles must reach DEDUP_THRESHOLD estimated Jaccard similarity
+# (a stricter threshold when either listing has no company).
+DEDUP_BANDS = 10
+DEDUP_ROWS = 4
+DEDUP_THRESHOLD = 0.7
+DEDUP_THRESHOLD_NO_COMPANY = 0.85
+# A listing absent from this many consecutive scans of its source is marked closed
+CLOSE_AFTER_MISSED_SCANS = 3
+# Retries for scraper requests: transient failures (timeouts, connection errors,
+# RETRY_STATUSES) are retried with exponential backoff and full jitter
+RETRY_ATTEMPTS = 3                # tries per request, the first included
+RETRY_BACKOFF_SECONDS = 1.0
+RETRY_MAX_BACKOFF_SECONDS = 20.0  # also caps how long a Retry-After header is honoured
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Circuit breaker per source: this many failed requests in a row (after their
+# retries) open it, and the source is skipped until the cooldown ends. A source
+# failing again right after a cooldown waits twice as long next time.
+BREAKER_FAILURE_STATUSES = {403, 429, 500, 502, 503, 504}
+BREAKER_FAILURE_THRESHOLD = 3
+BREAKER_COOLDOWN_SECONDS = 30 * 60
+BREAKER_MAX_COOLDOWN_SECONDS = 24 * 3600
+# Query planning for boards with a search URL: each board's queries plus the
+# user's custom keywords, best recent yield (new jobs per request) first. A
+# query whose last QUERY_HISTORY_RUNS runs returned mostly listings that other
+# queries had already fetched (unique share at or below QUERY_MIN_UNIQUE_RATIO)
+# is skipped on incremental scans, and retried after QUERY_REPROBE_DAYS.
+QUERY_HISTORY_RUNS = 3
+QUERY_MIN_UNIQUE_RATIO = 0.1
+QUERY_REPROBE_DAYS = 7
+QUERY_HISTORY_DAYS = 60  # per-run yield records kept this long
+# Listing pages are parsed in a thread pool of this size while the next page downloads
+PARSE_WORKERS = 2
+# Selectors for custom job boards saved without their own (see BoardSpec in
+# app/scrapers.py). Boards whose cards none of these match are read from their
+# schema.org JobPosting data instead.
+GENERIC_BOARD_SELECTORS = {
+    "card": [
+        "article[class*='vacan'], article[class*='job']",
+        "li[class*='vacan'], li[class*='job']",
+        "div[class*='vacancy-item'], div[class*='job-item'], div[class*='job-card'], div[class*='jobCard']",
+    ],
+    "title": ["h2", "h3", "h4", "a"],
+    "link": ["a[href]@href", "@href"],
+    "company": ["[class*='company'], [class*='employer']"],
+    "location": ["[class*='location']"],
+    "date": ["time@datetime", "time"],
+}
+# Detail-page enrichment: jobs whose listing card had little or no text get
+# their detail page fetched for the full description, then are rescored. Jobs
+# over a scan's budget wait for the next scan. Fetched pages are cached by URL
+# in the database.
+DETAIL_FETCH_ENABLED = True
+DETAIL_MIN_SNIPPET_CHARS = 200     # fetch details when the card text is shorter
+DETAIL_MAX_PER_SCAN = 60           # network fetches per scan (cache hits are free)
+DETAIL_CONCURRENCY_PER_HOST = 2
+DETAIL_MAX_CHARS = 8000            # description text kept per job
+DETAIL_CACHE_DAYS = 30
+DETAIL_RETRY_FAILED_HOURS = 24     # failed fetches are cached for this long
+# Description containers tried after the page's JSON-LD JobPosting, per source
+DETAIL_SELECTORS = {
+    "linkedin": [".show-more-less-html__markup", ".description__text"],
+    "iamexpat": ["[class*='job-description']", "[class*='JobDescription']"],
+    "undutchables": [".vacancy-description", "[class*='vacancy__description']"],
+    "adams": [".vacancy-description", "[class*='vacancy-content']"],
+}
+DETAIL_FALLBACK_SELECTORS = ["[class*='description']", "article", "main"]
+# zlib level for stored descriptions and cached detail pages (1 fastest .. 9 smallest)
+DESCRIPTION_COMPRESSION_LEVEL = 6
+# Built-in scheduler: sources listed here scan on their own interval, the rest
+# every SCRAPE_INTERVAL_HOURS. Sources sharing an interval scan together.
+SCRAPE_SOURCE_INTERVAL_HOURS = {
+    "remoteok": 12,
+    "weworkremotely": 12,
+}
+SCHEDULER_ENABLED = True          # override with SCHEDULER_ENABLED=0 in the environment
+SCHEDULE_JITTER_SECONDS = 600     # random offset per run so boards aren't hit on the hour
+SCHEDULE_FIRST_RUN_SECONDS = 60   # first scheduled scan after startup
+SCHEDULE_MISFIRE_GRACE_SECONDS = 3600  # runs missed by more than this are dropped
+# Finished scans (with their progress events) kept in memory for status lookups
+SCAN_HISTORY_SIZE = 20
+# Cross-worker scan lease: the scanning worker heartbeats; a lease not renewed
+# within the TTL (worker crashed) expires and another worker may scan
+SCAN_LEASE_TTL_SECONDS = 120
+SCAN_LEASE_HEARTBEAT_SECONDS = 30
+SCAN_LEASE_POLL_SECONDS = 2  # how often other workers re-check a running scan
+# Per-scan and per-source stats (GET /api/scan-trends) are kept this long
+SCAN_STATS_DAYS = 90
 
 # Remote job board config
 REMOTE_RELEVANT_TAGS = {
@@ -225,4 +336,30 @@ DUTCH_PREFERRED_SIGNALS = [
     "nederlands is een pré", "nederlands is een pre",
 ]
 
+# HTTP caching: how often a worker re-reads the data generation from SQLite
+# (writes by this worker are seen immediately)
+GENERATION_REFRESH_SECONDS = 2
+RESPONSE_CACHE_ENTRIES = 256
+
+# Response compression: gzip bodies larger than this (bytes); level trades CPU for size
+GZIP_MIN_BYTES = 1024
+GZIP_LEVEL = 5
+
 DATABASE_PATH = "jobs.db"
+
+# Archival: after each scan, jobs posted more than ARCHIVE_AFTER_DAYS ago, hidden
+# jobs, and jobs closed for ARCHIVE_CLOSED_AFTER_DAYS move to jobs_archive.
+# ARCHIVE_DATABASE_PATH (or the env var of that name) puts the archive in its own file.
+ARCHIVE_AFTER_DAYS = 60
+ARCHIVE_CLOSED_AFTER_DAYS = 7
+ARCHIVE_DATABASE_PATH = None
+ARCHIVE_VACUUM_PAGES = 1000  # pages returned to the filesystem per archive run
+
+# Opt-in profiling, off unless PROFILE_TOKEN is set (here or in the environment).
+# A request carrying the token in an X-Profile header or ?profile= is stack-sampled
+# every PROFILE_INTERVAL_SECONDS; on POST /api/scrape the whole scan is. Profiles
+# are folded stacks (flamegraph.pl, speedscope) under PROFILE_DIR, newest PROFILE_KEEP kept.
+PROFILE_TOKEN = ""
+PROFILE_DIR = "profiles"
+PROFILE_INTERVAL_SECONDS = 0.005
+PROFILE_KEEP = 50
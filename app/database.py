@@ -1,19 +1,38 @@
 """SQLite database for storing job listings and application tracking."""
 
+import json
 import sqlite3
 import os
+import time
+import zlib
 from contextlib import contextmanager
-from datetime import datetime, timezone
-from typing import Optional
-
-from app.config import DATABASE_PATH
-from app.scorer import classify_category, extract_city, detect_posting_type, detect_dutch_level, detect_work_model
+from datetime import datetime, timedelta, timezone
+from typing import Iterable, Optional
+
+from app.config import (
+    DATABASE_PATH, HAARLEM_LAT, HAARLEM_LNG, GENERATION_REFRESH_SECONDS, CLOSE_AFTER_MISSED_SCANS,
+    ARCHIVE_DATABASE_PATH, ARCHIVE_AFTER_DAYS, ARCHIVE_CLOSED_AFTER_DAYS, ARCHIVE_VACUUM_PAGES,
+    DETAIL_CACHE_DAYS, DETAIL_RETRY_FAILED_HOURS, DESCRIPTION_COMPRESSION_LEVEL, QUERY_HISTORY_DAYS,
+    SCAN_STATS_DAYS,
+)
+from app import dedup
+from app.metrics import DB_SECONDS, timed
+from app.geo import bounding_box, geocode_job
+from app.scorer import (
+    classify_category, extract_city, detect_posting_type, detect_dutch_level, detect_work_model,
+    extract_salary, parse_posting_date,
+)
 
 
 def get_db_path() -> str:
     return os.environ.get("DATABASE_PATH", DATABASE_PATH)
 
 
+def get_archive_path() -> Optional[str]:
+    """Separate database file for archived jobs, or None to keep them in the main file."""
+    return os.environ.get("ARCHIVE_DATABASE_PATH", ARCHIVE_DATABASE_PATH) or None
+
+
 @contextmanager
 def get_db():
     conn = sqlite3.connect(get_db_path())
@@ -27,6 +46,96 @@ def get_db():
         conn.close()
 
 
+# --------------------------------------------------------------------------
+# Data generation counter
+# --------------------------------------------------------------------------
+# Bumped by every write that changes what the read APIs return (inserts, hides,
+# mark-seen, application edits). Read APIs derive their ETags from it.
+
+_generation: Optional[int] = None
+_generation_checked_at = 0.0
+
+
+def _bump_generation(conn: sqlite3.Connection):
+    """Increment the generation inside the caller's transaction. The in-memory
+    copy is dropped rather than updated, so it is re-read only once committed."""
+    global _generation
+    conn.execute("UPDATE meta SET value = value + 1 WHERE key = 'generation'")
+    _generation = None
+
+
+@timed(DB_SECONDS, "current_generation")
+def current_generation() -> int:
+    """Current data generation. Served from memory; re-read from SQLite at most
+    every GENERATION_REFRESH_SECONDS so writes by other workers are picked up."""
+    global _generation, _generation_checked_at
+    now = time.monotonic()
+    if _generation is None or now - _generation_checked_at >= GENERATION_REFRESH_SECONDS:
+        with get_db() as conn:
+            _generation = conn.execute("SELECT value FROM meta WHERE key = 'generation'").fetchone()["value"]
+        _generation_checked_at = now
+    return _generation
+
+
+def _assign_cluster(conn: sqlite3.Connection, job_id: int, title: str,
+                    company: Optional[str], city: Optional[str]) -> int:
+    """Match a stored job against earlier listings through the LSH buckets and
+    join the best matching cluster, or start its own. Returns the cluster id.
+
+    A cluster is only joined when no member contradicts the new job's company
+    or city, so one vague listing cannot chain two different vacancies."""
+    signature = dedup.minhash(title)
+    keys = dedup.band_keys(signature)
+    candidates = conn.execute(
+        f"""SELECT DISTINCT j.id, j.company, j.city, j.minhash, j.cluster_id
+            FROM job_lsh l JOIN jobs j ON j.id = l.job_id
+            WHERE l.band_key IN ({','.join('?' * len(keys))}) AND j.id != ?""",
+        (*keys, job_id),
+    ).fetchall()
+    best_sim: dict[int, float] = {}
+    for cand in candidates:
+        if not cand["minhash"]:
+            continue
+        cand_sig = dedup.unpack(cand["minhash"])
+        if dedup.same_vacancy(signature, company, city, cand_sig, cand["company"], cand["city"]):
+            cid = cand["cluster_id"] or cand["id"]
+            best_sim[cid] = max(best_sim.get(cid, 0.0), dedup.similarity(signature, cand_sig))
+    cluster_id = job_id
+    for cid in sorted(best_sim, key=best_sim.get, reverse=True):
+        members = conn.execute(
+            """SELECT company, city FROM jobs
+               WHERE (cluster_id = ? OR id = ?) AND id != ?
+                 AND (COALESCE(company, '') != '' OR COALESCE(city, '') != '')""",
+            (cid, cid, job_id),
+        ).fetchall()
+        if all(dedup.compatible(company, city, m["company"], m["city"]) for m in members):
+            cluster_id = cid
+            break
+    conn.execute(
+        "UPDATE jobs SET minhash = ?, cluster_id = ? WHERE id = ?",
+        (dedup.pack(signature), cluster_id, job_id),
+    )
+    conn.executemany("INSERT INTO job_lsh (band_key, job_id) VALUES (?, ?)", [(k, job_id) for k in keys])
+    return cluster_id
+
+
+def _compress(text: str) -> bytes:
+    return zlib.compress(text.encode(), DESCRIPTION_COMPRESSION_LEVEL)
+
+
+def _decompress(body: bytes) -> str:
+    return zlib.decompress(body).decode()
+
+
+def _store_description(conn: sqlite3.Connection, job_id: int, text: str):
+    body = _compress(text)
+    conn.execute(
+        "INSERT OR REPLACE INTO job_descriptions (job_id, raw_size, stored_size, body) VALUES (?, ?, ?, ?)",
+        (job_id, len(text.encode()), len(body), body),
+    )
+
+
+@timed(DB_SECONDS, "init_db")
 def init_db():
     with get_db() as conn:
         conn.execute("""
@@ -123,6 +232,160 @@ def init_db():
                 wm = detect_work_model(row["title"] or "", row["snippet"] or "", row["location"] or "", row["source"] or "")
                 conn.execute("UPDATE jobs SET work_model = ? WHERE id = ?", (wm, row["id"]))
 
+        # Migration: add salary_period column and re-extract salaries normalised to monthly
+        try:
+            conn.execute("SELECT salary_period FROM jobs LIMIT 1")
+        except sqlite3.OperationalError:
+            conn.execute("ALTER TABLE jobs ADD COLUMN salary_period TEXT")
+            rows = conn.execute("SELECT id, title, snippet FROM jobs").fetchall()
+            for row in rows:
+                sal = extract_salary(f"{row['title'] or ''} {row['snippet'] or ''}")
+                conn.execute(
+                    "UPDATE jobs SET salary_min = ?, salary_max = ?, salary_raw = ?, salary_period = ? WHERE id = ?",
+                    (sal["min"] if sal else None, sal["max"] if sal else None,
+                     sal["raw"] if sal else None, sal["period"] if sal else None, row["id"]),
+                )
+
+        # Migration: add posted_at (absolute posting time, resolved at ingest).
+        # Relative strings like "3 days ago" resolve against date_scraped;
+        # unparseable dates fall back to the first-seen time so sorting stays total.
+        try:
+            conn.execute("SELECT posted_at FROM jobs LIMIT 1")
+        except sqlite3.OperationalError:
+            conn.execute("ALTER TABLE jobs ADD COLUMN posted_at TEXT")
+            rows = conn.execute("SELECT id, date_posted, date_scraped FROM jobs").fetchall()
+            for row in rows:
+                posted_at = parse_posting_date(row["date_posted"], row["date_scraped"]) or row["date_scraped"]
+                conn.execute("UPDATE jobs SET posted_at = ? WHERE id = ?", (posted_at, row["id"]))
+
+        # Migration: add coordinates resolved from the bundled gazetteer
+        try:
+            conn.execute("SELECT distance_km FROM jobs LIMIT 1")
+        except sqlite3.OperationalError:
+            conn.execute("ALTER TABLE jobs ADD COLUMN lat REAL")
+            conn.execute("ALTER TABLE jobs ADD COLUMN lng REAL")
+            conn.execute("ALTER TABLE jobs ADD COLUMN distance_km REAL")
+            rows = conn.execute("SELECT id, location FROM jobs").fetchall()
+            for row in rows:
+                geo = geocode_job(row["location"])
+                conn.execute(
+                    "UPDATE jobs SET lat = ?, lng = ?, distance_km = ? WHERE id = ?",
+                    (geo["lat"], geo["lng"], geo["distance_km"], row["id"]),
+                )
+
+        # Migration: listing liveness. Every scan refreshes last_seen_at for the
+        # listings it encounters; a job missing from CLOSE_AFTER_MISSED_SCANS scans
+        # of its source in a row is marked closed and leaves the default views.
+        try:
+            conn.execute("SELECT is_closed FROM jobs LIMIT 1")
+        except sqlite3.OperationalError:
+            conn.execute("ALTER TABLE jobs ADD COLUMN last_seen_at TEXT")
+            conn.execute("ALTER TABLE jobs ADD COLUMN missed_scans INTEGER DEFAULT 0")
+            conn.execute("ALTER TABLE jobs ADD COLUMN is_closed INTEGER DEFAULT 0")
+            conn.execute("ALTER TABLE jobs ADD COLUMN closed_at TEXT")
+            conn.execute("UPDATE jobs SET last_seen_at = date_scraped")
+        # List indexes are partial: they cover only open, visible jobs
+        conn.execute("DROP INDEX IF EXISTS idx_jobs_visible_posted")
+        conn.execute("DROP INDEX IF EXISTS idx_jobs_visible_distance")
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_open_posted ON jobs(posted_at) "
+            "WHERE is_hidden = 0 AND is_closed = 0"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_jobs_open_distance ON jobs(distance_km) "
+            "WHERE is_hidden = 0 AND is_closed = 0"
+        )
+
+        # Near-duplicate clusters: every job carries its title MinHash and the id
+        # of its cluster's canonical job (itself when unique); job_lsh maps LSH
+        # band buckets to jobs so matching a new listing is a few index lookups
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_lsh (
+                band_key TEXT NOT NULL,
+                job_id INTEGER NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_job_lsh_key ON job_lsh(band_key)")
+        try:
+            conn.execute("SELECT cluster_id FROM jobs LIMIT 1")
+        except sqlite3.OperationalError:
+            conn.execute("ALTER TABLE jobs ADD COLUMN cluster_id INTEGER")
+            conn.execute("ALTER TABLE jobs ADD COLUMN minhash BLOB")
+            rows = conn.execute("SELECT id, title, company, city FROM jobs ORDER BY id").fetchall()
+            for row in rows:
+                _assign_cluster(conn, row["id"], row["title"], row["company"], row["city"])
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_cluster ON jobs(cluster_id)")
+
+        # Full descriptions from the jobs' detail pages (enrichment stage) live in
+        # a side table, zlib-compressed, so list and facet queries never touch them.
+        # Sizes sit before the blob so footprint sums don't read overflow pages.
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS job_descriptions (
+                job_id INTEGER PRIMARY KEY,
+                raw_size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            )
+        """)
+        # Migration: move descriptions stored inline in jobs into the side table
+        if "description" in _table_columns(conn, "jobs"):
+            rows = conn.execute("SELECT id, description FROM jobs WHERE description IS NOT NULL").fetchall()
+            for row in rows:
+                _store_description(conn, row["id"], row["description"])
+            try:
+                conn.execute("ALTER TABLE jobs DROP COLUMN description")
+            except sqlite3.OperationalError:  # SQLite before 3.35
+                conn.execute("UPDATE jobs SET description = NULL")
+
+        # Cache of fetched detail pages keyed by URL (body NULL = failed fetch)
+        if "description" in _table_columns(conn, "detail_pages"):
+            conn.execute("DROP TABLE detail_pages")  # uncompressed layout; only a cache
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS detail_pages (
+                url TEXT PRIMARY KEY,
+                status INTEGER,
+                fetched_at TEXT NOT NULL,
+                stored_size INTEGER NOT NULL DEFAULT 0,
+                body BLOB
+            )
+        """)
+
+        # R*Tree spatial index over job coordinates (points stored as zero-size boxes)
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS jobs_geo USING rtree(
+                id, min_lat, max_lat, min_lng, max_lng
+            )
+        """)
+        conn.execute("""
+            INSERT INTO jobs_geo (id, min_lat, max_lat, min_lng, max_lng)
+            SELECT id, lat, lat, lng, lng FROM jobs
+            WHERE lat IS NOT NULL AND id NOT IN (SELECT id FROM jobs_geo)
+        """)
+
+        # Key/value metadata (data generation counter)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("INSERT OR IGNORE INTO meta (key, value) VALUES ('generation', 0)")
+
+        # Scan lease: one row naming the worker that is scanning, shared by all workers
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scan_lease (
+                name TEXT PRIMARY KEY,
+                owner TEXT,
+                scan_id TEXT,
+                acquired_at TEXT,
+                heartbeat_at TEXT,
+                expires_at TEXT,
+                last_finished_at TEXT,
+                last_status TEXT
+            )
+        """)
+        conn.execute("INSERT OR IGNORE INTO scan_lease (name) VALUES ('scan')")
+
         # Feedback table
         conn.execute("""
             CREATE TABLE IF NOT EXISTS feedback (
@@ -143,6 +406,83 @@ def init_db():
             )
         """)
 
+        # Circuit breaker state per source (see app/breaker.py)
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS source_health (
+                source TEXT PRIMARY KEY,
+                state TEXT NOT NULL DEFAULT 'closed',
+                failures INTEGER NOT NULL DEFAULT 0,
+                cooldown_seconds REAL NOT NULL,
+                opened_at TEXT,
+                retry_at TEXT,
+                last_error TEXT,
+                last_failure_at TEXT,
+                last_success_at TEXT
+            )
+        """)
+
+        # Per-query yield of each scan: results, results no earlier query in the
+        # scan returned, and results new to the database
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS query_runs (
+                source TEXT NOT NULL,
+                query TEXT NOT NULL,
+                ran_at TEXT NOT NULL,
+                found INTEGER NOT NULL,
+                unique_found INTEGER NOT NULL,
+                new INTEGER NOT NULL
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_query_runs ON query_runs(source, query, ran_at)")
+        # Which queries return each listing, so a scan that skips some queries
+        # can still count misses for the listings its other queries cover
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS listing_queries (
+                source TEXT NOT NULL,
+                external_id TEXT NOT NULL,
+                query TEXT NOT NULL,
+                seen_at TEXT NOT NULL,
+                PRIMARY KEY (source, external_id, query)
+            ) WITHOUT ROWID
+        """)
+
+        # Scan history: one row per scan, and per source what it cost and yielded
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scan_runs (
+                id TEXT PRIMARY KEY,
+                trigger TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'running',
+                started_at TEXT NOT NULL,
+                finished_at TEXT,
+                seconds REAL,
+                sources INTEGER NOT NULL DEFAULT 0,
+                found INTEGER NOT NULL DEFAULT 0,
+                new INTEGER NOT NULL DEFAULT 0,
+                truncated INTEGER NOT NULL DEFAULT 0
+            )
+        """)
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_scan_runs_started ON scan_runs(started_at)")
+        conn.execute("""
+            CREATE TABLE IF NOT EXISTS scan_source_stats (
+                scan_id TEXT NOT NULL,
+                source TEXT NOT NULL,
+                status TEXT NOT NULL,
+                requests INTEGER NOT NULL DEFAULT 0,
+                bytes INTEGER NOT NULL DEFAULT 0,
+                statuses TEXT NOT NULL DEFAULT '{}',
+                fetch_seconds REAL NOT NULL DEFAULT 0,
+                parse_seconds REAL NOT NULL DEFAULT 0,
+                score_seconds REAL NOT NULL DEFAULT 0,
+                write_seconds REAL NOT NULL DEFAULT 0,
+                total_seconds REAL NOT NULL DEFAULT 0,
+                found INTEGER NOT NULL DEFAULT 0,
+                new INTEGER NOT NULL DEFAULT 0,
+                truncated INTEGER NOT NULL DEFAULT 0,
+                error TEXT,
+                PRIMARY KEY (scan_id, source)
+            )
+        """)
+
         # Custom job boards table
         conn.execute("""
             CREATE TABLE IF NOT EXISTS custom_job_boards (
@@ -152,8 +492,122 @@ def init_db():
                 created_at TEXT NOT NULL
             )
         """)
+        # Migration: optional declarative scraper spec (JSON: queries, selectors)
+        try:
+            conn.execute("SELECT spec FROM custom_job_boards LIMIT 1")
+        except sqlite3.OperationalError:
+            conn.execute("ALTER TABLE custom_job_boards ADD COLUMN spec TEXT")
+
+    _init_archive()
+
+
+# --------------------------------------------------------------------------
+# Archive
+# --------------------------------------------------------------------------
+# Old, closed and hidden jobs move out of the hot `jobs` table into
+# jobs_archive (optionally in a separate database file). Their external_ids
+# stay known so scans don't re-insert them; jobs saved to the application
+# tracker are never archived.
+
+def _archive_table(conn: sqlite3.Connection, table: str = "jobs_archive") -> str:
+    """Qualified name of an archive table, attaching the archive database if
+    configured. Must be called before the connection starts a transaction."""
+    path = get_archive_path()
+    if not path:
+        return table
+    if not any(row["name"] == "archive" for row in conn.execute("PRAGMA database_list")):
+        conn.execute("ATTACH DATABASE ? AS archive", (path,))
+    return f"archive.{table}"
+
+
+def _table_columns(conn: sqlite3.Connection, table: str) -> dict[str, str]:
+    schema, _, name = table.rpartition(".")
+    pragma = f"PRAGMA {schema}.table_info({name})" if schema else f"PRAGMA table_info({name})"
+    return {row["name"]: row["type"] for row in conn.execute(pragma)}
+
+
+def _init_archive():
+    """Create the archive table and mirror any columns jobs has gained since.
+    Also switches the main file to incremental auto-vacuum (a one-off VACUUM)."""
+    with get_db() as conn:
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+            conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            conn.execute("VACUUM")
+        archive = _archive_table(conn)
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {archive} (
+                id INTEGER PRIMARY KEY,
+                external_id TEXT UNIQUE NOT NULL,
+                archived_at TEXT NOT NULL
+            )
+        """)
+        existing = _table_columns(conn, archive)
+        for name, col_type in _table_columns(conn, "jobs").items():
+            if name not in existing:
+                conn.execute(f"ALTER TABLE {archive} ADD COLUMN {name} {col_type}")
+        conn.execute(f"""
+            CREATE TABLE IF NOT EXISTS {_archive_table(conn, "descriptions_archive")} (
+                job_id INTEGER PRIMARY KEY,
+                raw_size INTEGER NOT NULL,
+                stored_size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            )
+        """)
 
 
+@timed(DB_SECONDS, "archive_jobs")
+def archive_jobs() -> dict:
+    """Move archivable jobs out of the hot table, then give freed pages back
+    to the filesystem with an incremental vacuum."""
+    now = datetime.now(timezone.utc)
+    age_cutoff = (now - timedelta(days=ARCHIVE_AFTER_DAYS)).isoformat()
+    closed_cutoff = (now - timedelta(days=ARCHIVE_CLOSED_AFTER_DAYS)).isoformat()
+    with get_db() as conn:
+        archive = _archive_table(conn)
+        descriptions = _archive_table(conn, "descriptions_archive")
+        cols = ", ".join(_table_columns(conn, "jobs"))
+        conn.execute(
+            """CREATE TEMP TABLE to_archive AS
+               SELECT id FROM jobs
+               WHERE id NOT IN (SELECT job_id FROM applications)
+                 AND (is_hidden = 1 OR posted_at < ? OR (is_closed = 1 AND closed_at < ?))""",
+            (age_cutoff, closed_cutoff),
+        )
+        moved = conn.execute("SELECT COUNT(*) FROM to_archive").fetchone()[0]
+        if moved:
+            conn.execute(
+                f"""INSERT OR REPLACE INTO {archive} ({cols}, archived_at)
+                    SELECT {cols}, ? FROM jobs WHERE id IN (SELECT id FROM to_archive)""",
+                (now.isoformat(),),
+            )
+            conn.execute(
+                f"""INSERT OR REPLACE INTO {descriptions} (job_id, raw_size, stored_size, body)
+                    SELECT job_id, raw_size, stored_size, body FROM job_descriptions
+                    WHERE job_id IN (SELECT id FROM to_archive)"""
+            )
+            conn.execute("DELETE FROM job_descriptions WHERE job_id IN (SELECT id FROM to_archive)")
+            conn.execute(
+                """DELETE FROM listing_queries WHERE (source, external_id) IN
+                   (SELECT source, external_id FROM jobs WHERE id IN (SELECT id FROM to_archive))"""
+            )
+            conn.execute(
+                "DELETE FROM detail_pages WHERE url IN (SELECT url FROM jobs WHERE id IN (SELECT id FROM to_archive))"
+            )
+            conn.execute("DELETE FROM jobs_geo WHERE id IN (SELECT id FROM to_archive)")
+            conn.execute("DELETE FROM job_lsh WHERE job_id IN (SELECT id FROM to_archive)")
+            conn.execute("DELETE FROM jobs WHERE id IN (SELECT id FROM to_archive)")
+            _bump_generation(conn)
+    freed = 0
+    if moved:
+        with get_db() as conn:
+            before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            # executescript steps the pragma to completion; execute() frees one page
+            conn.executescript(f"PRAGMA incremental_vacuum({int(ARCHIVE_VACUUM_PAGES)});")
+            freed = before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+    return {"archived": moved, "freed_pages": freed}
+
+
+@timed(DB_SECONDS, "upsert_job")
 def upsert_job(
     external_id: str,
     title: str,
@@ -167,32 +621,90 @@ def upsert_job(
     salary_min: Optional[int] = None,
     salary_max: Optional[int] = None,
     salary_raw: Optional[str] = None,
+    salary_period: Optional[str] = None,
     category: str = "",
     city: str = "",
     posting_type: str = "direct",
     dutch_level: str = "english_ok",
     work_model: str = "",
-) -> bool:
-    """Insert a job if it doesn't exist. Returns True if newly inserted."""
+    check_archive: bool = True,
+) -> Optional[int]:
+    """Insert a job if it doesn't exist. Returns the new row id, or None if it was known.
+    Callers inserting many jobs pass check_archive=False after filtering out
+    get_archived_external_ids() themselves, which saves attaching the archive per job."""
     now = datetime.now(timezone.utc).isoformat()
+    posted_at = parse_posting_date(date_posted, now) or now
+    geo = geocode_job(location)
     with get_db() as conn:
+        if check_archive and conn.execute(
+            f"SELECT 1 FROM {_archive_table(conn)} WHERE external_id = ?", (external_id,)
+        ).fetchone():
+            return None
         try:
-            conn.execute(
+            cur = conn.execute(
                 """INSERT INTO jobs
                    (external_id, title, company, location, snippet, url, source,
-                    score, salary_min, salary_max, salary_raw, date_posted, date_scraped,
-                    category, city, posting_type, dutch_level, work_model)
-                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                    score, salary_min, salary_max, salary_raw, salary_period, date_posted, posted_at,
+                    date_scraped, last_seen_at, category, city, posting_type, dutch_level, work_model,
+                    lat, lng, distance_km)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
                 (external_id, title, company, location, snippet, url, source,
-                 score, salary_min, salary_max, salary_raw, date_posted, now,
-                 category, city, posting_type, dutch_level, work_model),
+                 score, salary_min, salary_max, salary_raw, salary_period, date_posted, posted_at, now, now,
+                 category, city, posting_type, dutch_level, work_model,
+                 geo["lat"], geo["lng"], geo["distance_km"]),
             )
-            return True
+            if geo["lat"] is not None:
+                conn.execute(
+                    "INSERT INTO jobs_geo (id, min_lat, max_lat, min_lng, max_lng) VALUES (?, ?, ?, ?, ?)",
+                    (cur.lastrowid, geo["lat"], geo["lat"], geo["lng"], geo["lng"]),
+                )
+            _assign_cluster(conn, cur.lastrowid, title, company, city)
+            _bump_generation(conn)
+            return cur.lastrowid
         except sqlite3.IntegrityError:
-            return False
+            return None
 
 
 
+# Whole days since posting, computed by SQLite; NULL when the board gave no date
+_AGE_DAYS_SQL = (
+    "CASE WHEN date_posted IS NULL OR date_posted = '' THEN NULL "
+    "ELSE CAST(julianday('now') - julianday(posted_at) AS INTEGER) END AS age_days"
+)
+
+
+# Columns a caller may project from get_jobs (age_days is the computed column above)
+JOB_COLUMNS = (
+    "id", "external_id", "title", "company", "location", "snippet", "url", "source",
+    "score", "salary_min", "salary_max", "salary_raw", "salary_period", "date_posted",
+    "posted_at", "date_scraped", "is_new", "is_hidden", "category", "city", "posting_type",
+    "dutch_level", "work_model", "lat", "lng", "distance_km", "last_seen_at", "is_closed",
+    "closed_at", "cluster_id", "age_days",
+)
+
+
+def _projection(fields: Optional[Iterable[str]], snippet_chars: Optional[int]) -> str:
+    """SELECT list for the requested columns (all of them when fields is None)."""
+    cols = []
+    for name in dict.fromkeys(fields if fields is not None else JOB_COLUMNS):
+        if name not in JOB_COLUMNS:
+            raise ValueError(f"Unknown job field: {name}")
+        if name == "age_days":
+            cols.append(_AGE_DAYS_SQL)
+        elif name == "snippet" and snippet_chars is not None:
+            cols.append(f"substr(snippet, 1, {int(snippet_chars)}) AS snippet")
+        else:
+            cols.append(name)
+    return ", ".join(cols)
+
+
+def _age_cutoff(max_age_days: int) -> str:
+    """ISO timestamp for a freshness filter, comparable with the indexed posted_at."""
+    cutoff = datetime.now(timezone.utc) - timedelta(days=max_age_days)
+    return cutoff.replace(microsecond=0).isoformat()
+
+
+@timed(DB_SECONDS, "get_jobs")
 def get_jobs(
     source: Optional[str] = None,
     search: Optional[str] = None,
@@ -206,8 +718,19 @@ def get_jobs(
     limit: int = 200,
     offset: int = 0,
     dutch_filter: str = "all",
+    max_age_days: Optional[int] = None,
+    max_km: Optional[float] = None,
+    include_closed: bool = False,
+    collapse: bool = False,
+    fields: Optional[Iterable[str]] = None,
+    snippet_chars: Optional[int] = None,
 ) -> list[dict]:
+    """Visible jobs matching the filters. `fields` limits the columns fetched and
+    `snippet_chars` truncates the snippet in SQL for list views. With `collapse`,
+    each duplicate cluster is one row (its best-scoring match) plus cluster_size."""
     conditions = ["is_hidden = 0"]
+    if not include_closed:
+        conditions.append("is_closed = 0")
     params: list = []
 
     if source:
@@ -238,19 +761,41 @@ def get_jobs(
         conditions.append("dutch_level = 'english_ok'")
     elif dutch_filter == "hide_required":
         conditions.append("dutch_level != 'dutch_required'")
+    if max_age_days is not None:
+        conditions.append("posted_at >= ?")
+        params.append(_age_cutoff(max_age_days))
+    if max_km is not None:
+        # R*Tree bounding-box prefilter, then the exact distance stored at ingest
+        conditions.append(
+            "id IN (SELECT id FROM jobs_geo WHERE min_lat >= ? AND max_lat <= ? AND min_lng >= ? AND max_lng <= ?)"
+            " AND distance_km <= ?"
+        )
+        params.extend([*bounding_box(HAARLEM_LAT, HAARLEM_LNG, max_km), max_km])
 
     where = " AND ".join(conditions)
 
     if sort == "newest":
-        order = "date_scraped DESC, date_posted DESC"
+        order = "posted_at DESC"
     elif sort == "score":
-        order = "score DESC, date_scraped DESC"
+        order = "score DESC, posted_at DESC"
     elif sort == "oldest":
-        order = "date_scraped ASC, date_posted ASC"
+        order = "posted_at ASC"
+    elif sort == "distance":
+        order = "distance_km IS NULL, distance_km ASC, score DESC"
     else:
         order = "date_scraped DESC"
 
-    query = f"SELECT * FROM jobs WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?"
+    projection = _projection(fields, snippet_chars)
+    if collapse:
+        query = f"""SELECT {projection}, cluster_size FROM (
+                        SELECT *,
+                            ROW_NUMBER() OVER (PARTITION BY COALESCE(cluster_id, id)
+                                               ORDER BY score DESC, posted_at DESC, id) AS cluster_rank,
+                            COUNT(*) OVER (PARTITION BY COALESCE(cluster_id, id)) AS cluster_size
+                        FROM jobs WHERE {where}
+                    ) WHERE cluster_rank = 1 ORDER BY {order} LIMIT ? OFFSET ?"""
+    else:
+        query = f"SELECT {projection} FROM jobs WHERE {where} ORDER BY {order} LIMIT ? OFFSET ?"
     params.extend([limit, offset])
 
     with get_db() as conn:
@@ -258,6 +803,7 @@ def get_jobs(
         return [dict(row) for row in rows]
 
 
+@timed(DB_SECONDS, "get_job_count")
 def get_job_count(
     source: Optional[str] = None,
     only_new: bool = False,
@@ -268,8 +814,14 @@ def get_job_count(
     posting_type: Optional[str] = None,
     company: Optional[str] = None,
     dutch_filter: str = "all",
+    max_age_days: Optional[int] = None,
+    max_km: Optional[float] = None,
+    include_closed: bool = False,
+    collapse: bool = False,
 ) -> int:
     conditions = ["is_hidden = 0"]
+    if not include_closed:
+        conditions.append("is_closed = 0")
     params: list = []
     if source:
         conditions.append("source = ?")
@@ -299,26 +851,235 @@ def get_job_count(
         conditions.append("dutch_level = 'english_ok'")
     elif dutch_filter == "hide_required":
         conditions.append("dutch_level != 'dutch_required'")
+    if max_age_days is not None:
+        conditions.append("posted_at >= ?")
+        params.append(_age_cutoff(max_age_days))
+    if max_km is not None:
+        # R*Tree bounding-box prefilter, then the exact distance stored at ingest
+        conditions.append(
+            "id IN (SELECT id FROM jobs_geo WHERE min_lat >= ? AND max_lat <= ? AND min_lng >= ? AND max_lng <= ?)"
+            " AND distance_km <= ?"
+        )
+        params.extend([*bounding_box(HAARLEM_LAT, HAARLEM_LNG, max_km), max_km])
     where = " AND ".join(conditions)
     with get_db() as conn:
-        row = conn.execute(f"SELECT COUNT(*) as cnt FROM jobs WHERE {where}", params).fetchone()
+        counted = "DISTINCT COALESCE(cluster_id, id)" if collapse else "*"
+        row = conn.execute(f"SELECT COUNT({counted}) as cnt FROM jobs WHERE {where}", params).fetchone()
         return row["cnt"]
 
 
+@timed(DB_SECONDS, "record_seen")
+def record_seen(
+    source: str,
+    external_ids: Iterable[str],
+    partial: bool = False,
+    count_missed: bool = True,
+    queries: Optional[Iterable[str]] = None,
+) -> dict:
+    """Refresh last_seen_at for the listings a scan of `source` encountered and
+    count a miss for every open job of that source it did not.
+
+    The ids go through a temp table so both updates are set-based joins on the
+    external_id index. A `partial` scan (one that stopped paginating early) only
+    counts misses among jobs at least as recent as the oldest listing it saw.
+    With `queries` (those run by a scan that skipped others) only jobs one of
+    them returned before (see listing_queries) can be missed. Without
+    `count_missed` (a scan with listing requests failed or cut short) none are."""
+    now = datetime.now(timezone.utc).isoformat()
+    with get_db() as conn:
+        conn.execute("CREATE TEMP TABLE seen_ids (external_id TEXT PRIMARY KEY)")
+        conn.executemany("INSERT OR IGNORE INTO seen_ids VALUES (?)", ((eid,) for eid in external_ids))
+        seen = conn.execute("SELECT COUNT(*) FROM seen_ids").fetchone()[0]
+        if not seen:
+            # An empty result is more likely a blocked or broken source than an empty board
+            return {"seen": 0, "closed": 0, "reopened": 0}
+
+        reopened = conn.execute(
+            "SELECT COUNT(*) FROM jobs WHERE is_closed = 1 AND external_id IN (SELECT external_id FROM seen_ids)"
+        ).fetchone()[0]
+        conn.execute(
+            """UPDATE jobs SET last_seen_at = ?, missed_scans = 0, is_closed = 0, closed_at = NULL
+               WHERE external_id IN (SELECT external_id FROM seen_ids)""",
+            (now,),
+        )
+        if not count_missed:
+            _bump_generation(conn)
+            return {"seen": seen, "closed": 0, "reopened": reopened}
+        since = ""
+        if partial:
+            since = conn.execute(
+                "SELECT MIN(posted_at) FROM jobs WHERE external_id IN (SELECT external_id FROM seen_ids)"
+            ).fetchone()[0] or now
+        covered, covered_params = "", []
+        if queries is not None:
+            queries = list(queries)
+            covered = f""" AND external_id IN (
+                SELECT external_id FROM listing_queries
+                WHERE source = ? AND query IN ({','.join('?' * len(queries))}))"""
+            covered_params = [source, *queries]
+        conn.execute(
+            f"""UPDATE jobs SET missed_scans = missed_scans + 1
+               WHERE source = ? AND is_closed = 0 AND posted_at >= ?
+                 AND external_id NOT IN (SELECT external_id FROM seen_ids){covered}""",
+            (source, since, *covered_params),
+        )
+        closed = conn.execute(
+            "UPDATE jobs SET is_closed = 1, closed_at = ? WHERE source = ? AND is_closed = 0 AND missed_scans >= ?",
+            (now, source, CLOSE_AFTER_MISSED_SCANS),
+        ).rowcount
+        _bump_generation(conn)
+        return {"seen": seen, "closed": closed, "reopened": reopened}
+
+
+@timed(DB_SECONDS, "get_archived_external_ids")
+def get_archived_external_ids(sources: Optional[Iterable[str]] = None) -> set[str]:
+    """external_ids in the archive, read once per scan so upsert_job can skip its check."""
+    where = ""
+    params: list = []
+    if sources is not None:
+        sources = list(sources)
+        where = f" WHERE source IN ({','.join('?' * len(sources))})"
+        params = sources
+    with get_db() as conn:
+        return {row[0] for row in conn.execute(f"SELECT external_id FROM {_archive_table(conn)}{where}", params)}
+
+
+@timed(DB_SECONDS, "get_known_external_ids")
+def get_known_external_ids(sources: Optional[Iterable[str]] = None) -> set[str]:
+    """external_ids already stored (hidden and archived ones included), for incremental scans."""
+    where = ""
+    params: list = []
+    if sources is not None:
+        sources = list(sources)
+        where = f" WHERE source IN ({','.join('?' * len(sources))})"
+        params = sources
+    with get_db() as conn:
+        archive = _archive_table(conn)
+        query = f"SELECT external_id FROM jobs{where} UNION ALL SELECT external_id FROM {archive}{where}"
+        return {row[0] for row in conn.execute(query, params * 2)}
+
+
+@timed(DB_SECONDS, "get_job_by_id")
 def get_job_by_id(job_id: int) -> Optional[dict]:
+    """A job from the hot table, or from the archive (flagged is_archived)."""
+    with get_db() as conn:
+        archive = _archive_table(conn)
+        cols = _projection(None, None)
+        row = conn.execute(f"SELECT {cols} FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row:
+            return dict(row)
+        row = conn.execute(f"SELECT {cols} FROM {archive} WHERE id = ?", (job_id,)).fetchone()
+        return {**dict(row), "is_archived": True} if row else None
+
+
+@timed(DB_SECONDS, "get_jobs_by_ids")
+def get_jobs_by_ids(job_ids: list[int]) -> list[dict]:
+    """Fetch several jobs in one query (missing IDs are skipped)."""
+    if not job_ids:
+        return []
+    placeholders = ",".join("?" * len(job_ids))
     with get_db() as conn:
-        row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
-        return dict(row) if row else None
+        rows = conn.execute(
+            f"""SELECT j.id, j.title, j.company, j.location, j.snippet, j.dutch_level, d.body
+                FROM jobs j LEFT JOIN job_descriptions d ON d.job_id = j.id
+                WHERE j.id IN ({placeholders})""",
+            job_ids,
+        ).fetchall()
+    jobs = []
+    for row in rows:
+        job = dict(row)
+        body = job.pop("body")
+        job["description"] = _decompress(body) if body is not None else None
+        jobs.append(job)
+    return jobs
+
+
+@timed(DB_SECONDS, "update_job_details")
+def update_job_details(
+    job_id: int,
+    description: str,
+    score: int,
+    salary_min: Optional[int] = None,
+    salary_max: Optional[int] = None,
+    salary_raw: Optional[str] = None,
+    salary_period: Optional[str] = None,
+    category: str = "",
+    dutch_level: str = "english_ok",
+    work_model: str = "",
+):
+    """Store a job's full description along with the fields rescored from it."""
+    with get_db() as conn:
+        _store_description(conn, job_id, description)
+        conn.execute(
+            """UPDATE jobs SET score = ?, salary_min = ?, salary_max = ?,
+                   salary_raw = ?, salary_period = ?, category = ?, dutch_level = ?, work_model = ?
+               WHERE id = ?""",
+            (score, salary_min, salary_max, salary_raw, salary_period,
+             category, dutch_level, work_model, job_id),
+        )
+        _bump_generation(conn)
+
+
+@timed(DB_SECONDS, "get_description")
+def get_description(job_id: int) -> Optional[str]:
+    """Stored description of a job, looked up in the archive when the job has moved there."""
+    with get_db() as conn:
+        descriptions = _archive_table(conn, "descriptions_archive")
+        row = conn.execute("SELECT body FROM job_descriptions WHERE job_id = ?", (job_id,)).fetchone()
+        if not row:
+            row = conn.execute(f"SELECT body FROM {descriptions} WHERE job_id = ?", (job_id,)).fetchone()
+        return _decompress(row["body"]) if row else None
 
 
+@timed(DB_SECONDS, "mark_all_seen")
 def mark_all_seen():
     with get_db() as conn:
-        conn.execute("UPDATE jobs SET is_new = 0 WHERE is_new = 1")
+        if conn.execute("UPDATE jobs SET is_new = 0 WHERE is_new = 1").rowcount:
+            _bump_generation(conn)
+
+
+@timed(DB_SECONDS, "get_duplicates")
+def get_duplicates(job_id: int) -> list[dict]:
+    """Other listings in the same duplicate cluster as job_id."""
+    with get_db() as conn:
+        rows = conn.execute(
+            """SELECT id, title, company, source, url, is_hidden, is_closed FROM jobs
+               WHERE cluster_id = (SELECT cluster_id FROM jobs WHERE id = ?) AND id != ?
+               ORDER BY score DESC, id""",
+            (job_id, job_id),
+        ).fetchall()
+        return [dict(row) for row in rows]
 
 
+@timed(DB_SECONDS, "hide_job")
 def hide_job(job_id: int):
+    """Hide a job together with the duplicates that match it directly, so the
+    collapsed view does not resurface the same vacancy from another board."""
     with get_db() as conn:
-        conn.execute("UPDATE jobs SET is_hidden = 1 WHERE id = ?", (job_id,))
+        job = conn.execute(
+            "SELECT company, city, minhash, cluster_id FROM jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        if not job:
+            return
+        ids = [job_id]
+        if job["minhash"] and job["cluster_id"]:
+            sig = dedup.unpack(job["minhash"])
+            members = conn.execute(
+                """SELECT id, company, city, minhash FROM jobs
+                   WHERE cluster_id = ? AND id != ? AND is_hidden = 0 AND minhash IS NOT NULL""",
+                (job["cluster_id"], job_id),
+            ).fetchall()
+            ids += [
+                m["id"] for m in members
+                if dedup.same_vacancy(sig, job["company"], job["city"],
+                                      dedup.unpack(m["minhash"]), m["company"], m["city"])
+            ]
+        cur = conn.execute(
+            f"UPDATE jobs SET is_hidden = 1 WHERE is_hidden = 0 AND id IN ({','.join('?' * len(ids))})",
+            ids,
+        )
+        if cur.rowcount:
+            _bump_generation(conn)
 
 
 ALL_SOURCES = {
@@ -333,23 +1094,24 @@ ALL_SOURCES = {
 }
 
 
+@timed(DB_SECONDS, "get_filter_counts")
 def get_filter_counts() -> dict:
     """Get counts for all filter panels (category, city, company, posting_type, source)."""
     with get_db() as conn:
         categories = conn.execute(
-            "SELECT category, COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND category != '' GROUP BY category ORDER BY c DESC"
+            "SELECT category, COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND is_closed = 0 AND category != '' GROUP BY category ORDER BY c DESC"
         ).fetchall()
         cities = conn.execute(
-            "SELECT city, COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND city != '' GROUP BY city ORDER BY c DESC"
+            "SELECT city, COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND is_closed = 0 AND city != '' GROUP BY city ORDER BY c DESC"
         ).fetchall()
         companies = conn.execute(
-            "SELECT company, COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND company IS NOT NULL AND company != '' GROUP BY company ORDER BY c DESC"
+            "SELECT company, COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND is_closed = 0 AND company IS NOT NULL AND company != '' GROUP BY company ORDER BY c DESC"
         ).fetchall()
         posting_types = conn.execute(
-            "SELECT posting_type, COUNT(*) as c FROM jobs WHERE is_hidden = 0 GROUP BY posting_type ORDER BY c DESC"
+            "SELECT posting_type, COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND is_closed = 0 GROUP BY posting_type ORDER BY c DESC"
         ).fetchall()
         sources = conn.execute(
-            "SELECT source, COUNT(*) as c FROM jobs WHERE is_hidden = 0 GROUP BY source ORDER BY c DESC"
+            "SELECT source, COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND is_closed = 0 GROUP BY source ORDER BY c DESC"
         ).fetchall()
         # Always include all known sources, even with 0 count
         source_counts = {key: 0 for key in ALL_SOURCES}
@@ -364,42 +1126,235 @@ def get_filter_counts() -> dict:
         }
 
 
+@timed(DB_SECONDS, "get_stats")
 def get_stats() -> dict:
     with get_db() as conn:
-        total = conn.execute("SELECT COUNT(*) as c FROM jobs WHERE is_hidden = 0").fetchone()["c"]
-        new = conn.execute("SELECT COUNT(*) as c FROM jobs WHERE is_new = 1 AND is_hidden = 0").fetchone()["c"]
+        total = conn.execute("SELECT COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND is_closed = 0").fetchone()["c"]
+        new = conn.execute("SELECT COUNT(*) as c FROM jobs WHERE is_new = 1 AND is_hidden = 0 AND is_closed = 0").fetchone()["c"]
         sources = conn.execute(
-            "SELECT source, COUNT(*) as c FROM jobs WHERE is_hidden = 0 GROUP BY source"
+            "SELECT source, COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND is_closed = 0 GROUP BY source"
         ).fetchall()
         english_friendly = conn.execute(
-            "SELECT COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND dutch_level = 'english_ok'"
+            "SELECT COUNT(*) as c FROM jobs WHERE is_hidden = 0 AND is_closed = 0 AND dutch_level = 'english_ok'"
         ).fetchone()["c"]
+        closed = conn.execute("SELECT COUNT(*) as c FROM jobs WHERE is_closed = 1").fetchone()["c"]
+        archived = conn.execute(f"SELECT COUNT(*) as c FROM {_archive_table(conn)}").fetchone()["c"]
+        descriptions = conn.execute(
+            """SELECT COUNT(*) AS c, COALESCE(SUM(raw_size), 0) AS raw,
+                      COALESCE(SUM(stored_size), 0) AS stored FROM job_descriptions"""
+        ).fetchone()
+        detail_cache = conn.execute(
+            """SELECT COUNT(*) AS c, COUNT(body) AS ok, COALESCE(SUM(stored_size), 0) AS stored
+               FROM detail_pages"""
+        ).fetchone()
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        pages = conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        breakers = conn.execute(
+            """SELECT source, state, failures, retry_at, last_error, last_failure_at, last_success_at
+               FROM source_health ORDER BY source"""
+        ).fetchall()
         return {
             "total": total,
             "new": new,
             "by_source": {row["source"]: row["c"] for row in sources},
             "english_friendly": english_friendly,
+            "closed": closed,
+            "archived": archived,
+            "storage": {
+                "database_bytes": pages * page_size,
+                "free_bytes": free_pages * page_size,
+                "descriptions": {
+                    "count": descriptions["c"],
+                    "raw_bytes": descriptions["raw"],
+                    "stored_bytes": descriptions["stored"],
+                },
+                "detail_cache": {
+                    "entries": detail_cache["c"],
+                    "with_description": detail_cache["ok"],
+                    "stored_bytes": detail_cache["stored"],
+                },
+            },
+            # An open breaker's source is skipped by scans until its retry_at
+            "breakers": {row["source"]: {k: row[k] for k in row.keys() if k != "source"} for row in breakers},
         }
 
 
+# --------------------------------------------------------------------------
+# Detail page cache
+# --------------------------------------------------------------------------
+# Detail pages fetched by the enrichment stage, by URL. Descriptions stay fresh
+# for DETAIL_CACHE_DAYS; failed fetches are retried after DETAIL_RETRY_FAILED_HOURS.
+
+@timed(DB_SECONDS, "get_cached_details")
+def get_cached_details(urls: list[str]) -> dict[str, Optional[str]]:
+    """Fresh cache entries among urls: url -> description (None for a failed fetch)."""
+    if not urls:
+        return {}
+    now = datetime.now(timezone.utc)
+    ok_cutoff = (now - timedelta(days=DETAIL_CACHE_DAYS)).isoformat()
+    failed_cutoff = (now - timedelta(hours=DETAIL_RETRY_FAILED_HOURS)).isoformat()
+    with get_db() as conn:
+        conn.execute("CREATE TEMP TABLE wanted_urls (url TEXT PRIMARY KEY)")
+        conn.executemany("INSERT OR IGNORE INTO wanted_urls VALUES (?)", ((u,) for u in urls))
+        rows = conn.execute(
+            """SELECT url, body FROM detail_pages
+               WHERE url IN (SELECT url FROM wanted_urls)
+                 AND fetched_at >= CASE WHEN body IS NULL THEN ? ELSE ? END""",
+            (failed_cutoff, ok_cutoff),
+        ).fetchall()
+        return {row["url"]: _decompress(row["body"]) if row["body"] is not None else None for row in rows}
+
+
+@timed(DB_SECONDS, "cache_details")
+def cache_details(url: str, status: Optional[int], description: Optional[str]):
+    body = _compress(description) if description else None
+    with get_db() as conn:
+        conn.execute(
+            """INSERT OR REPLACE INTO detail_pages (url, status, fetched_at, stored_size, body)
+               VALUES (?, ?, ?, ?, ?)""",
+            (url, status, datetime.now(timezone.utc).isoformat(), len(body) if body else 0, body),
+        )
+
+
+@timed(DB_SECONDS, "get_jobs_needing_details")
+def get_jobs_needing_details(sources: Iterable[str], max_snippet_chars: int) -> list[dict]:
+    """Open jobs of `sources` whose card text is under max_snippet_chars, with
+    no stored description and no fresh cache entry (failed fetches are retried
+    after DETAIL_RETRY_FAILED_HOURS), best score first."""
+    sources = list(sources)
+    if not sources:
+        return []
+    now = datetime.now(timezone.utc)
+    ok_cutoff = (now - timedelta(days=DETAIL_CACHE_DAYS)).isoformat()
+    failed_cutoff = (now - timedelta(hours=DETAIL_RETRY_FAILED_HOURS)).isoformat()
+    with get_db() as conn:
+        rows = conn.execute(
+            f"""SELECT j.id, j.title, j.company, j.location, j.snippet, j.url, j.source, j.date_posted
+                FROM jobs j
+                WHERE j.source IN ({','.join('?' * len(sources))})
+                  AND j.is_closed = 0 AND j.is_hidden = 0
+                  AND LENGTH(COALESCE(j.snippet, '')) < ?
+                  AND NOT EXISTS (SELECT 1 FROM job_descriptions d WHERE d.job_id = j.id)
+                  AND NOT EXISTS (
+                      SELECT 1 FROM detail_pages p
+                      WHERE p.url = j.url AND p.fetched_at >= CASE WHEN p.body IS NULL THEN ? ELSE ? END
+                  )
+                ORDER BY j.score DESC, j.id""",
+            (*sources, max_snippet_chars, failed_cutoff, ok_cutoff),
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+@timed(DB_SECONDS, "prune_detail_cache")
+def prune_detail_cache() -> int:
+    """Drop cache entries too old to be served. Returns the number removed."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=DETAIL_CACHE_DAYS)).isoformat()
+    with get_db() as conn:
+        return conn.execute("DELETE FROM detail_pages WHERE fetched_at < ?", (cutoff,)).rowcount
+
+
+# --------------------------------------------------------------------------
+# Scan lease
+# --------------------------------------------------------------------------
+# Exactly one worker scans at a time. The holder heartbeats to push expires_at
+# forward; a lease whose holder died simply expires and can be taken over.
+
+def _lease_times(ttl_seconds: float) -> tuple[str, str]:
+    now = datetime.now(timezone.utc)
+    return now.isoformat(), (now + timedelta(seconds=ttl_seconds)).isoformat()
+
+
+@timed(DB_SECONDS, "acquire_scan_lease")
+def acquire_scan_lease(owner: str, scan_id: str, ttl_seconds: float) -> bool:
+    """Take the lease if it is free or expired. Atomic across processes."""
+    now, expires = _lease_times(ttl_seconds)
+    with get_db() as conn:
+        cur = conn.execute(
+            """UPDATE scan_lease
+               SET owner = ?, scan_id = ?, acquired_at = ?, heartbeat_at = ?, expires_at = ?
+               WHERE name = 'scan' AND (owner IS NULL OR expires_at < ?)""",
+            (owner, scan_id, now, now, expires, now),
+        )
+        if cur.rowcount:
+            _bump_generation(conn)
+        return cur.rowcount == 1
+
+
+@timed(DB_SECONDS, "renew_scan_lease")
+def renew_scan_lease(owner: str, scan_id: str, ttl_seconds: float) -> bool:
+    """Heartbeat. False if the lease was lost (expired and taken by another
+    worker, or by a later scan of this same worker)."""
+    now, expires = _lease_times(ttl_seconds)
+    with get_db() as conn:
+        cur = conn.execute(
+            """UPDATE scan_lease SET heartbeat_at = ?, expires_at = ?
+               WHERE name = 'scan' AND owner = ? AND scan_id = ?""",
+            (now, expires, owner, scan_id),
+        )
+        return cur.rowcount == 1
+
+
+@timed(DB_SECONDS, "release_scan_lease")
+def release_scan_lease(owner: str, scan_id: str, status: str):
+    """Give the lease up and record when and how the scan finished."""
+    now = datetime.now(timezone.utc).isoformat()
+    with get_db() as conn:
+        cur = conn.execute(
+            """UPDATE scan_lease
+               SET owner = NULL, expires_at = NULL, last_finished_at = ?, last_status = ?
+               WHERE name = 'scan' AND owner = ? AND scan_id = ?""",
+            (now, status, owner, scan_id),
+        )
+        if cur.rowcount:
+            _bump_generation(conn)
+
+
+@timed(DB_SECONDS, "get_scan_lease")
+def get_scan_lease() -> dict:
+    """Scan state as every worker sees it. `scan_id` is the running scan, or the
+    last one when nothing is running."""
+    now = datetime.now(timezone.utc).isoformat()
+    with get_db() as conn:
+        row = conn.execute("SELECT * FROM scan_lease WHERE name = 'scan'").fetchone()
+    scraping = bool(row and row["owner"] and row["expires_at"] and row["expires_at"] >= now)
+    return {
+        "scraping": scraping,
+        "scan_id": row["scan_id"] if row else None,
+        "owner": row["owner"] if scraping else None,
+        "started_at": row["acquired_at"] if row else None,
+        "heartbeat_at": row["heartbeat_at"] if row else None,
+        "last_scrape": row["last_finished_at"] if row else None,
+        "last_status": row["last_status"] if row else None,
+    }
+
+
 # --------------------------------------------------------------------------
 # Application tracker
 # --------------------------------------------------------------------------
 
-def save_application(job_id: int) -> bool:
-    """Save a job to the application tracker. Returns True if newly saved."""
+@timed(DB_SECONDS, "save_application")
+def save_application(job_id: int) -> str:
+    """Save a job to the application tracker: "created", "exists" (saved before),
+    "archived" (archived jobs can't be tracked) or "not_found"."""
     now = datetime.now(timezone.utc).isoformat()
     with get_db() as conn:
+        archive = _archive_table(conn)
+        if not conn.execute("SELECT 1 FROM jobs WHERE id = ?", (job_id,)).fetchone():
+            archived = conn.execute(f"SELECT 1 FROM {archive} WHERE id = ?", (job_id,)).fetchone()
+            return "archived" if archived else "not_found"
         try:
             conn.execute(
                 "INSERT INTO applications (job_id, status, date_saved) VALUES (?, 'interested', ?)",
                 (job_id, now),
             )
-            return True
+            _bump_generation(conn)
+            return "created"
         except sqlite3.IntegrityError:
-            return False
+            return "exists"
 
 
+@timed(DB_SECONDS, "update_application")
 def update_application(job_id: int, status: Optional[str] = None,
                        notes: Optional[str] = None, reminder_date: Optional[str] = None,
                        date_applied: Optional[str] = None):
@@ -412,19 +1367,23 @@ def update_application(job_id: int, status: Optional[str] = None,
             conn.execute("UPDATE applications SET reminder_date = ? WHERE job_id = ?", (reminder_date, job_id))
         if date_applied is not None:
             conn.execute("UPDATE applications SET date_applied = ? WHERE job_id = ?", (date_applied, job_id))
+        _bump_generation(conn)
 
 
+@timed(DB_SECONDS, "remove_application")
 def remove_application(job_id: int):
     with get_db() as conn:
-        conn.execute("DELETE FROM applications WHERE job_id = ?", (job_id,))
+        if conn.execute("DELETE FROM applications WHERE job_id = ?", (job_id,)).rowcount:
+            _bump_generation(conn)
 
 
+@timed(DB_SECONDS, "get_applications")
 def get_applications() -> list[dict]:
     """Get all saved applications with job details."""
     with get_db() as conn:
         rows = conn.execute("""
             SELECT a.*, j.title, j.company, j.location, j.url, j.source,
-                   j.score, j.snippet, j.salary_min, j.salary_max, j.salary_raw
+                   j.score, j.snippet, j.salary_min, j.salary_max, j.salary_raw, j.salary_period
             FROM applications a
             JOIN jobs j ON a.job_id = j.id
             ORDER BY
@@ -444,6 +1403,7 @@ def get_applications() -> list[dict]:
 # Feedback
 # --------------------------------------------------------------------------
 
+@timed(DB_SECONDS, "save_feedback")
 def save_feedback(improve: str = "", job_boards: str = "", suggestions: str = "") -> int:
     """Save a feedback entry. Returns the new feedback ID."""
     now = datetime.now(timezone.utc).isoformat()
@@ -455,6 +1415,7 @@ def save_feedback(improve: str = "", job_boards: str = "", suggestions: str = ""
         return cur.lastrowid
 
 
+@timed(DB_SECONDS, "get_all_feedback")
 def get_all_feedback() -> list[dict]:
     """Get all feedback entries, newest first."""
     with get_db() as conn:
@@ -468,6 +1429,7 @@ def get_all_feedback() -> list[dict]:
 # Custom keywords
 # --------------------------------------------------------------------------
 
+@timed(DB_SECONDS, "add_custom_keyword")
 def add_custom_keyword(keyword: str) -> bool:
     """Add a custom search keyword. Returns True if newly added."""
     now = datetime.now(timezone.utc).isoformat()
@@ -482,6 +1444,7 @@ def add_custom_keyword(keyword: str) -> bool:
             return False
 
 
+@timed(DB_SECONDS, "get_custom_keywords")
 def get_custom_keywords() -> list[dict]:
     """Get all custom keywords."""
     with get_db() as conn:
@@ -491,39 +1454,237 @@ def get_custom_keywords() -> list[dict]:
         return [dict(row) for row in rows]
 
 
+@timed(DB_SECONDS, "delete_custom_keyword")
 def delete_custom_keyword(keyword_id: int):
     """Delete a custom keyword by ID."""
     with get_db() as conn:
         conn.execute("DELETE FROM custom_keywords WHERE id = ?", (keyword_id,))
 
 
+# --------------------------------------------------------------------------
+# Source health
+# --------------------------------------------------------------------------
+
+@timed(DB_SECONDS, "get_source_health")
+def get_source_health() -> dict[str, dict]:
+    """Circuit breaker state of every source that has one, by source."""
+    with get_db() as conn:
+        rows = conn.execute("SELECT * FROM source_health ORDER BY source").fetchall()
+        return {row["source"]: dict(row) for row in rows}
+
+
+@timed(DB_SECONDS, "save_source_health")
+def save_source_health(health: dict):
+    cols = list(health)
+    with get_db() as conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO source_health ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+            [health[c] for c in cols],
+        )
+        _bump_generation(conn)
+
+
+# --------------------------------------------------------------------------
+# Query yield
+# --------------------------------------------------------------------------
+
+@timed(DB_SECONDS, "record_query_runs")
+def record_query_runs(
+    source: str, yields: dict[str, dict[str, int]], listings: Optional[dict[str, Iterable[str]]] = None,
+):
+    """Store one scan's results per query for source, and the external_ids each
+    query returned (`listings`), dropping old records."""
+    now = datetime.now(timezone.utc).isoformat()
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=QUERY_HISTORY_DAYS)).isoformat()
+    with get_db() as conn:
+        conn.executemany(
+            """INSERT INTO query_runs (source, query, ran_at, found, unique_found, new)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            [(source, query, now, y["found"], y["unique"], y["new"]) for query, y in yields.items()],
+        )
+        conn.executemany(
+            "INSERT OR REPLACE INTO listing_queries (source, external_id, query, seen_at) VALUES (?, ?, ?, ?)",
+            ((source, eid, query, now) for query, ids in (listings or {}).items() for eid in ids),
+        )
+        conn.execute("DELETE FROM query_runs WHERE ran_at < ?", (cutoff,))
+        conn.execute("DELETE FROM listing_queries WHERE source = ? AND seen_at < ?", (source, cutoff))
+
+
+@timed(DB_SECONDS, "get_query_history")
+def get_query_history(source: Optional[str] = None, runs: int = 3) -> dict:
+    """The latest `runs` runs of each query, newest first: {query: [run, ...]},
+    or {source: {query: [run, ...]}} across all sources when source is None."""
+    where, params = ("WHERE source = ?", [source]) if source is not None else ("", [])
+    with get_db() as conn:
+        rows = conn.execute(
+            f"""SELECT source, query, ran_at, found, unique_found, new FROM (
+                    SELECT *, ROW_NUMBER() OVER (
+                        PARTITION BY source, query ORDER BY ran_at DESC
+                    ) AS n FROM query_runs {where}
+                ) WHERE n <= ? ORDER BY source, query, ran_at DESC""",
+            params + [runs],
+        ).fetchall()
+    history: dict = {}
+    for row in rows:
+        run = dict(row)
+        src, query = run.pop("source"), run.pop("query")
+        by_query = history.setdefault(src, {}) if source is None else history
+        by_query.setdefault(query, []).append(run)
+    return history
+
+
+# --------------------------------------------------------------------------
+# Scan runs
+# --------------------------------------------------------------------------
+
+@timed(DB_SECONDS, "start_scan_run")
+def start_scan_run(scan_id: str, trigger: str):
+    with get_db() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO scan_runs (id, trigger, started_at) VALUES (?, ?, ?)",
+            (scan_id, trigger, datetime.now(timezone.utc).isoformat()),
+        )
+
+
+@timed(DB_SECONDS, "record_source_stats")
+def record_source_stats(scan_id: str, source: str, stats: dict):
+    """Store what one source cost and yielded in a scan. `statuses` is a
+    histogram of HTTP status codes ("error" for failed connections)."""
+    row = {**stats, "scan_id": scan_id, "source": source, "statuses": json.dumps(stats.get("statuses", {}))}
+    cols = list(row)
+    with get_db() as conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO scan_source_stats ({', '.join(cols)}) VALUES ({', '.join('?' * len(cols))})",
+            [row[c] for c in cols],
+        )
+
+
+@timed(DB_SECONDS, "finish_scan_run")
+def finish_scan_run(scan_id: str, status: str, seconds: float):
+    """Close a scan run with its totals, and drop runs older than SCAN_STATS_DAYS."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=SCAN_STATS_DAYS)).isoformat()
+    with get_db() as conn:
+        conn.execute(
+            """UPDATE scan_runs SET status = ?, finished_at = ?, seconds = ?,
+                   (sources, found, new, truncated) = (
+                       SELECT COUNT(*), COALESCE(SUM(found), 0), COALESCE(SUM(new), 0), COALESCE(SUM(truncated), 0)
+                       FROM scan_source_stats WHERE scan_id = ?
+                   )
+               WHERE id = ?""",
+            (status, datetime.now(timezone.utc).isoformat(), round(seconds, 3), scan_id, scan_id),
+        )
+        conn.execute(
+            "DELETE FROM scan_source_stats WHERE scan_id IN (SELECT id FROM scan_runs WHERE started_at < ?)",
+            (cutoff,),
+        )
+        conn.execute("DELETE FROM scan_runs WHERE started_at < ?", (cutoff,))
+
+
+@timed(DB_SECONDS, "get_scan_trends")
+def get_scan_trends(days: int = 30, recent: int = 10) -> dict:
+    """Scans over the last `days`: the latest `recent` runs, and per source its
+    averages (over runs that reached it), failures, empty runs, status codes
+    and latest `recent` runs, oldest first so they plot left to right."""
+    cutoff = (datetime.now(timezone.utc) - timedelta(days=days)).isoformat()
+    with get_db() as conn:
+        runs = conn.execute(
+            "SELECT * FROM scan_runs WHERE started_at >= ? ORDER BY started_at DESC LIMIT ?",
+            (cutoff, recent),
+        ).fetchall()
+        totals = conn.execute(
+            """SELECT s.source, COUNT(*) AS runs,
+                      SUM(s.status = 'failed') AS failed,
+                      SUM(s.status = 'skipped') AS skipped,
+                      SUM(s.truncated) AS truncated,
+                      SUM(s.status = 'done' AND s.found = 0) AS empty,
+                      SUM(s.requests) AS requests,
+                      SUM(s.bytes) AS bytes,
+                      SUM(s.new) AS new,
+                      AVG(CASE WHEN s.status != 'skipped' THEN s.total_seconds END) AS avg_seconds,
+                      AVG(CASE WHEN s.status != 'skipped' THEN s.fetch_seconds END) AS avg_fetch_seconds,
+                      AVG(CASE WHEN s.status != 'skipped' THEN s.parse_seconds END) AS avg_parse_seconds,
+                      AVG(CASE WHEN s.status != 'skipped' THEN s.score_seconds END) AS avg_score_seconds,
+                      AVG(CASE WHEN s.status != 'skipped' THEN s.write_seconds END) AS avg_write_seconds,
+                      AVG(CASE WHEN s.status != 'skipped' THEN s.found END) AS avg_found,
+                      AVG(CASE WHEN s.status != 'skipped' THEN s.new END) AS avg_new,
+                      MAX(r.started_at) AS last_run
+               FROM scan_source_stats s JOIN scan_runs r ON r.id = s.scan_id
+               WHERE r.started_at >= ?
+               GROUP BY s.source ORDER BY s.source""",
+            (cutoff,),
+        ).fetchall()
+        history = conn.execute(
+            """SELECT * FROM (
+                   SELECT s.*, r.started_at, ROW_NUMBER() OVER (
+                       PARTITION BY s.source ORDER BY r.started_at DESC
+                   ) AS n
+                   FROM scan_source_stats s JOIN scan_runs r ON r.id = s.scan_id
+                   WHERE r.started_at >= ?
+               ) WHERE n <= ? ORDER BY source, started_at""",
+            (cutoff, recent),
+        ).fetchall()
+        statuses = conn.execute(
+            """SELECT s.source, s.statuses FROM scan_source_stats s JOIN scan_runs r ON r.id = s.scan_id
+               WHERE r.started_at >= ?""",
+            (cutoff,),
+        ).fetchall()
+
+    sources = {}
+    for row in totals:
+        summary = dict(row)
+        for key in summary:
+            if key.startswith("avg_") and summary[key] is not None:
+                summary[key] = round(summary[key], 3)
+        summary["statuses"] = {}
+        summary["recent"] = []
+        sources[summary.pop("source")] = summary
+    for row in statuses:
+        histogram = sources[row["source"]]["statuses"]
+        for code, count in json.loads(row["statuses"]).items():
+            histogram[code] = histogram.get(code, 0) + count
+    for row in history:
+        sources[row["source"]]["recent"].append({
+            "scan_id": row["scan_id"], "started_at": row["started_at"], "status": row["status"],
+            "seconds": row["total_seconds"], "requests": row["requests"], "found": row["found"],
+            "new": row["new"], "truncated": bool(row["truncated"]), "error": row["error"],
+        })
+    return {"runs": [dict(row) for row in runs], "sources": sources}
+
+
 # --------------------------------------------------------------------------
 # Custom job boards
 # --------------------------------------------------------------------------
 
-def add_custom_job_board(name: str, url: str = "") -> bool:
-    """Add a custom job board. Returns True if newly added."""
+@timed(DB_SECONDS, "add_custom_job_board")
+def add_custom_job_board(name: str, url: str = "", spec: Optional[dict] = None) -> bool:
+    """Add a custom job board, optionally with its scraper spec (queries and
+    selectors, see BoardSpec). Returns True if newly added."""
     now = datetime.now(timezone.utc).isoformat()
     with get_db() as conn:
+        # name has no UNIQUE constraint (the table predates it)
+        if conn.execute("SELECT 1 FROM custom_job_boards WHERE name = ?", (name.strip(),)).fetchone():
+            return False
         try:
             conn.execute(
-                "INSERT INTO custom_job_boards (name, url, created_at) VALUES (?, ?, ?)",
-                (name.strip(), url.strip(), now),
+                "INSERT INTO custom_job_boards (name, url, spec, created_at) VALUES (?, ?, ?, ?)",
+                (name.strip(), url.strip(), json.dumps(spec) if spec else None, now),
             )
             return True
         except sqlite3.IntegrityError:
             return False
 
 
+@timed(DB_SECONDS, "get_custom_job_boards")
 def get_custom_job_boards() -> list[dict]:
     """Get all custom job boards."""
     with get_db() as conn:
         rows = conn.execute(
             "SELECT * FROM custom_job_boards ORDER BY created_at DESC"
         ).fetchall()
-        return [dict(row) for row in rows]
+        return [{**dict(row), "spec": json.loads(row["spec"]) if row["spec"] else None} for row in rows]
 
 
+@timed(DB_SECONDS, "delete_custom_job_board")
 def delete_custom_job_board(board_id: int):
     """Delete a custom job board by ID."""
     with get_db() as conn:
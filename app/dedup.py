@@ -0,0 +1,100 @@
+"""Near-duplicate detection for job listings: MinHash signatures with LSH banding."""
+
+import hashlib
+import re
+from array import array
+from functools import lru_cache
+from typing import Optional
+
+from app.config import DEDUP_BANDS, DEDUP_ROWS, DEDUP_THRESHOLD, DEDUP_THRESHOLD_NO_COMPANY
+
+NUM_PERM = DEDUP_BANDS * DEDUP_ROWS
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+def _seed(i: int) -> int:
+    return int.from_bytes(hashlib.blake2b(f"minhash-{i}".encode(), digest_size=8).digest(), "big")
+
+
+# Fixed (a, b) pairs so signatures stored in SQLite stay comparable across runs
+_PERMS = [(_seed(2 * i) % (_PRIME - 1) + 1, _seed(2 * i + 1) % _PRIME) for i in range(NUM_PERM)]
+
+_GENDER_RE = re.compile(r"\(\s*[mfvwxd](?:\s*/\s*[mfvwxd])+\s*\)")
+_TITLE_NOISE_RE = re.compile(
+    r"\b(?:english[\s-]speaking|english|fulltime|full[\s-]time|part[\s-]time|parttime|"
+    r"temporary|temp|urgent|vacancy|job|\d+\s*(?:-\s*\d+\s*)?(?:uur|hours|hrs))\b"
+)
+_COMPANY_SUFFIX_RE = re.compile(
+    r"\b(?:b\.?\s?v\.?|n\.?\s?v\.?|inc\.?|ltd\.?|llc|gmbh|group|holding|nederland|netherlands|the)(?=\W|$)"
+)
+_NON_WORD_RE = re.compile(r"[^\w]+")
+
+
+def normalize_title(title: str) -> str:
+    t = _GENDER_RE.sub(" ", (title or "").lower())
+    t = _TITLE_NOISE_RE.sub(" ", t)
+    return " ".join(_NON_WORD_RE.sub(" ", t).split())
+
+
+@lru_cache(maxsize=4096)
+def normalize_company(company: Optional[str]) -> str:
+    c = _COMPANY_SUFFIX_RE.sub(" ", (company or "").lower())
+    return " ".join(_NON_WORD_RE.sub(" ", c).split())
+
+
+def shingles(title: str) -> set[str]:
+    """Character trigrams of the normalised title (titles are too short for word shingles)."""
+    t = f" {normalize_title(title)} "
+    return {t[i:i + 3] for i in range(len(t) - 2)} or {t}
+
+
+def minhash(title: str) -> tuple[int, ...]:
+    hashes = [
+        int.from_bytes(hashlib.blake2b(s.encode(), digest_size=8).digest(), "big")
+        for s in shingles(title)
+    ]
+    return tuple(min((a * h + b) % _PRIME for h in hashes) & _MAX_HASH for a, b in _PERMS)
+
+
+def band_keys(signature: tuple[int, ...]) -> list[str]:
+    """One LSH bucket key per band; listings sharing any bucket are candidates."""
+    keys = []
+    for band in range(DEDUP_BANDS):
+        chunk = array("I", signature[band * DEDUP_ROWS:(band + 1) * DEDUP_ROWS]).tobytes()
+        keys.append(f"{band}:{hashlib.blake2b(chunk, digest_size=8).hexdigest()}")
+    return keys
+
+
+def pack(signature: tuple[int, ...]) -> bytes:
+    return array("I", signature).tobytes()
+
+
+def unpack(blob: bytes) -> tuple[int, ...]:
+    return tuple(array("I", blob))
+
+
+def similarity(a: tuple[int, ...], b: tuple[int, ...]) -> float:
+    """Estimated Jaccard similarity of the two titles' shingle sets."""
+    return sum(x == y for x, y in zip(a, b)) / NUM_PERM
+
+
+def compatible(company_a: Optional[str], city_a: Optional[str],
+               company_b: Optional[str], city_b: Optional[str]) -> bool:
+    """False when both sides name a company, or a city, and they differ."""
+    ca, cb = normalize_company(company_a), normalize_company(company_b)
+    if ca and cb and ca != cb:
+        return False
+    return not (city_a and city_b and city_a != city_b)
+
+
+def same_vacancy(sig_a: tuple[int, ...], company_a: Optional[str], city_a: Optional[str],
+                 sig_b: tuple[int, ...], company_b: Optional[str], city_b: Optional[str]) -> bool:
+    """Titles similar enough, companies and cities not contradicting each other.
+    A missing company on either side needs a closer title match."""
+    if not compatible(company_a, city_a, company_b, city_b):
+        return False
+    ca, cb = normalize_company(company_a), normalize_company(company_b)
+    threshold = DEDUP_THRESHOLD if ca and cb else DEDUP_THRESHOLD_NO_COMPANY
+    return similarity(sig_a, sig_b) >= threshold
@@ -0,0 +1,119 @@
+"""Detail-page enrichment: full job descriptions for listings whose card text is thin."""
+
+import asyncio
+import logging
+from collections import defaultdict
+from typing import Iterable, Optional
+from urllib.parse import urlsplit
+
+import httpx
+from bs4 import BeautifulSoup
+
+from app.config import (
+    DETAIL_MIN_SNIPPET_CHARS,
+    DETAIL_MAX_PER_SCAN,
+    DETAIL_CONCURRENCY_PER_HOST,
+    DETAIL_MAX_CHARS,
+    DETAIL_SELECTORS,
+    DETAIL_FALLBACK_SELECTORS,
+    REQUEST_TIMEOUT,
+)
+from app.database import cache_details, get_cached_details, get_jobs_needing_details, prune_detail_cache
+from app.metrics import DETAIL_CACHE_LOOKUPS
+from app.scrapers import RawJob, _clean, _delay, _random_headers, json_ld_postings
+
+logger = logging.getLogger(__name__)
+
+
+def jobs_needing_details(sources: Iterable[str]) -> list[tuple[int, RawJob]]:
+    """(job id, job) for stored jobs of `sources` whose card text is too thin to
+    score and whose detail page isn't fetched yet, best score first. Jobs a
+    scan had no budget or time for stay on the list for the next one."""
+    return [
+        (row["id"], RawJob(
+            title=row["title"], company=row["company"], location=row["location"], snippet=row["snippet"],
+            url=row["url"], source=row["source"], date_posted=row["date_posted"],
+        ))
+        for row in get_jobs_needing_details(sources, DETAIL_MIN_SNIPPET_CHARS)
+    ]
+
+
+def extract_description(html: str, source: str) -> Optional[str]:
+    """Plain-text description from a detail page: the JSON-LD JobPosting when the
+    board embeds one, else the first matching description container."""
+    soup = BeautifulSoup(html, "html.parser")
+    desc = next((p["description"] for p in json_ld_postings(soup) if p.get("description")), None)
+    if desc:
+        text = BeautifulSoup(desc, "html.parser").get_text(" ")
+    else:
+        text = None
+        for selector in DETAIL_SELECTORS.get(source, []) + DETAIL_FALLBACK_SELECTORS:
+            el = soup.select_one(selector)
+            if el:
+                text = el.get_text(" ")
+                break
+    text = _clean(text)
+    return text[:DETAIL_MAX_CHARS] if text else None
+
+
+async def fetch_descriptions(
+    client: httpx.AsyncClient,
+    jobs: list[RawJob],
+    budget: int = DETAIL_MAX_PER_SCAN,
+    deadline: Optional[float] = None,
+) -> tuple[dict[str, str], dict[str, int]]:
+    """Descriptions by URL for `jobs`, from the cache or their detail pages.
+
+    At most `budget` pages are requested, in the order given, and at most
+    DETAIL_CONCURRENCY_PER_HOST at a time against any one host. Every fetch,
+    failed ones included, is cached so it isn't repeated next scan. Fetches
+    still pending at `deadline` (event loop time) are dropped and counted as
+    out_of_time, uncached: their jobs stay in jobs_needing_details for the
+    next scan."""
+    prune_detail_cache()
+    sources = {job.url: job.source for job in jobs}
+    cached = get_cached_details(list(sources))
+    descriptions = {url: desc for url, desc in cached.items() if desc}
+    to_fetch = [url for url in sources if url not in cached]
+    DETAIL_CACHE_LOOKUPS.inc("hit", amount=len(cached))
+    DETAIL_CACHE_LOOKUPS.inc("miss", amount=len(to_fetch))
+    stats = {
+        "cached": len(descriptions),
+        "fetched": 0,
+        "failed": 0,
+        "skipped": max(0, len(to_fetch) - budget),
+        "out_of_time": 0,
+    }
+    host_slots: dict[str, asyncio.Semaphore] = defaultdict(
+        lambda: asyncio.Semaphore(DETAIL_CONCURRENCY_PER_HOST)
+    )
+
+    async def fetch(url: str):
+        status, desc = None, None
+        try:
+            host = urlsplit(url).netloc
+        except ValueError:  # the request below fails on it, and is recorded
+            host = ""
+        async with host_slots[host]:
+            try:
+                async with asyncio.timeout_at(deadline):
+                    resp = await client.get(url, headers=_random_headers(), timeout=REQUEST_TIMEOUT)
+                    status = resp.status_code
+                    if status == 200:
+                        # Parsing a full page takes long enough to stall the event loop
+                        desc = await asyncio.to_thread(extract_description, resp.text, sources[url])
+            except TimeoutError:
+                stats["out_of_time"] += 1
+                return
+            except Exception as e:  # HTTP errors, bad URLs, unparseable pages: one URL, not the stage
+                logger.warning("Detail page %s failed: %s: %s", url, type(e).__name__, e)
+            await _delay()
+        cache_details(url, status, desc)
+        if desc:
+            descriptions[url] = desc
+            stats["fetched"] += 1
+        else:
+            stats["failed"] += 1
+
+    await asyncio.gather(*(fetch(url) for url in to_fetch[:budget]))
+    return descriptions, stats
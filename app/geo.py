@@ -0,0 +1,80 @@
+"""Offline gazetteer of Dutch places and distance helpers for Katya's JobFinder."""
+
+import csv
+import math
+import re
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from app.config import HAARLEM_LAT, HAARLEM_LNG
+
+GAZETTEER_PATH = Path(__file__).parent / "data" / "nl_places.csv"
+
+_EARTH_RADIUS_KM = 6371.0
+# Degrees of latitude per km are constant; degrees of longitude shrink with cos(lat)
+_KM_PER_DEG_LAT = 111.32
+
+
+@dataclass(frozen=True)
+class Place:
+    name: str
+    province: str
+    lat: float
+    lng: float
+
+
+@lru_cache(maxsize=1)
+def _load_gazetteer() -> tuple[dict[str, Place], re.Pattern]:
+    """Load the bundled gazetteer and build one alternation pattern over all
+    names and aliases (longest first, so "Amsterdam-Zuidoost" beats "Amsterdam")."""
+    by_name: dict[str, Place] = {}
+    with GAZETTEER_PATH.open(encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            place = Place(row["name"], row["province"], float(row["lat"]), float(row["lng"]))
+            by_name[place.name.lower()] = place
+            for alias in filter(None, (row["aliases"] or "").split("|")):
+                by_name.setdefault(alias.strip().lower(), place)
+    names = sorted(by_name, key=len, reverse=True)
+    pattern = re.compile(r"(?<![\w-])(" + "|".join(re.escape(n) for n in names) + r")(?![\w-])")
+    return by_name, pattern
+
+
+@lru_cache(maxsize=4096)
+def resolve_location(location: Optional[str]) -> Optional[Place]:
+    """Resolve a free-text job location to a gazetteer place (first place named wins)."""
+    if not location:
+        return None
+    by_name, pattern = _load_gazetteer()
+    m = pattern.search(location.lower())
+    return by_name[m.group(1)] if m else None
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in km."""
+    p1, p2 = math.radians(lat1), math.radians(lat2)
+    dp = p2 - p1
+    dl = math.radians(lng2 - lng1)
+    a = math.sin(dp / 2) ** 2 + math.cos(p1) * math.cos(p2) * math.sin(dl / 2) ** 2
+    return 2 * _EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+
+
+def distance_from_home(lat: float, lng: float) -> float:
+    """Straight-line distance from home (Haarlem) in km, one decimal."""
+    return round(haversine_km(HAARLEM_LAT, HAARLEM_LNG, lat, lng), 1)
+
+
+def bounding_box(lat: float, lng: float, radius_km: float) -> tuple[float, float, float, float]:
+    """(min_lat, max_lat, min_lng, max_lng) enclosing a circle of radius_km."""
+    dlat = radius_km / _KM_PER_DEG_LAT
+    dlng = radius_km / (_KM_PER_DEG_LAT * math.cos(math.radians(lat)))
+    return lat - dlat, lat + dlat, lng - dlng, lng + dlng
+
+
+def geocode_job(location: Optional[str]) -> dict:
+    """Coordinates and distance from home for a job location, or all None."""
+    place = resolve_location(location)
+    if not place:
+        return {"lat": None, "lng": None, "distance_km": None}
+    return {"lat": place.lat, "lng": place.lng, "distance_km": distance_from_home(place.lat, place.lng)}
@@ -1,19 +1,28 @@
 """FastAPI application — Katya's JobFinder."""
 
 import asyncio
+import gzip
 import logging
+import time
 from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 from typing import Optional
 
-from fastapi import FastAPI, Query
-from fastapi.responses import FileResponse, JSONResponse
+from fastapi import FastAPI, Query, Request
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import (
+    FileResponse, JSONResponse, ORJSONResponse, PlainTextResponse, Response, StreamingResponse,
+)
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel
+import orjson
+from pydantic import BaseModel, Field
+from starlette.datastructures import Headers
 
 from app.database import (
-    get_jobs, get_job_by_id, get_job_count, get_stats, get_filter_counts,
-    hide_job, init_db, mark_all_seen,
+    JOB_COLUMNS, get_jobs, get_job_by_id, get_description, get_duplicates, get_jobs_by_ids, get_job_count, get_stats, get_filter_counts,
+    hide_job, init_db, mark_all_seen, current_generation,
+    acquire_scan_lease, renew_scan_lease, release_scan_lease, get_scan_lease, archive_jobs,
+    start_scan_run, finish_scan_run, get_scan_trends,
     save_application, update_application, remove_application, get_applications,
     save_feedback, get_all_feedback,
     add_custom_keyword, get_custom_keywords, delete_custom_keyword,
@@ -21,26 +30,67 @@ from app.database import (
 )
 from app.scorer import (
     generate_fit_analysis, generate_cover_letter, get_commute_info,
-    compute_posting_age, compute_score_breakdown,
+    posting_age_label, enrich_job, detect_dutch,
+)
+from app.caching import ResponseCache, accepts_gzip, etag_matches, make_etag
+from app.dedup import normalize_company
+from app.geo import resolve_location
+from app.metrics import MetricsMiddleware, collector, render
+from app.profiling import (
+    ProfilingMiddleware, Sampler, list_profiles, new_profile_name, profile_token, read_profile, requested,
+    save_profile,
+)
+from app.config import (
+    RESPONSE_CACHE_ENTRIES, GZIP_MIN_BYTES, GZIP_LEVEL,
+    SCAN_BUDGET_SECONDS, SCAN_STATS_DAYS, SCAN_LEASE_TTL_SECONDS, SCAN_LEASE_HEARTBEAT_SECONDS, SCAN_LEASE_POLL_SECONDS,
 )
-from app.scrapers import scrape_all
+from app.queries import yield_report
+from app.scans import WORKER_ID, Scan, get_scan, new_scan_id, start_scan
+from app.scheduler import create_scheduler, next_runs, scheduler_enabled, source_groups
+from app.scrapers import SELECTOR_FIELDS, custom_board_conflict, scrape_all
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(message)s")
 logger = logging.getLogger(__name__)
 
-_scrape_lock = asyncio.Lock()
-_last_scrape: Optional[str] = None
-_scraping = False
+_response_cache = ResponseCache(RESPONSE_CACHE_ENTRIES)
+_scheduler = None
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    global _scheduler
     init_db()
     logger.info("Database initialized")
+    if scheduler_enabled():
+        _scheduler = create_scheduler(lambda sources: _start_scrape(sources, trigger="schedule"))
+        _scheduler.start()
+        logger.info("Scheduler started: %s", ", ".join(f"{h:g}h" for h in source_groups()))
     yield
-
-
-app = FastAPI(title="Katya's JobFinder", lifespan=lifespan)
+    if _scheduler:
+        _scheduler.shutdown(wait=False)
+        _scheduler = None
+
+
+class _GZipMiddleware(GZipMiddleware):
+    """GZip that honours Accept-Encoding q-values (Starlette's only looks for
+    "gzip" in the header) and leaves Server-Sent Event streams alone:
+    compressed chunks would sit in the zlib buffer instead of reaching the
+    browser as they happen."""
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            headers = Headers(scope=scope)
+            if "text/event-stream" in headers.get("accept", "") or not accepts_gzip(headers.get("accept-encoding")):
+                await self.app(scope, receive, send)
+                return
+        await super().__call__(scope, receive, send)
+
+
+app = FastAPI(title="Katya's JobFinder", lifespan=lifespan, default_response_class=ORJSONResponse)
+app.add_middleware(_GZipMiddleware, minimum_size=GZIP_MIN_BYTES, compresslevel=GZIP_LEVEL)
+app.add_middleware(ProfilingMiddleware)
+# Outermost, so request latency includes compression
+app.add_middleware(MetricsMiddleware)
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
 
@@ -59,10 +109,71 @@ async def feedback_page():
     return FileResponse("app/static/feedback.html")
 
 
+# ---- HTTP caching ----
+
+def _cached_json(request: Request, build, extra: tuple = ()) -> Response:
+    """Serve a read API with an ETag derived from the data generation and the
+    query. Answers 304 without touching SQLite when the client is current, and
+    reuses the rendered body for repeated identical queries."""
+    etag = make_etag(current_generation(), request.url.path, request.query_params.multi_items(), extra)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    body = _response_cache.get(etag)
+    if body is None:
+        body = ORJSONResponse(build()).body
+        _response_cache.put(etag, body)
+    # Large bodies are compressed once and cached; GZipMiddleware passes
+    # responses that already carry a Content-Encoding through untouched
+    if len(body) >= GZIP_MIN_BYTES and accepts_gzip(request.headers.get("accept-encoding")):
+        gz_key = etag + ";gzip"
+        gz_body = _response_cache.get(gz_key)
+        if gz_body is None:
+            gz_body = gzip.compress(body, compresslevel=GZIP_LEVEL)
+            _response_cache.put(gz_key, gz_body)
+        headers["Content-Encoding"] = "gzip"
+        return Response(gz_body, media_type="application/json", headers=headers)
+    return Response(body, media_type="application/json", headers=headers)
+
+
 # ---- Jobs API ----
 
+# Fields computed per job after the query, with the columns each one needs
+_DERIVED_FIELDS = {
+    "posting_age_text": ("age_days",),
+    "posting_age_color": ("age_days",),
+    "score_breakdown": ("title", "company", "location", "snippet", "dutch_level"),
+}
+# The list view shows a title line, badges and a 3-line snippet; the score
+# breakdown arrives with the /api/jobs/enrich prefetch
+CARD_FIELDS = (
+    "id", "title", "company", "location", "distance_km", "url", "source", "score", "is_new",
+    "salary_min", "salary_max", "salary_period", "salary_raw", "date_posted", "category",
+    "posting_type", "dutch_level", "work_model", "snippet", "posting_age_text", "posting_age_color",
+)
+CARD_SNIPPET_CHARS = 300
+
+
+def _resolve_fields(view: str, fields: Optional[str], collapse: bool = False) -> Optional[list[str]]:
+    """Output fields for a /api/jobs request; None means the full record.
+    cluster_size only exists in the collapsed view."""
+    requested = [f.strip() for f in (fields or "").split(",") if f.strip()]
+    if requested:
+        if "cluster_size" in requested and not collapse:
+            raise ValueError("Field cluster_size requires collapse=true")
+        unknown = [
+            f for f in requested
+            if f not in JOB_COLUMNS and f not in _DERIVED_FIELDS and f != "cluster_size"
+        ]
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+        return requested
+    return list(CARD_FIELDS) if view == "card" else None
+
+
 @app.get("/api/jobs")
 async def api_jobs(
+    request: Request,
     source: Optional[str] = Query(None),
     search: Optional[str] = Query(None),
     only_new: bool = Query(False),
@@ -75,72 +186,334 @@ async def api_jobs(
     limit: int = Query(200, le=500),
     offset: int = Query(0, ge=0),
     dutch_filter: str = Query("all"),
+    max_age_days: Optional[int] = Query(None, ge=0),
+    max_km: Optional[float] = Query(None, gt=0),
+    include_closed: bool = Query(False),
+    collapse: bool = Query(False),
+    view: str = Query("full", pattern="^(card|full)$"),
+    fields: Optional[str] = Query(None),
 ):
-    jobs = get_jobs(
-        source=source, search=search, only_new=only_new,
-        min_salary=min_salary, category=category, city=city,
-        posting_type=posting_type, company=company, sort=sort,
-        limit=limit, offset=offset, dutch_filter=dutch_filter,
-    )
-    total = get_job_count(
-        source=source, search=search, only_new=only_new,
-        min_salary=min_salary, category=category, city=city,
-        posting_type=posting_type, company=company,
-        dutch_filter=dutch_filter,
-    )
-    # Enrich each job with posting age and score breakdown
-    for job in jobs:
-        age = compute_posting_age(job.get("date_posted"), job.get("date_scraped"))
-        job["posting_age_text"] = age["text"]
-        job["posting_age_color"] = age["color"]
-        job["score_breakdown"] = compute_score_breakdown(
-            job.get("title", ""),
-            job.get("company", ""),
-            job.get("location", ""),
-            job.get("snippet", ""),
-            dutch_level=job.get("dutch_level", ""),
+    try:
+        out_fields = _resolve_fields(view, fields, collapse)
+    except ValueError as e:
+        return JSONResponse({"error": str(e)}, status_code=400)
+
+    card = out_fields == list(CARD_FIELDS)
+    if collapse and out_fields is not None and "cluster_size" not in out_fields:
+        out_fields.append("cluster_size")
+    # Columns to fetch: the requested ones plus whatever derived fields depend on
+    columns = None
+    if out_fields is not None:
+        columns = [f for f in out_fields if f in JOB_COLUMNS]
+        for f in out_fields:
+            columns.extend(_DERIVED_FIELDS.get(f, ()))
+
+    def build():
+        jobs = get_jobs(
+            source=source, search=search, only_new=only_new,
+            min_salary=min_salary, category=category, city=city,
+            posting_type=posting_type, company=company, sort=sort,
+            limit=limit, offset=offset, dutch_filter=dutch_filter,
+            max_age_days=max_age_days, max_km=max_km, include_closed=include_closed,
+            collapse=collapse, fields=columns, snippet_chars=CARD_SNIPPET_CHARS if card else None,
+        )
+        total = get_job_count(
+            source=source, search=search, only_new=only_new,
+            min_salary=min_salary, category=category, city=city,
+            posting_type=posting_type, company=company,
+            dutch_filter=dutch_filter, max_age_days=max_age_days, max_km=max_km,
+            include_closed=include_closed, collapse=collapse,
         )
-    return {"jobs": jobs, "total": total}
+        wanted = set(out_fields) if out_fields is not None else None
+        # Enrich each job with posting age (computed in SQL) and score breakdown
+        for job in jobs:
+            if wanted is None or "posting_age_text" in wanted or "posting_age_color" in wanted:
+                age = posting_age_label(job.get("age_days"))
+                job["posting_age_text"] = age["text"]
+                job["posting_age_color"] = age["color"]
+            if wanted is None or "score_breakdown" in wanted:
+                job["score_breakdown"] = _enrichment(job)["score_breakdown"]
+        if wanted is not None:
+            jobs = [{k: job[k] for k in out_fields if k in job} for job in jobs]
+        return {"jobs": jobs, "total": total}
+
+    # Posting ages and the freshness cutoff move with the clock: key on the hour
+    hour = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H")
+    return _cached_json(request, build, extra=(hour,))
+
+
+def _enrichment(job: dict) -> dict:
+    # Same text the scan scored: card snippet plus the detail-page description
+    text = " ".join(t for t in (job.get("snippet"), job.get("description")) if t)
+    return enrich_job(
+        job.get("title") or "",
+        job.get("company") or "",
+        job.get("location") or "",
+        text,
+        dutch_level=job.get("dutch_level") or "",
+    )
+
+
+@app.get("/api/jobs/{job_id}")
+async def api_job_detail(job_id: int):
+    """Full record for one job, with posting age, fit, commute, score breakdown
+    and the other listings of the same vacancy."""
+    job = get_job_by_id(job_id)
+    if not job:
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    age = posting_age_label(job.get("age_days"))
+    job["posting_age_text"] = age["text"]
+    job["posting_age_color"] = age["color"]
+    job["description"] = get_description(job_id)
+    job.update(_enrichment(job))
+    job["duplicates"] = get_duplicates(job_id)
+    return ORJSONResponse(job)
+
+
+class EnrichRequest(BaseModel):
+    ids: list[int] = Field(..., max_length=500)
+
+
+@app.post("/api/jobs/enrich")
+async def api_enrich_jobs(body: EnrichRequest):
+    """Fit analysis, commute estimate and score breakdown for many jobs in one call."""
+    jobs = get_jobs_by_ids(list(dict.fromkeys(body.ids)))
+    results = {job["id"]: _enrichment(job) for job in jobs}
+    missing = [job_id for job_id in body.ids if job_id not in results]
+    # Returned as a response object so the payload skips jsonable_encoder
+    return ORJSONResponse({"results": results, "missing": missing})
 
 
 @app.get("/api/filters")
-async def api_filters():
+async def api_filters(request: Request):
     """Return counts for all filter panels."""
-    return get_filter_counts()
+    return _cached_json(request, get_filter_counts)
 
 
 @app.get("/api/stats")
-async def api_stats():
-    stats = get_stats()
-    stats["last_scrape"] = _last_scrape
-    stats["scraping"] = _scraping
-    return stats
-
-
-@app.post("/api/scrape")
-async def api_scrape():
-    global _last_scrape, _scraping
+async def api_stats(request: Request):
+    def build():
+        stats = get_stats()
+        stats["last_scrape"] = lease["last_scrape"]
+        stats["scraping"] = lease["scraping"]
+        stats["scan_id"] = lease["scan_id"] if lease["scraping"] else None
+        stats["schedule"] = schedule
+        return stats
+    # The lease row is shared by all workers; its expiry depends on the clock,
+    # so it is read on every request and made part of the cache key
+    lease = get_scan_lease()
+    schedule = next_runs(_scheduler)
+    return _cached_json(
+        request, build,
+        extra=(lease["scraping"], lease["scan_id"], tuple(r["next_run"] for r in schedule)),
+    )
 
-    if _scraping:
-        return JSONResponse({"status": "already_running"}, status_code=409)
 
-    async def run_scrape():
-        global _last_scrape, _scraping
-        _scraping = True
+# ---- Profiles ----
+
+def _profile_denied(request: Request) -> Optional[JSONResponse]:
+    if not profile_token():
+        return JSONResponse({"error": "Profiling is disabled"}, status_code=404)
+    if not requested(request.scope):
+        return JSONResponse({"error": "Profile token required"}, status_code=403)
+    return None
+
+
+@app.get("/api/profiles")
+async def api_profiles(request: Request):
+    """Stored request and scan profiles, newest first. Needs the profile token."""
+    return _profile_denied(request) or {"profiles": list_profiles()}
+
+
+@app.get("/api/profiles/{name}")
+async def api_profile(name: str, request: Request):
+    """One profile as folded stacks, ready for flamegraph.pl or speedscope."""
+    denied = _profile_denied(request)
+    if denied:
+        return denied
+    folded = read_profile(name)
+    if folded is None:
+        return JSONResponse({"error": "Profile not found"}, status_code=404)
+    return PlainTextResponse(folded)
+
+
+# ---- Metrics ----
+
+def _cache_counts() -> dict[str, tuple[int, int]]:
+    """(hits, misses) of the response cache and the lru caches on hot paths."""
+    stats = _response_cache.stats()
+    counts = {"response": (stats["hits"], stats["misses"])}
+    for name, fn in (
+        ("enrich_job", enrich_job), ("detect_dutch", detect_dutch),
+        ("resolve_location", resolve_location), ("normalize_company", normalize_company),
+    ):
+        info = fn.cache_info()
+        counts[name] = (info.hits, info.misses)
+    return counts
+
+
+@collector("jobfinder_cache_hits_total", "Cache hits by cache.", "counter")
+def _cache_hits():
+    return [({"cache": name}, hits) for name, (hits, _) in _cache_counts().items()]
+
+
+@collector("jobfinder_cache_misses_total", "Cache misses by cache.", "counter")
+def _cache_misses():
+    return [({"cache": name}, misses) for name, (_, misses) in _cache_counts().items()]
+
+
+@collector("jobfinder_cache_hit_ratio", "Share of lookups served from cache since startup.")
+def _cache_hit_ratio():
+    return [
+        ({"cache": name}, hits / (hits + misses) if hits + misses else 0.0)
+        for name, (hits, misses) in _cache_counts().items()
+    ]
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics of this worker process."""
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4")
+
+
+def _start_scrape(
+    sources: Optional[list[str]] = None,
+    trigger: str = "manual",
+    incremental: Optional[bool] = None,
+    budget: Optional[float] = None,
+    profile: bool = False,
+) -> Optional[Scan]:
+    """Start a background scan if this worker gets the scan lease, else return None.
+    With `profile` the scan is stack-sampled and stored as scan.profile."""
+    scan_id = new_scan_id()
+    profile_name = new_profile_name("scan", scan_id) if profile else None
+    if not acquire_scan_lease(WORKER_ID, scan_id, SCAN_LEASE_TTL_SECONDS):
+        return None
+
+    async def run_scrape(scan: Scan) -> dict[str, int]:
+        task = asyncio.current_task()
+        lost = False
+
+        async def heartbeat():
+            nonlocal lost
+            while True:
+                await asyncio.sleep(SCAN_LEASE_HEARTBEAT_SECONDS)
+                if not renew_scan_lease(WORKER_ID, scan_id, SCAN_LEASE_TTL_SECONDS):
+                    # Expired and taken over: stop so two workers never scan at once
+                    lost = True
+                    task.cancel()
+                    return
+
+        beat = asyncio.create_task(heartbeat())
+        status = "failed"
+        started = time.perf_counter()
+        start_scan_run(scan.id, scan.trigger)
+        sampler = Sampler().start() if profile_name else None
         try:
-            results = await scrape_all()
-            _last_scrape = datetime.now(timezone.utc).isoformat()
+            results = await scrape_all(
+                on_progress=scan.emit, sources=sources, incremental=incremental, budget=budget, scan_id=scan.id,
+            )
+            status = "completed"
+            # Only the lease holder gets here, so archival never runs twice at once
+            archived = archive_jobs()
+            if archived["archived"]:
+                logger.info("Archived %d jobs, freed %d pages", archived["archived"], archived["freed_pages"])
             return results
+        except asyncio.CancelledError:
+            if not lost:
+                raise
+            raise RuntimeError("scan lease lost to another worker")
         finally:
-            _scraping = False
+            beat.cancel()
+            release_scan_lease(WORKER_ID, scan_id, status)
+            finish_scan_run(scan.id, status, time.perf_counter() - started)
+            if sampler:
+                save_profile(profile_name, sampler.stop())
 
-    if _scrape_lock.locked():
-        return JSONResponse({"status": "already_running"}, status_code=409)
+    scan = start_scan(run_scrape, trigger=trigger, scan_id=scan_id)
+    scan.profile = profile_name
+    return scan
 
-    async with _scrape_lock:
-        results = await run_scrape()
 
-    return {"status": "completed", "results": results, "scraped_at": _last_scrape}
+@app.post("/api/scrape")
+async def api_scrape(
+    request: Request,
+    full: bool = Query(False),
+    budget: Optional[float] = Query(None, gt=0, le=SCAN_BUDGET_SECONDS),
+):
+    """Start a scan in the background; progress streams from /api/scans/{id}/events.
+    `full=true` re-processes listings that are already stored; `budget` caps the
+    scan at fewer seconds than SCAN_BUDGET_SECONDS. With the profile token (see
+    PROFILE_TOKEN) the scan is profiled too, under the name returned as `profile`."""
+    scan = _start_scrape(incremental=False if full else None, budget=budget, profile=requested(request.scope))
+    if not scan:
+        lease = get_scan_lease()
+        return JSONResponse(
+            {"status": "already_running", "scan_id": lease["scan_id"] if lease["scraping"] else None},
+            status_code=409,
+        )
+    return JSONResponse(
+        {
+            "status": "started", "scan_id": scan.id, "events": f"/api/scans/{scan.id}/events",
+            "profile": scan.profile,
+        },
+        status_code=202,
+    )
+
+
+def _lease_summary(scan_id: str) -> Optional[dict]:
+    """Status of a scan run by another worker, as far as the shared lease knows."""
+    lease = get_scan_lease()
+    if lease["scan_id"] != scan_id:
+        return None
+    return {
+        "scan_id": scan_id,
+        "status": "running" if lease["scraping"] else (lease["last_status"] or "completed"),
+        "owner": lease["owner"],
+        "started_at": lease["started_at"],
+        "finished_at": None if lease["scraping"] else lease["last_scrape"],
+        "sources": {},
+        "results": {},
+    }
+
+
+@app.get("/api/scans/{scan_id}")
+async def api_scan_status(scan_id: str):
+    scan = get_scan(scan_id)
+    summary = scan.summary() if scan else _lease_summary(scan_id)
+    if not summary:
+        return JSONResponse({"error": "Scan not found"}, status_code=404)
+    return summary
+
+
+@app.get("/api/scans/{scan_id}/events")
+async def api_scan_events(scan_id: str, request: Request):
+    """Server-Sent Events: per-source progress and new jobs as they are stored.
+    Replays from the start (or from Last-Event-ID on reconnect) and ends with `done`.
+    A scan owned by another worker only reports `done`, by watching the lease."""
+    scan = get_scan(scan_id)
+    if not scan and not _lease_summary(scan_id):
+        return JSONResponse({"error": "Scan not found"}, status_code=404)
+    try:
+        after = int(request.headers.get("last-event-id", -1))
+    except ValueError:
+        after = -1
+
+    async def remote_events():
+        while (summary := _lease_summary(scan_id)) and summary["status"] == "running":
+            await asyncio.sleep(SCAN_LEASE_POLL_SECONDS)
+        status = summary["status"] if summary else "completed"
+        yield {"seq": 0, "event": "done", "data": {"status": status, "results": {}}}
+
+    async def stream():
+        async for item in (scan.follow(after) if scan else remote_events()):
+            data = orjson.dumps(item["data"]).decode()
+            yield f"id: {item['seq']}\nevent: {item['event']}\ndata: {data}\n\n"
+
+    return StreamingResponse(
+        stream(), media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @app.post("/api/jobs/{job_id}/hide")
@@ -184,14 +557,16 @@ async def api_cover_letter(job_id: int = Query(...)):
 # ---- Application tracker API ----
 
 @app.get("/api/applications")
-async def api_get_applications():
-    return {"applications": get_applications()}
+async def api_get_applications(request: Request):
+    return _cached_json(request, lambda: {"applications": get_applications()})
 
 
 @app.post("/api/applications/{job_id}/save")
 async def api_save_application(job_id: int):
-    created = save_application(job_id)
-    return {"status": "created" if created else "exists"}
+    status = save_application(job_id)
+    if status == "not_found":
+        return JSONResponse({"error": "Job not found"}, status_code=404)
+    return {"status": status}
 
 
 class ApplicationUpdate(BaseModel):
@@ -238,6 +613,24 @@ async def api_get_feedback():
     return {"feedback": get_all_feedback()}
 
 
+# ---- Scan telemetry ----
+
+@app.get("/api/scan-trends")
+async def api_scan_trends(
+    days: int = Query(30, ge=1, le=SCAN_STATS_DAYS),
+    recent: int = Query(10, ge=1, le=100),
+):
+    """Recent scans and, per source, what its scans cost and yielded: average
+    time per stage, requests, bytes, status codes, failures and empty runs."""
+    return get_scan_trends(days=days, recent=recent)
+
+
+@app.get("/api/query-yield")
+async def api_query_yield():
+    """Recent results per search query and board: found, unique to the query, new."""
+    return {"sources": yield_report()}
+
+
 # ---- Custom keywords API ----
 
 class KeywordCreate(BaseModel):
@@ -265,12 +658,24 @@ async def api_delete_keyword(keyword_id: int):
 
 class JobBoardCreate(BaseModel):
     name: str
-    url: str = ""
+    url: str = ""  # listing URL; "{query}" marks where search terms go
+    queries: Optional[list[str]] = None
+    # Field -> CSS selector(s) for the listing cards; unset fields use generic ones
+    selectors: Optional[dict[str, str | list[str]]] = None
 
 
 @app.post("/api/custom-job-boards")
 async def api_add_job_board(body: JobBoardCreate):
-    created = add_custom_job_board(body.name, body.url)
+    unknown = set(body.selectors or {}) - set(SELECTOR_FIELDS)
+    if unknown:
+        return JSONResponse(
+            {"error": f"Unknown selector fields: {', '.join(sorted(unknown))}"}, status_code=400,
+        )
+    conflict = custom_board_conflict(body.name, body.url)
+    if conflict:
+        return JSONResponse({"error": conflict}, status_code=400)
+    spec = {k: v for k, v in (("queries", body.queries), ("selectors", body.selectors)) if v}
+    created = add_custom_job_board(body.name, body.url, spec or None)
     return {"status": "created" if created else "exists"}
 
 
@@ -0,0 +1,199 @@
+"""In-process metrics in the Prometheus text format, served at /metrics.
+
+Recording is a dict lookup and an add under a lock, cheap enough for every
+request, query and scorer call. Values that already exist elsewhere (cache
+hit counters) are read by collectors only when /metrics is scraped."""
+
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from typing import Callable, Iterable, Iterator
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+QUERY_BUCKETS = (0.0002, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+SCORER_BUCKETS = (0.00001, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.05, 0.1)
+FETCH_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+# A sample: (metric name suffix, labels, value)
+Sample = tuple[str, dict[str, str], float]
+
+_registry: list["_Metric"] = []
+_collectors: list[tuple[str, str, str, Callable[[], Iterable[tuple[dict[str, str], float]]]]] = []
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", r"\\").replace("\n", r"\n").replace('"', r"\"")
+
+
+def _format(name: str, labels: dict[str, str], value: float) -> str:
+    if labels:
+        name += "{" + ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items()) + "}"
+    return f"{name} {int(value) if float(value).is_integer() else repr(float(value))}"
+
+
+class _Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labels = labels
+        self._values: dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def samples(self) -> Iterator[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Name it with the conventional _total suffix."""
+
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = list(self._values.items())
+        for labels, value in values:
+            yield "", dict(zip(self.labels, labels)), value
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str):
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            child = self._values.get(labels)
+            if child is None:
+                # Per-bucket counts (the last one is +Inf), then the sum
+                child = self._values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+            child[i] += 1
+            child[-1] += value
+
+    def samples(self) -> Iterator[Sample]:
+        with self._lock:
+            values = [(labels, list(child)) for labels, child in self._values.items()]
+        for labels, child in values:
+            base = dict(zip(self.labels, labels))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), child):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                yield "_bucket", {**base, "le": le}, cumulative
+            yield "_sum", base, child[-1]
+            yield "_count", base, cumulative
+
+
+def timed(histogram: Histogram, *labels: str):
+    """Decorator: observe every call's duration (exceptions included)."""
+    def decorate(fn):
+        @wraps(fn)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start, *labels)
+        return wrapper
+    return decorate
+
+
+def collector(name: str, documentation: str, type: str = "gauge"):
+    """Register `fn() -> [(labels, value), ...]`, called on every /metrics scrape."""
+    def register(fn):
+        _collectors.append((name, documentation, type, fn))
+        return fn
+    return register
+
+
+def render() -> str:
+    lines = []
+    for metric in _registry:
+        lines.append(f"# HELP {metric.name} {metric.documentation}")
+        lines.append(f"# TYPE {metric.name} {metric.type}")
+        lines.extend(_format(metric.name + suffix, labels, value) for suffix, labels, value in metric.samples())
+    for name, documentation, type, fn in _collectors:
+        lines.append(f"# HELP {name} {documentation}")
+        lines.append(f"# TYPE {name} {type}")
+        lines.extend(_format(name, labels, value) for labels, value in fn())
+    return "\n".join(lines) + "\n"
+
+
+# --------------------------------------------------------------------------
+# Metrics recorded across the app
+# --------------------------------------------------------------------------
+
+HTTP_SECONDS = Histogram(
+    "jobfinder_http_request_duration_seconds", "HTTP request latency by route template.",
+    ("method", "route"),
+)
+HTTP_REQUESTS = Counter(
+    "jobfinder_http_requests_total", "HTTP requests by route template and status.",
+    ("method", "route", "status"),
+)
+DB_SECONDS = Histogram(
+    "jobfinder_db_seconds", "Duration of app.database function calls.",
+    ("function",), buckets=QUERY_BUCKETS,
+)
+SCORER_SECONDS = Histogram(
+    "jobfinder_scorer_seconds", "Scorer call durations (lru-cached functions: misses only).",
+    ("function",), buckets=SCORER_BUCKETS,
+)
+SCRAPER_REQUEST_SECONDS = Histogram(
+    "jobfinder_scraper_request_seconds", "Scraper HTTP request attempts by source and status.",
+    ("source", "status"), buckets=FETCH_BUCKETS,
+)
+SCRAPER_PARSE_SECONDS = Histogram(
+    "jobfinder_scraper_parse_seconds", "Listing page parse time by source.",
+    ("source",), buckets=LATENCY_BUCKETS,
+)
+DETAIL_CACHE_LOOKUPS = Counter(
+    "jobfinder_detail_cache_lookups_total", "Detail page cache lookups by result (hit or miss).",
+    ("result",),
+)
+
+
+class MetricsMiddleware:
+    """ASGI middleware timing each HTTP request under its route template, so
+    /api/jobs/{job_id} is one series however many jobs are requested."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = "500"
+
+        async def send_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_status)
+        finally:
+            # The router stores the matched route in the scope it was handed
+            route = scope.get("route")
+            if route is not None:
+                path = route.path
+            elif scope.get("endpoint") is not None:
+                path = scope.get("root_path") or "mount"  # a mounted app such as /static
+            else:
+                path = "unmatched"
+            method = scope["method"]
+            HTTP_SECONDS.observe(time.perf_counter() - start, method, path)
+            HTTP_REQUESTS.inc(method, path, status)
@@ -0,0 +1,242 @@
+"""Opt-in profiling of single requests and scans.
+
+Off unless a PROFILE_TOKEN is configured. Profiles are stored as folded
+stacks, one "frame;frame;frame weight" line per distinct stack, the input
+format of flamegraph.pl, speedscope and inferno.
+
+Requests are traced deterministically on the event loop thread, weighted in
+microseconds: most take a few milliseconds, too short to sample. Scans run for
+minutes across the event loop, parse pool and to_thread workers, so a sampler
+thread records the stacks of every busy thread instead, weighted in samples.
+Both see the whole process, so concurrent work shows up too."""
+
+import hmac
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Optional
+from urllib.parse import parse_qs
+
+from app.config import PROFILE_DIR, PROFILE_INTERVAL_SECONDS, PROFILE_KEEP, PROFILE_TOKEN
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_PARAM = "profile"
+
+# Leaf frames of threads parked waiting for work: not worth a sample
+_IDLE = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+}
+_NAME_RE = re.compile(r"^[\w.-]+\.folded$")
+# Paths that handle the token themselves
+_NOT_TRACED = ("/api/profiles", "/api/scrape")
+# sys.setprofile holds one hook per thread: one traced request at a time
+_tracing = threading.Lock()
+
+
+def profile_token() -> str:
+    return os.environ.get("PROFILE_TOKEN", PROFILE_TOKEN)
+
+
+def profile_dir() -> str:
+    return os.environ.get("PROFILE_DIR", PROFILE_DIR)
+
+
+def token_ok(candidate: Optional[str]) -> bool:
+    token = profile_token()
+    return bool(token and candidate) and hmac.compare_digest(candidate.encode(), token.encode())
+
+
+def _label(code) -> str:
+    # Folded stacks split frames on ";" and the weight off at the last space
+    return f"{code.co_qualname} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})".replace(";", ":")
+
+
+class Tracer:
+    """Records every Python and C call on the current thread, weighting each
+    stack by the time spent in its leaf. Slows the traced code several times."""
+
+    def __init__(self, root: str = "request"):
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._keys = [root]  # stack of folded keys, the root first
+        self._last = 0.0
+
+    def start(self) -> "Tracer":
+        self._last = time.perf_counter()
+        sys.setprofile(self._hook)
+        return self
+
+    def stop(self) -> "Tracer":
+        sys.setprofile(None)
+        self._charge(time.perf_counter())
+        return self
+
+    def _charge(self, now: float):
+        self.stacks[self._keys[-1]] += now - self._last
+        self._last = now
+
+    def _hook(self, frame, event, arg):
+        self._charge(time.perf_counter())
+        self.samples += 1
+        if event == "call":
+            self._keys.append(f"{self._keys[-1]};{_label(frame.f_code)}")
+        elif event == "c_call":
+            name = getattr(arg, "__qualname__", None) or getattr(arg, "__name__", "?")
+            self._keys.append(f"{self._keys[-1]};{name} (builtin)")
+        # Frames entered before tracing started return past the root: ignore them
+        elif len(self._keys) > 1:
+            self._keys.pop()
+
+    def folded(self) -> str:
+        weights = ((stack, round(seconds * 1e6)) for stack, seconds in self.stacks.most_common())
+        return "".join(f"{stack} {us}\n" for stack, us in weights if us)
+
+
+class Sampler:
+    """Samples every thread's stack each `interval` seconds until stopped."""
+
+    def __init__(self, interval: float = PROFILE_INTERVAL_SECONDS):
+        self.interval = interval
+        self.stacks: Counter[str] = Counter()
+        self.samples = 0
+        self._labels: dict = {}  # code object -> label
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+
+    def start(self) -> "Sampler":
+        self._thread.start()
+        return self
+
+    def stop(self) -> "Sampler":
+        self._stop.set()
+        self._thread.join()
+        return self
+
+    def _label(self, code) -> str:
+        label = self._labels.get(code)
+        if label is None:
+            label = self._labels[code] = _label(code)
+        return label
+
+    def _run(self):
+        own = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {t.ident: t.name for t in threading.enumerate()}
+            self.samples += 1
+            for ident, frame in sys._current_frames().items():
+                code = frame.f_code
+                if ident == own or (os.path.basename(code.co_filename), code.co_name) in _IDLE:
+                    continue
+                stack = []
+                while frame is not None:
+                    stack.append(self._label(frame.f_code))
+                    frame = frame.f_back
+                stack.append(names.get(ident, str(ident)))
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def new_profile_name(kind: str, label: str) -> str:
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%S%f")
+    slug = re.sub(r"[^\w-]+", "-", label).strip("-") or "root"
+    return f"{stamp}-{kind}-{slug[:60]}.folded"
+
+
+def save_profile(name: str, sampler: Sampler | Tracer):
+    """Write a profile and drop the oldest beyond PROFILE_KEEP."""
+    directory = profile_dir()
+    os.makedirs(directory, exist_ok=True)
+    with open(os.path.join(directory, name), "w") as f:
+        f.write(sampler.folded())
+    logger.info("Profile %s: %d samples, %d stacks", name, sampler.samples, len(sampler.stacks))
+    for old in list_profiles()[PROFILE_KEEP:]:
+        os.remove(os.path.join(directory, old["name"]))
+
+
+def list_profiles() -> list[dict]:
+    """Stored profiles, newest first."""
+    directory = profile_dir()
+    if not os.path.isdir(directory):
+        return []
+    profiles = []
+    for name in os.listdir(directory):
+        if _NAME_RE.match(name):
+            st = os.stat(os.path.join(directory, name))
+            profiles.append({
+                "name": name,
+                "bytes": st.st_size,
+                "created_at": datetime.fromtimestamp(st.st_mtime, timezone.utc).isoformat(),
+            })
+    return sorted(profiles, key=lambda p: p["name"], reverse=True)
+
+
+def read_profile(name: str) -> Optional[str]:
+    if not _NAME_RE.match(name):
+        return None
+    try:
+        with open(os.path.join(profile_dir(), name)) as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def requested(scope) -> bool:
+    """Whether an HTTP request asks to be profiled with the right token."""
+    if not profile_token():
+        return False
+    for key, value in scope["headers"]:
+        if key == PROFILE_HEADER.encode():
+            return token_ok(value.decode("latin-1"))
+    query = scope.get("query_string", b"")
+    if PROFILE_PARAM.encode() + b"=" in query:
+        return token_ok(parse_qs(query.decode("latin-1")).get(PROFILE_PARAM, [""])[0])
+    return False
+
+
+class ProfilingMiddleware:
+    """Traces requests that carry the profile token, stores the profile and
+    names it in the response's X-Profile header (fetch it from /api/profiles).
+    A request arriving while another is traced is served untraced."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or scope["path"].startswith(_NOT_TRACED)
+            or not requested(scope)
+            or not _tracing.acquire(blocking=False)
+        ):
+            await self.app(scope, receive, send)
+            return
+        try:
+            await self._traced(scope, receive, send)
+        finally:
+            _tracing.release()
+
+    async def _traced(self, scope, receive, send):
+        name = new_profile_name("request", f"{scope['method']}-{scope['path']}")
+
+        async def send_with_header(message):
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-profile", name.encode())]
+            await send(message)
+
+        tracer = Tracer(root=f"{scope['method']} {scope['path']}".replace(";", ":")).start()
+        try:
+            await self.app(scope, receive, send_with_header)
+        finally:
+            save_profile(name, tracer.stop())
@@ -0,0 +1,104 @@
+"""Search query planning: which queries each board runs on a scan, and how much each one yields."""
+
+import logging
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Iterable
+
+from app.config import QUERY_HISTORY_RUNS, QUERY_MIN_UNIQUE_RATIO, QUERY_REPROBE_DAYS
+from app.database import get_query_history, record_query_runs
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_query(query: str) -> str:
+    return " ".join(query.lower().split())
+
+
+@dataclass
+class QueryPlan:
+    """Queries to run against one board, best yield first, and the results of
+    running them. A query's `unique` results are those no earlier query in
+    the same scan returned; `new` ones were not in the database either.
+    `listings` holds the external_ids each query returned."""
+
+    source: str
+    queries: list[str]
+    skipped: list[str] = field(default_factory=list)
+    known: set[str] = field(default_factory=set, repr=False)
+    yields: dict[str, dict[str, int]] = field(default_factory=dict)
+    listings: dict[str, set[str]] = field(default_factory=dict, repr=False)
+
+    def record(self, query: str, ids: set[str], unique: int, new: int):
+        self.yields[query] = {"found": len(ids), "unique": unique, "new": new}
+        self.listings[query] = ids
+
+    def save(self):
+        if self.yields:
+            record_query_runs(self.source, self.yields, self.listings)
+
+
+def plan_queries(
+    source: str,
+    builtin: Iterable[str],
+    custom: Iterable[str],
+    known: set[str],
+    allow_skip: bool = True,
+) -> QueryPlan:
+    """Merge the board's built-in queries with the user's keywords (normalised,
+    duplicates dropped) and order them by recent new jobs per request.
+
+    With allow_skip, a query is skipped when over its last QUERY_HISTORY_RUNS
+    runs fewer than QUERY_MIN_UNIQUE_RATIO of its results were unique, i.e.
+    other queries already fetched the same listings. Skipped queries run again
+    once their last run is QUERY_REPROBE_DAYS old, so their stats refresh."""
+    candidates = list(dict.fromkeys(q for q in map(normalize_query, [*builtin, *custom]) if q))
+    history = get_query_history(source, QUERY_HISTORY_RUNS)
+    reprobe_after = (datetime.now(timezone.utc) - timedelta(days=QUERY_REPROBE_DAYS)).isoformat()
+
+    planned, skipped = [], []
+    for query in candidates:
+        runs = history.get(query, [])
+        found = sum(r["found"] for r in runs)
+        unique = sum(r["unique_found"] for r in runs)
+        if (
+            allow_skip
+            and len(runs) >= QUERY_HISTORY_RUNS
+            and runs[0]["ran_at"] >= reprobe_after
+            and unique <= found * QUERY_MIN_UNIQUE_RATIO
+        ):
+            skipped.append(query)
+        else:
+            planned.append(query)
+
+    def new_per_request(query: str) -> float:
+        runs = history.get(query)
+        # Untried queries go first: they have everything to prove
+        return sum(r["new"] for r in runs) / len(runs) if runs else float("inf")
+
+    # Earlier queries claim the listings they share with later ones, so the
+    # best yielding run first and overlap counts against the weaker queries
+    planned.sort(key=new_per_request, reverse=True)
+    if skipped:
+        logger.info("  %s: skipping low-yield queries %s", source, ", ".join(skipped))
+    return QueryPlan(source=source, queries=planned, skipped=skipped, known=known)
+
+
+def yield_report(runs: int = QUERY_HISTORY_RUNS) -> dict[str, list[dict]]:
+    """Recent yield of every recorded query per source, best first."""
+    report = {}
+    for source, queries in get_query_history(None, runs).items():
+        rows = []
+        for query, query_runs in queries.items():
+            new = sum(r["new"] for r in query_runs)
+            rows.append({
+                "query": query,
+                "runs": len(query_runs),
+                "found": sum(r["found"] for r in query_runs),
+                "unique": sum(r["unique_found"] for r in query_runs),
+                "new": new,
+                "new_per_request": round(new / len(query_runs), 2),
+                "last_run": query_runs[0]["ran_at"],
+            })
+        report[source] = sorted(rows, key=lambda r: r["new_per_request"], reverse=True)
+    return report
@@ -0,0 +1,174 @@
+"""Background scan runs with live progress events for Katya's JobFinder."""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+import uuid
+from collections import OrderedDict
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from typing import AsyncIterator, Awaitable, Callable, Iterator, Optional
+
+from app.config import SCAN_HISTORY_SIZE
+
+logger = logging.getLogger(__name__)
+
+# Identifies this process as the scan lease owner
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}"
+
+
+@dataclass
+class Scan:
+    """One scan run. Progress is an append-only event log that listeners
+    replay from any point and then follow live."""
+
+    id: str
+    started_at: str
+    trigger: str = "manual"  # manual | schedule
+    status: str = "running"  # running | completed | failed
+    finished_at: Optional[str] = None
+    results: dict[str, int] = field(default_factory=dict)
+    sources: dict[str, dict] = field(default_factory=dict)
+    # Sources (and "details") cut short by the time budget, or never reached
+    truncated: list[str] = field(default_factory=list)
+    profile: Optional[str] = None  # stored profile name, for profiled scans
+    events: list[dict] = field(default_factory=list, repr=False)
+    _listeners: set[asyncio.Queue] = field(default_factory=set, repr=False)
+    _task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    def emit(self, event: str, data: dict):
+        """Record a progress event and wake every listener."""
+        if event == "source_start":
+            self.sources[data["source"]] = {"status": "running", "found": 0, "new": 0}
+        elif event == "job":
+            self.sources.setdefault(data["source"], {"status": "running", "found": 0, "new": 0})["new"] += 1
+        elif event == "source_done":
+            self.sources[data["source"]] = {
+                "status": "done", "found": data["found"], "new": data["new"],
+                "known": data.get("known", 0), "closed": data.get("closed", 0),
+                "queries_skipped": data.get("queries_skipped", 0),
+                "truncated": data.get("truncated", False),
+            }
+            if data.get("truncated"):
+                self.truncated.append(data["source"])
+        elif event == "source_failed":
+            self.sources.setdefault(data["source"], {"found": 0, "new": 0})["status"] = "failed"
+        elif event == "source_skipped":
+            self.sources[data["source"]] = {
+                "status": "skipped", "found": 0, "new": 0,
+                "reason": data.get("reason"), "retry_at": data.get("retry_at"),
+            }
+            if data.get("reason") == "out_of_time":
+                self.truncated.append(data["source"])
+        elif event == "details_done" and data.get("out_of_time"):
+            self.truncated.append("details")
+        item = {"seq": len(self.events), "event": event, "data": data}
+        self.events.append(item)
+        for queue in self._listeners:
+            queue.put_nowait(item)
+
+    async def follow(self, after: int = -1) -> AsyncIterator[dict]:
+        """Events with seq > after, then live ones until the scan finishes."""
+        queue: asyncio.Queue = asyncio.Queue()
+        # No await between the snapshot and subscribing, so nothing is missed or repeated
+        backlog = self.events[after + 1:]
+        self._listeners.add(queue)
+        try:
+            for item in backlog:
+                yield item
+                if item["event"] == "done":
+                    return
+            while True:
+                item = await queue.get()
+                yield item
+                if item["event"] == "done":
+                    return
+        finally:
+            self._listeners.discard(queue)
+
+    def summary(self) -> dict:
+        return {
+            "scan_id": self.id,
+            "status": self.status,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "sources": self.sources,
+            "results": self.results,
+            "truncated": self.truncated,
+            "profile": self.profile,
+        }
+
+
+@dataclass
+class SourceStats:
+    """What one source cost in one scan, stored in scan_source_stats. Code
+    scrapers parse inline, so their parse time is what fetching and waiting
+    (SourceClient.waited) don't cover."""
+
+    requests: int = 0
+    bytes: int = 0
+    statuses: dict[str, int] = field(default_factory=dict)  # HTTP status, or "error"
+    fetch_seconds: float = 0.0
+    parse_seconds: float = 0.0
+    score_seconds: float = 0.0
+    write_seconds: float = 0.0
+
+    def record_request(self, seconds: float, status: str, size: int = 0):
+        self.requests += 1
+        self.bytes += size
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.fetch_seconds += seconds
+
+    @contextmanager
+    def timing(self, stage: str) -> Iterator[None]:
+        """Add the time spent in the block to `<stage>_seconds`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            attr = f"{stage}_seconds"
+            setattr(self, attr, getattr(self, attr) + time.perf_counter() - start)
+
+    def as_row(self) -> dict:
+        return {k: round(v, 4) if isinstance(v, float) else v for k, v in asdict(self).items()}
+
+
+_scans: OrderedDict[str, Scan] = OrderedDict()
+
+
+def get_scan(scan_id: str) -> Optional[Scan]:
+    return _scans.get(scan_id)
+
+
+def new_scan_id() -> str:
+    return uuid.uuid4().hex[:12]
+
+
+def start_scan(
+    run: Callable[[Scan], Awaitable[dict[str, int]]],
+    trigger: str = "manual",
+    scan_id: Optional[str] = None,
+) -> Scan:
+    """Start `run(scan)` as a background task and return the scan immediately."""
+    now = datetime.now(timezone.utc).isoformat()
+    scan = Scan(id=scan_id or new_scan_id(), started_at=now, trigger=trigger)
+    _scans[scan.id] = scan
+    while len(_scans) > SCAN_HISTORY_SIZE:
+        _scans.popitem(last=False)
+
+    async def runner():
+        try:
+            scan.results = await run(scan)
+            scan.status = "completed"
+        except Exception as e:
+            logger.error("Scan %s failed: %s", scan.id, e)
+            scan.status = "failed"
+        scan.finished_at = datetime.now(timezone.utc).isoformat()
+        scan.emit("done", {"status": scan.status, "results": scan.results, "truncated": scan.truncated})
+
+    scan._task = asyncio.create_task(runner())
+    return scan
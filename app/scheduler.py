@@ -0,0 +1,79 @@
+"""Periodic background scans for Katya's JobFinder."""
+
+import logging
+import os
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Optional
+
+from apscheduler.schedulers.asyncio import AsyncIOScheduler
+from apscheduler.triggers.interval import IntervalTrigger
+
+from app.config import (
+    SCRAPE_INTERVAL_HOURS,
+    SCRAPE_SOURCE_INTERVAL_HOURS,
+    SCHEDULER_ENABLED,
+    SCHEDULE_JITTER_SECONDS,
+    SCHEDULE_FIRST_RUN_SECONDS,
+    SCHEDULE_MISFIRE_GRACE_SECONDS,
+)
+from app.scrapers import CUSTOM_SOURCE, SCRAPERS
+
+logger = logging.getLogger(__name__)
+
+
+def scheduler_enabled() -> bool:
+    return os.environ.get("SCHEDULER_ENABLED", "1" if SCHEDULER_ENABLED else "0") != "0"
+
+
+def source_groups() -> dict[float, list[str]]:
+    """Sources grouped by scan interval in hours ("custom" stands for all custom boards)."""
+    groups: dict[float, list[str]] = {}
+    for name in [*SCRAPERS, CUSTOM_SOURCE]:
+        hours = SCRAPE_SOURCE_INTERVAL_HOURS.get(name, SCRAPE_INTERVAL_HOURS)
+        groups.setdefault(hours, []).append(name)
+    return groups
+
+
+def create_scheduler(start: Callable[[list[str]], Optional[object]]) -> AsyncIOScheduler:
+    """One interval job per source group. `start(sources)` begins a background
+    scan and returns None when one is already running, in which case the run is
+    skipped rather than queued."""
+    scheduler = AsyncIOScheduler(
+        timezone=timezone.utc,
+        job_defaults={
+            "coalesce": True,  # a backlog of missed runs fires once
+            "max_instances": 1,
+            "misfire_grace_time": SCHEDULE_MISFIRE_GRACE_SECONDS,
+        },
+    )
+
+    async def run(sources: list[str]):
+        if start(sources) is None:
+            logger.info("Scheduled scan of %s skipped: a scan is in progress", ", ".join(sources))
+
+    first_run = datetime.now(timezone.utc) + timedelta(seconds=SCHEDULE_FIRST_RUN_SECONDS)
+    for i, (hours, sources) in enumerate(sorted(source_groups().items())):
+        scheduler.add_job(
+            run,
+            IntervalTrigger(hours=hours, jitter=SCHEDULE_JITTER_SECONDS),
+            args=[sources],
+            id=f"scan-{hours:g}h",
+            name=", ".join(sources),
+            # Stagger the groups so their first runs don't collide and get skipped
+            next_run_time=first_run + timedelta(seconds=i * SCHEDULE_JITTER_SECONDS),
+        )
+    return scheduler
+
+
+def next_runs(scheduler: Optional[AsyncIOScheduler]) -> list[dict]:
+    """Upcoming scheduled scans for /api/stats."""
+    if scheduler is None or not scheduler.running:
+        return []
+    return [
+        {
+            "sources": job.args[0],
+            "interval_hours": job.trigger.interval.total_seconds() / 3600,
+            "next_run": job.next_run_time.isoformat() if job.next_run_time else None,
+        }
+        for job in sorted(scheduler.get_jobs(), key=lambda j: j.next_run_time or datetime.max.replace(tzinfo=timezone.utc))
+    ]
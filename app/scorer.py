@@ -1,7 +1,10 @@
 """Score, filter, cover letter, and salary extraction for Katya's JobFinder."""
 
 import re
-from datetime import datetime, timezone
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from email.utils import parsedate_to_datetime
+from functools import lru_cache
 from typing import Optional
 
 from app.config import (
@@ -18,151 +21,298 @@ from app.config import (
     DUTCH_WORD_THRESHOLD_TITLE,
     DUTCH_WORD_THRESHOLD_BODY,
     DUTCH_PREFERRED_SIGNALS,
+    DUTCH_NGRAM_ENABLED,
     SENIORITY_PENALTY,
     SENIORITY_BONUS,
     HOME_ADDRESS_ENCODED,
     COMMUTE_ESTIMATES,
     TARGET_CITIES,
+    SALARY_PERIOD_TO_MONTH,
 )
+from app.geo import geocode_job, resolve_location
+from app.metrics import SCORER_SECONDS, timed
 
 _WORD_SPLIT = re.compile(r"[^a-zA-Zéèëïöüà]+")
 
-# Salary extraction patterns (EUR)
-_SALARY_NUM = r"(\d[\d.,]*\d|\d+)"  # matches "3000", "3.000", "3,000", "3.500,00"
-
-_SALARY_PATTERNS = [
-    # "€3.000 - €4.000" or "€3000-€4000" or "EUR 3000 - 4000"
-    re.compile(
-        r"(?:€|EUR)\s*" + _SALARY_NUM + r"\s*[-–—to]+\s*(?:€|EUR)?\s*" + _SALARY_NUM,
-        re.IGNORECASE,
-    ),
-    # "3000 - 4000 euro" or "3.000 - 4.000 per month"
-    re.compile(
-        _SALARY_NUM + r"\s*[-–—to]+\s*" + _SALARY_NUM + r"\s*(?:euro|eur|per\s+m)",
-        re.IGNORECASE,
-    ),
-    # "€3.000" or "€3000" single value
-    re.compile(r"(?:€|EUR)\s*" + _SALARY_NUM, re.IGNORECASE),
-    # "salary: 3000"
-    re.compile(r"salary[:\s]+(\d{3,6})", re.IGNORECASE),
-]
+# Salary extraction (EUR) — one pattern finds every mention in a single scan.
+# A mention is an amount or range with an optional "k" suffix, currency marker,
+# "salary:" label and period keyword ("per hour", "/month", "p.j.", "annually").
+_SALARY_NUM = r"\d[\d.,]*\d|\d+"  # matches "3000", "3.000", "3,000", "3.500,00", "45.5"
+_SALARY_CUR = r"€|eur(?:o|os)?\b"
+_SALARY_PERIOD_WORDS = {
+    "hour": ("hour", "hr", "uur", "hourly", "ph", "p/h", "per uur"),
+    "day": ("day", "dag", "daily"),
+    "week": ("week", "wk", "weekly"),
+    "month": ("month", "maand", "mnd", "mo", "pm", "p/m", "p.m", "monthly"),
+    "year": ("year", "yr", "jaar", "annum", "pa", "p/a", "p.a", "pj", "p.j", "annually", "yearly"),
+}
+_PERIOD_LOOKUP = {w: period for period, words in _SALARY_PERIOD_WORDS.items() for w in words}
+
+_SALARY_RE = re.compile(
+    r"""
+    (?:(?P<label>salary|salaris|pay|loon)\b[:\s]*(?:of\s+|van\s+)?)?
+    (?:(?P<cur>""" + _SALARY_CUR + r""")\s*)?
+    (?<![\d.,])(?P<lo>""" + _SALARY_NUM + r""")(?P<lo_k>\s?k\b)?
+    (?:
+        \s*(?:-|–|—|\bto\b|\btot\b)\s*
+        (?:(?:""" + _SALARY_CUR + r""")\s*)?
+        (?P<hi>""" + _SALARY_NUM + r""")(?P<hi_k>\s?k\b)?
+    )?
+    (?:\s*(?P<cur_after>""" + _SALARY_CUR + r"""))?
+    (?:\s*(?:gross|bruto|brutto))?
+    (?:
+        \s*(?:/|\bper\b|\ba\b|\ban\b|\bin\s+the\b)?\s*
+        (?P<period>""" + "|".join(
+            re.escape(w) for w in sorted(_PERIOD_LOOKUP, key=len, reverse=True)
+        ) + r""")\b\.?
+    )?
+    """,
+    re.IGNORECASE | re.VERBOSE,
+)
 
+# Thresholds for guessing the period of amounts without a period keyword.
+# Smaller amounts ("€50 gift card", "€100 travel allowance") aren't pay:
+# hourly rates need an hourly keyword.
+_MONTHLY_MIN = 500
+_YEARLY_MIN = 24000
 
-def _parse_salary_number(s: str) -> int:
-    """Parse '3.000' or '3,000' or '3000' into 3000."""
-    s = s.replace(".", "").replace(",", "")
-    return int(s)
 
+def _parse_salary_number(s: str) -> float:
+    """Parse '3.000', '3,000', '3000', '3.500,00' or '18,50' into a number.
+    A trailing separator followed by 1–2 digits is a decimal mark; others group thousands."""
+    m = re.search(r"[.,](\d{1,2})$", s)
+    if m:
+        whole = re.sub(r"[.,]", "", s[: m.start()])
+        return float(f"{whole or 0}.{m.group(1)}")
+    return float(re.sub(r"[.,]", "", s))
 
-def extract_salary(text: str) -> Optional[dict]:
-    """Extract salary info from text. Returns {min, max, raw} or None."""
+
+def _guess_salary_period(value: float) -> Optional[str]:
+    """Guess the period of an amount given without a period keyword."""
+    if value < _MONTHLY_MIN:
+        return None
+    if value >= _YEARLY_MIN:
+        return "year"
+    return "month"
+
+
+def extract_salaries(text: str) -> list[dict]:
+    """Find every salary mention in text, normalised to monthly gross EUR.
+    Returns a list of {min, max, raw, period} in order of appearance."""
     if not text:
+        return []
+    found = []
+    for m in _SALARY_RE.finditer(text):
+        has_currency = m.group("cur") or m.group("cur_after")
+        has_k = m.group("lo_k") or m.group("hi_k")
+        keyword_period = _PERIOD_LOOKUP.get((m.group("period") or "").lower().rstrip("."))
+        # Bare numbers are only salaries when labelled, or a monthly/yearly range
+        # ("3000 - 4000 per month"); "32-40 uur" is working hours, not pay
+        bare_range = m.group("hi") and (has_k or keyword_period in ("month", "year"))
+        if not (has_currency or m.group("label") or bare_range):
+            continue
+        lo = _parse_salary_number(m.group("lo"))
+        if m.group("lo_k") or (m.group("hi_k") and lo < 1000):
+            lo *= 1000
+        hi = lo
+        if m.group("hi"):
+            hi = _parse_salary_number(m.group("hi"))
+            if m.group("hi_k"):
+                hi *= 1000
+        if hi < lo:
+            lo, hi = hi, lo
+        period = keyword_period or _guess_salary_period(hi)
+        if not period:
+            continue
+        factor = SALARY_PERIOD_TO_MONTH[period]
+        monthly_lo = round(lo * factor)
+        monthly_hi = round(hi * factor)
+        # Sanity: monthly gross salary should be between 500 and 20000
+        if not (500 <= monthly_lo <= 20000 and 500 <= monthly_hi <= 20000):
+            continue
+        found.append({
+            "min": monthly_lo,
+            "max": monthly_hi,
+            "raw": m.group(0).strip(),
+            "period": period,
+            "is_range": bool(m.group("hi")),
+        })
+    return found
+
+
+@timed(SCORER_SECONDS, "extract_salary")
+def extract_salary(text: str) -> Optional[dict]:
+    """Extract salary info from text. Returns {min, max, raw, period} or None.
+    Amounts are monthly gross; a range mention wins over a single amount."""
+    mentions = extract_salaries(text)
+    if not mentions:
         return None
-    for pat in _SALARY_PATTERNS:
-        m = pat.search(text)
-        if m:
-            groups = m.groups()
-            if len(groups) == 2:
-                lo = _parse_salary_number(groups[0])
-                hi = _parse_salary_number(groups[1])
-                # Sanity: salary should be between 500 and 20000/month
-                if 500 <= lo <= 20000 and 500 <= hi <= 20000:
-                    return {"min": lo, "max": hi, "raw": m.group(0).strip()}
-            elif len(groups) == 1:
-                val = _parse_salary_number(groups[0])
-                if 500 <= val <= 20000:
-                    return {"min": val, "max": val, "raw": m.group(0).strip()}
-    return None
+    best = next((m for m in mentions if m["is_range"]), mentions[0])
+    return {"min": best["min"], "max": best["max"], "raw": best["raw"], "period": best["period"]}
 
 
 # --------------------------------------------------------------------------
 # Dutch detection
 # --------------------------------------------------------------------------
 
-def _count_dutch_words(text: str) -> int:
-    words = set(_WORD_SPLIT.split(text.lower()))
-    text_lower = text.lower()
-    hits = 0
-    for dw in DUTCH_WORDS:
-        if " " in dw:
-            if dw in text_lower:
-                hits += 1
-        else:
-            if dw in words:
-                hits += 1
-    return hits
+# Single words are matched by set intersection against the token set; multi-word
+# phrases go through one alternation scan (lookahead so overlapping phrases count).
+_DUTCH_TOKENS = frozenset(w for w in DUTCH_WORDS if " " not in w)
+_DUTCH_PHRASES = sorted((w for w in DUTCH_WORDS if " " in w), key=len, reverse=True)
+_DUTCH_PHRASE_RE = re.compile("(?=(" + "|".join(re.escape(p) for p in _DUTCH_PHRASES) + "))")
 
+# Exclusion keywords that specifically signal a Dutch language requirement
+_DUTCH_REQUIRED_KEYWORDS = tuple(
+    kw for kw in EXCLUDE_KEYWORDS
+    if any(marker in kw for marker in ("dutch", "nederland", "vloeiend", "taaleis", "beheersing"))
+)
 
-def is_dutch_text(title: str, description: str = "") -> bool:
-    title_hits = _count_dutch_words(title)
-    if title_hits >= DUTCH_WORD_THRESHOLD_TITLE:
-        return True
-    if description:
-        body_hits = _count_dutch_words(description)
-        if body_hits >= DUTCH_WORD_THRESHOLD_BODY:
-            return True
-        if title_hits >= 1 and body_hits >= 3:
-            return True
-    return False
+# Compact character-trigram profiles (most frequent, language-distinctive trigrams,
+# space-padded at word boundaries). Weight = profile rank, most frequent first.
+_NL_TRIGRAMS = [
+    " de", "de ", "en ", "an ", "van", " va", "het", " he", "een", " ee",
+    "ij ", "oor", "aar", " ge", "sch", "cht", "ijk", " ve", "ver", "den",
+    "ede", "ond", "eer", "gen", " vo", "voo", " me", "met", "ijn", " zi",
+    "zij", "lij", " we", "wer", "erk", "aan", " aa", "eid", "hei", " ni",
+    "nie", "oen", "jk ", "bij", " bi", "ach", "uur", "ige", "ig ", "uit",
+]
+_EN_TRIGRAMS = [
+    " th", "the", "he ", "ing", "ng ", " an", "and", "nd ", " of", "of ",
+    "ion", "tio", " to", "to ", "ed ", "re ", "es ", "ent", "for", " fo",
+    "or ", "ati", "is ", "ith", "wit", " wi", "you", " yo", "ou ", "our",
+    "hat", "tha", "ly ", "ill", "wil", "al ", "ce ", "ty ", "nce", "ur ",
+    " co", "com", " wh", "ive", "ve ", "ers", "ble", "ght", "ful", "ss ",
+]
+_NL_TRIGRAM_WEIGHTS = {g: len(_NL_TRIGRAMS) - i for i, g in enumerate(_NL_TRIGRAMS)}
+_EN_TRIGRAM_WEIGHTS = {g: len(_EN_TRIGRAMS) - i for i, g in enumerate(_EN_TRIGRAMS)}
+_NGRAM_MIN_TRIGRAMS = 50
 
 
-def detect_dutch_level(title: str, description: str = "") -> str:
-    """Detect Dutch language requirement level.
-    Returns 'dutch_required', 'dutch_preferred', or 'english_ok'."""
-    title_lower = title.lower()
-    desc_lower = (description or "").lower()
-    combined = f"{title_lower} {desc_lower}"
+@dataclass(frozen=True)
+class DutchDetection:
+    """Dutch requirement label with a 0–1 confidence and the raw word-hit counts."""
+    label: str
+    confidence: float
+    is_dutch: bool
+    title_hits: int = 0
+    body_hits: int = 0
+    dutch_pct: float = 0.0
+    ngram_nl: Optional[float] = None
 
-    # Check hard exclusion keywords → dutch_required
-    for kw in EXCLUDE_KEYWORDS:
-        if "dutch" in kw or "nederland" in kw or "vloeiend" in kw or "taaleis" in kw or "beheersing" in kw:
-            if kw in combined:
-                return "dutch_required"
 
-    # Check if title is mostly Dutch
-    title_hits = _count_dutch_words(title)
-    if title_hits >= DUTCH_WORD_THRESHOLD_TITLE:
-        return "dutch_required"
+def _tokenize(text_lower: str) -> set[str]:
+    return set(_WORD_SPLIT.split(text_lower))
+
+
+def _dutch_hits(text_lower: str, tokens: set[str]) -> int:
+    hits = len(tokens & _DUTCH_TOKENS)
+    if _DUTCH_PHRASES:
+        hits += len({m.group(1) for m in _DUTCH_PHRASE_RE.finditer(text_lower)})
+    return hits
+
 
-    # Count Dutch words in description
-    body_hits = _count_dutch_words(description) if description else 0
+def _count_dutch_words(text: str) -> int:
+    text_lower = text.lower()
+    return _dutch_hits(text_lower, _tokenize(text_lower))
+
+
+def trigram_dutch_probability(text: str) -> tuple[float, int]:
+    """Score text against the Dutch/English trigram profiles.
+    Returns (probability the text is Dutch, number of trigrams seen)."""
+    padded = " " + " ".join(_WORD_SPLIT.split(text.lower())).strip() + " "
+    nl = en = 0
+    n = max(len(padded) - 2, 0)
+    for i in range(n):
+        gram = padded[i:i + 3]
+        nl += _NL_TRIGRAM_WEIGHTS.get(gram, 0)
+        en += _EN_TRIGRAM_WEIGHTS.get(gram, 0)
+    if nl + en == 0:
+        return 0.5, n
+    return nl / (nl + en), n
+
+
+@lru_cache(maxsize=4096)
+@timed(SCORER_SECONDS, "detect_dutch")
+def detect_dutch(title: str, description: str = "", use_ngrams: Optional[bool] = None) -> DutchDetection:
+    """Detect the Dutch requirement of a job in one pass over title and description.
+    Tokenizes each text once and returns the label together with a confidence."""
+    if use_ngrams is None:
+        use_ngrams = DUTCH_NGRAM_ENABLED
+    description = description or ""
+    title_lower = title.lower()
+    desc_lower = description.lower()
+    combined = f"{title_lower} {desc_lower}"
 
-    # Calculate Dutch word percentage in description
+    title_hits = _dutch_hits(title_lower, _tokenize(title_lower))
     if description:
-        words = set(_WORD_SPLIT.split(desc_lower))
-        total_words = len([w for w in words if len(w) > 2])
+        desc_tokens = _tokenize(desc_lower)
+        body_hits = _dutch_hits(desc_lower, desc_tokens)
+        total_words = sum(1 for w in desc_tokens if len(w) > 2)
         dutch_pct = (body_hits / max(total_words, 1)) * 100
     else:
-        dutch_pct = 0
+        body_hits = 0
+        dutch_pct = 0.0
+
+    is_dutch = (
+        title_hits >= DUTCH_WORD_THRESHOLD_TITLE
+        or body_hits >= DUTCH_WORD_THRESHOLD_BODY
+        or (title_hits >= 1 and body_hits >= 3)
+    )
+
+    ngram_nl = None
+    if use_ngrams:
+        prob, n_trigrams = trigram_dutch_probability(combined)
+        if n_trigrams >= _NGRAM_MIN_TRIGRAMS:
+            ngram_nl = prob
+
+    def result(label: str, confidence: float) -> DutchDetection:
+        if ngram_nl is not None:
+            agree = ngram_nl if label != "english_ok" else 1 - ngram_nl
+            confidence = (confidence + agree) / 2
+        return DutchDetection(
+            label=label, confidence=round(min(max(confidence, 0.0), 1.0), 3),
+            is_dutch=is_dutch, title_hits=title_hits, body_hits=body_hits,
+            dutch_pct=dutch_pct, ngram_nl=ngram_nl,
+        )
 
-    # >30% Dutch words → dutch_required
-    if dutch_pct > 30:
-        return "dutch_required"
+    # Hard exclusion keywords → dutch_required
+    if any(kw in combined for kw in _DUTCH_REQUIRED_KEYWORDS):
+        return result("dutch_required", 0.95)
 
-    # Strong Dutch body presence
-    if body_hits >= DUTCH_WORD_THRESHOLD_BODY:
-        return "dutch_required"
+    # Title mostly Dutch, >30% Dutch words, strong body presence, or mixed signal
+    if is_dutch or dutch_pct > 30:
+        strength = max(
+            title_hits / DUTCH_WORD_THRESHOLD_TITLE,
+            body_hits / DUTCH_WORD_THRESHOLD_BODY,
+            dutch_pct / 30,
+        )
+        return result("dutch_required", 0.6 + 0.35 * min(strength - 1, 1) if strength >= 1 else 0.6)
+
+    if any(signal in combined for signal in DUTCH_PREFERRED_SIGNALS):
+        return result("dutch_preferred", 0.9)
 
-    # Mixed signal: some Dutch in title + body
-    if title_hits >= 1 and body_hits >= 3:
-        return "dutch_required"
+    # 10-30% Dutch words, or some Dutch presence but not dominant
+    if dutch_pct > 10 or body_hits >= 3:
+        return result("dutch_preferred", 0.6)
 
-    # Check preferred signals
-    for signal in DUTCH_PREFERRED_SIGNALS:
-        if signal in combined:
-            return "dutch_preferred"
+    if ngram_nl is not None and ngram_nl >= 0.8:
+        return result("dutch_preferred", 0.5)
 
-    # 10-30% Dutch words → dutch_preferred
-    if dutch_pct > 10:
-        return "dutch_preferred"
+    # Fewer hits → more confident the text is English
+    return result("english_ok", 0.95 - 0.1 * min(title_hits + body_hits, 3))
 
-    # Some Dutch presence but not dominant
-    if body_hits >= 3:
-        return "dutch_preferred"
 
-    return "english_ok"
+def is_dutch_text(title: str, description: str = "") -> bool:
+    return detect_dutch(title, description).is_dutch
 
 
+def detect_dutch_level(title: str, description: str = "") -> str:
+    """Detect Dutch language requirement level.
+    Returns 'dutch_required', 'dutch_preferred', or 'english_ok'."""
+    return detect_dutch(title, description or "").label
+
+
+@timed(SCORER_SECONDS, "should_exclude")
 def should_exclude(title: str, description: str = "") -> bool:
     title_lower = title.lower()
     desc_lower = description.lower()
@@ -209,6 +359,7 @@ CATEGORY_RULES = [
 ]
 
 
+@timed(SCORER_SECONDS, "classify_category")
 def classify_category(title: str, description: str = "") -> str:
     """Classify a job into a category based on title and description keywords."""
     combined = f"{title} {description}".lower()
@@ -235,12 +386,18 @@ _CITY_ALIASES = {
 
 
 def extract_city(location: str) -> str:
-    """Extract and normalise the city name from a job location string."""
+    """Extract and normalise the city name from a job location string: the
+    gazetteer first, then substring matches on aliases and target cities."""
     if not location:
         return ""
     loc_lower = location.lower().strip()
 
-    # Check aliases first
+    # Resolve against the bundled gazetteer (whole-word match, so
+    # "Haarlemmermeer" is not mistaken for Haarlem); districts map to their city
+    place = resolve_location(location)
+    if place:
+        return _CITY_ALIASES.get(place.name.lower(), place.name)
+
     for alias, city in _CITY_ALIASES.items():
         if alias in loc_lower:
             return city
@@ -300,6 +457,7 @@ def detect_posting_type(company: str, source: str) -> str:
 # Work model detection
 # --------------------------------------------------------------------------
 
+@timed(SCORER_SECONDS, "detect_work_model")
 def detect_work_model(title: str, description: str = "", location: str = "", source: str = "") -> str:
     """Detect work model: 'remote', 'hybrid', or 'onsite'."""
     combined = f"{title} {description} {location}".lower()
@@ -325,87 +483,93 @@ def detect_work_model(title: str, description: str = "", location: str = "", sou
 # Posting age
 # --------------------------------------------------------------------------
 
-def compute_posting_age(date_posted: Optional[str], date_scraped: Optional[str] = None) -> dict:
-    """Compute human-readable posting age and freshness indicator.
-    Returns {text, color} where color is 'green', 'orange', or 'grey'."""
+_DATE_FORMATS = ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%d %b %Y", "%B %d, %Y", "%d-%m-%Y")
+_RELATIVE_UNITS = {
+    "minute": timedelta(minutes=1), "min": timedelta(minutes=1), "minuut": timedelta(minutes=1),
+    "hour": timedelta(hours=1), "uur": timedelta(hours=1),
+    "day": timedelta(days=1), "dag": timedelta(days=1),
+    "week": timedelta(weeks=1),
+    "month": timedelta(days=30), "maand": timedelta(days=30),
+}
+_RELATIVE_RE = re.compile(
+    r"(\d+)\+?\s*(" + "|".join(sorted(_RELATIVE_UNITS, key=len, reverse=True)) + r")",
+    re.IGNORECASE,
+)
+_JUST_POSTED_RE = re.compile(r"\b(?:just|today|now|vandaag|zojuist|nieuw)\b")
+
+
+def _to_utc_iso(dt: datetime) -> str:
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc).replace(microsecond=0).isoformat()
+
+
+def parse_posting_date(date_posted: Optional[str], reference: Optional[str] = None) -> Optional[str]:
+    """Resolve a scraped posting date to an absolute UTC ISO timestamp.
+    Relative strings ("3 days ago", "Just posted") are resolved against
+    ``reference`` (the scrape time). Returns None if the date is unparseable."""
     if not date_posted:
-        return {"text": "", "color": "grey"}
+        return None
+    raw = date_posted.strip()
+    try:
+        ref = datetime.fromisoformat(reference) if reference else datetime.now(timezone.utc)
+    except ValueError:
+        ref = datetime.now(timezone.utc)
 
+    # ISO 8601 with or without offset (LinkedIn, Remote OK)
     try:
-        # Try parsing ISO format or common date strings
-        for fmt in ("%Y-%m-%d", "%Y-%m-%dT%H:%M:%S", "%d %b %Y", "%B %d, %Y", "%d-%m-%Y"):
-            try:
-                posted_dt = datetime.strptime(date_posted.split("+")[0].split("Z")[0].strip(), fmt)
-                break
-            except ValueError:
-                continue
-        else:
-            # Try relative dates like "3 days ago", "Just posted", etc.
-            lower = date_posted.lower().strip()
-            if "just" in lower or "today" in lower or "now" in lower:
-                return {"text": "Just posted", "color": "green"}
-            if "yesterday" in lower or "1 day" in lower:
-                return {"text": "1 day ago", "color": "green"}
-            # Try to extract number of days
-            import re as _re
-            m = _re.search(r"(\d+)\s*day", lower)
-            if m:
-                days = int(m.group(1))
-                if days <= 3:
-                    return {"text": f"{days} days ago", "color": "green"}
-                elif days <= 7:
-                    return {"text": f"{days} days ago", "color": "orange"}
-                elif days <= 14:
-                    return {"text": "2 weeks ago", "color": "grey"}
-                elif days <= 21:
-                    return {"text": "3 weeks ago", "color": "grey"}
-                else:
-                    return {"text": "Older", "color": "grey"}
-            m = _re.search(r"(\d+)\s*week", lower)
-            if m:
-                weeks = int(m.group(1))
-                if weeks <= 1:
-                    return {"text": "1 week ago", "color": "orange"}
-                elif weeks <= 2:
-                    return {"text": "2 weeks ago", "color": "grey"}
-                elif weeks <= 3:
-                    return {"text": "3 weeks ago", "color": "grey"}
-                else:
-                    return {"text": "Older", "color": "grey"}
-            m = _re.search(r"(\d+)\s*month", lower)
-            if m:
-                return {"text": "Older", "color": "grey"}
-            # Unknown format — return raw text
-            return {"text": date_posted, "color": "grey"}
-
-        now = datetime.now(timezone.utc).replace(tzinfo=None)
-        delta = now - posted_dt
-        days = delta.days
-
-        if days < 0:
-            days = 0
-        if days == 0:
-            return {"text": "Just posted", "color": "green"}
-        elif days == 1:
-            return {"text": "1 day ago", "color": "green"}
-        elif days <= 3:
-            return {"text": f"{days} days ago", "color": "green"}
-        elif days <= 7:
-            return {"text": f"{days} days ago", "color": "orange"}
-        elif days <= 14:
-            return {"text": "2 weeks ago", "color": "grey"}
-        elif days <= 21:
-            return {"text": "3 weeks ago", "color": "grey"}
-        else:
-            return {"text": "Older", "color": "grey"}
-    except Exception:
-        return {"text": date_posted or "", "color": "grey"}
+        return _to_utc_iso(datetime.fromisoformat(raw.replace("Z", "+00:00")))
+    except ValueError:
+        pass
+    # RFC 822 (We Work Remotely RSS)
+    try:
+        return _to_utc_iso(parsedate_to_datetime(raw))
+    except (TypeError, ValueError, IndexError):
+        pass
+    for fmt in _DATE_FORMATS:
+        try:
+            return _to_utc_iso(datetime.strptime(raw, fmt))
+        except ValueError:
+            continue
+
+    lower = raw.lower()
+    if _JUST_POSTED_RE.search(lower):
+        return _to_utc_iso(ref)
+    if "yesterday" in lower or "gisteren" in lower:
+        return _to_utc_iso(ref - timedelta(days=1))
+    m = _RELATIVE_RE.search(lower)
+    if m:
+        return _to_utc_iso(ref - int(m.group(1)) * _RELATIVE_UNITS[m.group(2).lower()])
+    return None
+
+
+def posting_age_label(age_days: Optional[int]) -> dict:
+    """Human-readable posting age and freshness indicator from an age in days.
+    Returns {text, color} where color is 'green', 'orange', or 'grey'."""
+    if age_days is None:
+        return {"text": "", "color": "grey"}
+    days = max(age_days, 0)
+    if days == 0:
+        return {"text": "Just posted", "color": "green"}
+    elif days == 1:
+        return {"text": "1 day ago", "color": "green"}
+    elif days <= 3:
+        return {"text": f"{days} days ago", "color": "green"}
+    elif days <= 7:
+        return {"text": f"{days} days ago", "color": "orange"}
+    elif days <= 14:
+        return {"text": "2 weeks ago", "color": "grey"}
+    elif days <= 21:
+        return {"text": "3 weeks ago", "color": "grey"}
+    else:
+        return {"text": "Older", "color": "grey"}
 
 
 # --------------------------------------------------------------------------
 # Scoring
 # --------------------------------------------------------------------------
 
+@timed(SCORER_SECONDS, "compute_score")
 def compute_score(title: str, company: str = "", location: str = "", description: str = "", dutch_level: str = "") -> int:
     title_lower = title.lower()
     desc_lower = description.lower()
@@ -475,6 +639,7 @@ def compute_score(title: str, company: str = "", location: str = "", description
     return max(0, min(score, 150))
 
 
+@timed(SCORER_SECONDS, "compute_score_breakdown")
 def compute_score_breakdown(title: str, company: str = "", location: str = "", description: str = "", dutch_level: str = "") -> dict:
     """Compute score with detailed per-component breakdown."""
     title_lower = (title or "").lower()
@@ -574,7 +739,7 @@ def compute_score_breakdown(title: str, company: str = "", location: str = "", d
 def get_commute_info(location: str) -> dict:
     """Get commute info for a job location."""
     if not location:
-        return {"maps_url": None, "estimate": None}
+        return {"maps_url": None, "estimate": None, "distance_km": None}
 
     location_lower = location.lower()
     estimate = None
@@ -590,13 +755,14 @@ def get_commute_info(location: str) -> dict:
         f"?travelmode=transit"
     )
 
-    return {"maps_url": maps_url, "estimate": estimate}
+    return {"maps_url": maps_url, "estimate": estimate, "distance_km": geocode_job(location)["distance_km"]}
 
 
 # --------------------------------------------------------------------------
 # Fit analysis
 # --------------------------------------------------------------------------
 
+@timed(SCORER_SECONDS, "generate_fit_analysis")
 def generate_fit_analysis(title: str, snippet: str = "", location: str = "") -> dict:
     title_lower = title.lower()
     snippet_lower = (snippet or "").lower()
@@ -716,6 +882,22 @@ def generate_fit_analysis(title: str, snippet: str = "", location: str = "") ->
     return {"tagline": tagline, "bullets": bullets[:4]}
 
 
+# --------------------------------------------------------------------------
+# Per-job enrichment (fit, commute, score breakdown)
+# --------------------------------------------------------------------------
+
+@lru_cache(maxsize=4096)
+def enrich_job(title: str, company: str = "", location: str = "", snippet: str = "", dutch_level: str = "") -> dict:
+    """Fit analysis, commute estimate and score breakdown for one job.
+    Cached on the job's content, so each job is analysed once per process and an
+    edited snippet naturally gets a fresh entry. Callers must not mutate the result."""
+    return {
+        "fit": generate_fit_analysis(title, snippet, location),
+        "commute": get_commute_info(location),
+        "score_breakdown": compute_score_breakdown(title, company, location, snippet, dutch_level=dutch_level),
+    }
+
+
 # --------------------------------------------------------------------------
 # Cover letter generator
 # --------------------------------------------------------------------------
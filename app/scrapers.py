@@ -1,4 +1,5 @@
-"""Job scrapers for Indeed NL, IamExpat, Undutchables, LinkedIn, Adams, Welcome to NL, Remote OK, We Work Remotely."""
+"""Job scrapers for Indeed NL, IamExpat, Undutchables, LinkedIn, Adams, Welcome to NL, Remote OK,
+We Work Remotely, and the custom job boards added by the user."""
 
 import asyncio
 import hashlib
@@ -6,18 +7,31 @@ import json
 import logging
 import random
 import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Optional
-from urllib.parse import quote_plus, urljoin
+from typing import Callable, Iterable, Optional
+from urllib.parse import quote_plus, urljoin, urlsplit
 
 import httpx
 from bs4 import BeautifulSoup
 
+from app.breaker import CircuitBreaker, DeadlineExceeded, SourceClient, SourceUnavailable
 from app.config import (
+    DETAIL_FETCH_ENABLED,
+    GENERIC_BOARD_SELECTORS,
+    INCREMENTAL_SCAN,
+    PARSE_WORKERS,
+    SEARCH_QUERIES,
     REQUEST_TIMEOUT,
+    SCAN_BUDGET_SECONDS,
+    SOURCE_BUDGET_SECONDS,
     USER_AGENTS,
     REMOTE_RELEVANT_TAGS,
 )
+from app.metrics import SCRAPER_PARSE_SECONDS
+from app.queries import QueryPlan, plan_queries
+from app.scans import SourceStats
 from app.scorer import (
     compute_score, should_exclude, extract_salary,
     classify_category, extract_city, detect_posting_type,
@@ -40,9 +54,14 @@ def _random_headers(referer: str = "") -> dict:
     return h
 
 
-async def _delay():
-    """Small random delay between requests."""
-    await asyncio.sleep(random.uniform(0.5, 1.5))
+async def _delay(client: Optional[httpx.AsyncClient] = None):
+    """Small random delay between requests. On a SourceClient it is counted
+    as waiting, so it doesn't show up as the scraper's parse time."""
+    seconds = random.uniform(0.5, 1.5)
+    if isinstance(client, SourceClient):
+        await client.pause(seconds)
+    else:
+        await asyncio.sleep(seconds)
 
 
 @dataclass
@@ -55,15 +74,21 @@ class RawJob:
     source: str
     date_posted: Optional[str] = None
     work_model: str = ""
+    description: Optional[str] = None  # full text from the detail page, when fetched
 
     @property
     def external_id(self) -> str:
         raw = f"{self.source}:{self.url}"
         return hashlib.md5(raw.encode()).hexdigest()
 
+    @property
+    def text(self) -> str:
+        """Everything known about the job besides its title, for the scorer."""
+        return " ".join(t for t in (self.snippet, self.description) if t)
+
     @property
     def dutch_level(self) -> str:
-        return detect_dutch_level(self.title, self.snippet or "")
+        return detect_dutch_level(self.title, self.text)
 
     @property
     def score(self) -> int:
@@ -71,19 +96,19 @@ class RawJob:
             self.title,
             self.company or "",
             self.location or "",
-            self.snippet or "",
+            self.text,
             dutch_level=self.dutch_level,
         )
 
     @property
     def salary(self) -> dict | None:
-        return extract_salary(f"{self.title} {self.snippet or ''}")
+        return extract_salary(f"{self.title} {self.text}")
 
     @property
     def detected_work_model(self) -> str:
         if self.work_model:
             return self.work_model
-        return detect_work_model(self.title, self.snippet or "", self.location or "", self.source)
+        return detect_work_model(self.title, self.text, self.location or "", self.source)
 
 
 def _clean(text: Optional[str]) -> Optional[str]:
@@ -110,319 +135,362 @@ async def scrape_indeed(client: httpx.AsyncClient, extra_queries: list[str] | No
 
 
 # ---------------------------------------------------------------------------
-# IamExpat (Next.js — extract __NEXT_DATA__ JSON)
+# Declarative boards
 # ---------------------------------------------------------------------------
+# An HTML job board is described by a BoardSpec: where its listing pages are
+# and which selectors pick each field out of a listing card. One engine
+# fetches and parses every such board, built-in or added through
+# /api/custom-job-boards.
+#
+# Each field takes alternative selectors, tried in order until one yields
+# text. "selector@attr" reads an attribute instead of the text, and an empty
+# selector means the card element itself ("@href" is the card's own link).
+
+Selectors = tuple[str, ...]
+
+SELECTOR_FIELDS = ("card", "title", "link", "company", "location", "date", "snippet")
+
+@dataclass(frozen=True)
+class BoardSpec:
+    name: str
+    url: str  # listing URL; "{query}" is replaced by each URL-encoded query
+    queries: tuple[str, ...] = tuple(SEARCH_QUERIES)  # built-in; the query planner adds custom keywords
+    pages: tuple[str, ...] = ()  # fixed listing URLs used instead of url/queries
+    card: Selectors = tuple(GENERIC_BOARD_SELECTORS["card"])
+    title: Selectors = tuple(GENERIC_BOARD_SELECTORS["title"])
+    link: Selectors = tuple(GENERIC_BOARD_SELECTORS["link"])
+    company: Selectors = tuple(GENERIC_BOARD_SELECTORS["company"])
+    location: Selectors = tuple(GENERIC_BOARD_SELECTORS["location"])
+    date: Selectors = tuple(GENERIC_BOARD_SELECTORS["date"])
+    snippet: Selectors = ()
+    default_company: Optional[str] = None
+    referer: str = ""
+    delay: tuple[float, float] = (0.5, 1.5)  # seconds between requests to the board
+    min_title_chars: int = 5
+    strip_query: bool = False  # drop tracking parameters from job URLs
+    stop_at_known: bool = False  # pages run newest first: stop after one of only known jobs
+    json_ld: bool = False  # read schema.org JobPostings when no card selector matches
 
-async def scrape_iamexpat(client: httpx.AsyncClient) -> list[RawJob]:
-    """Scrape IamExpat jobs — Tailwind card layout with a[href*='/career/jobs-netherlands/']."""
+    @property
+    def searchable(self) -> bool:
+        return not self.pages and "{query}" in self.url
+
+    def listing_pages(self, queries: Optional[Iterable[str]] = None) -> list[tuple[str, str]]:
+        """(query, url) for each listing page; query is "" for fixed pages."""
+        if self.pages:
+            return [("", url) for url in self.pages]
+        if self.searchable:
+            return [
+                (q, self.url.replace("{query}", quote_plus(q)))
+                for q in (self.queries if queries is None else queries)
+            ]
+        return [("", self.url)]
+
+
+_ATTR_RE = re.compile(r"(.*?)@([\w:-]+)")
+
+
+def _pick(card, selectors: Selectors) -> Optional[str]:
+    """First non-empty text (or attribute) found by the alternative selectors."""
+    for selector in selectors:
+        m = _ATTR_RE.fullmatch(selector)
+        css, attr = (m.group(1), m.group(2)) if m else (selector, None)
+        el = card.select_one(css) if css.strip() else card
+        if el is None:
+            continue
+        value = el.get(attr) if attr else el.get_text()
+        value = _clean(value) if isinstance(value, str) else None
+        if value:
+            return value
+    return None
+
+
+def json_ld_postings(soup: BeautifulSoup) -> list[dict]:
+    """schema.org JobPosting objects embedded in the page as JSON-LD."""
+    postings = []
+    for script in soup.find_all("script", type="application/ld+json"):
+        try:
+            data = json.loads(script.string or "")
+        except ValueError:
+            continue
+        stack = data if isinstance(data, list) else [data]
+        while stack:
+            item = stack.pop(0)
+            if not isinstance(item, dict):
+                continue
+            types = item.get("@type")
+            if "JobPosting" in (types if isinstance(types, list) else [types]):
+                postings.append(item)
+            # ItemList / @graph wrappers
+            stack.extend(item.get("@graph") or [])
+            stack.extend(e.get("item", e) for e in item.get("itemListElement") or [] if isinstance(e, dict))
+    return postings
+
+
+def _posting_job(spec: BoardSpec, posting: dict, page_url: str) -> Optional[RawJob]:
+    title = _clean(posting.get("title"))
+    if not title or not posting.get("url"):
+        return None
+    org = posting.get("hiringOrganization")
+    company = org.get("name") if isinstance(org, dict) else org if isinstance(org, str) else None
+    places = posting.get("jobLocation")
+    place = (places[0] if places else None) if isinstance(places, list) else places
+    address = place.get("address") if isinstance(place, dict) else None
+    location = address.get("addressLocality") if isinstance(address, dict) else None
+    desc = posting.get("description")
+    text = _clean(BeautifulSoup(desc[:2000], "html.parser").get_text(" ")) if desc else None
+    return RawJob(
+        title=title, company=_clean(company) or spec.default_company, location=_clean(location),
+        snippet=text[:500] if text else None, url=urljoin(page_url, posting["url"]),
+        source=spec.name, date_posted=posting.get("datePosted"),
+    )
+
+
+def _parse_listing(spec: BoardSpec, html: str, page_url: str) -> list[RawJob]:
+    """Listing cards on one page, run in the parse pool."""
+    soup = BeautifulSoup(html, "lxml")
+    cards = []
+    for selector in spec.card:
+        cards = soup.select(selector)
+        if cards:
+            break
+    if not cards and spec.json_ld:
+        jobs = [_posting_job(spec, posting, page_url) for posting in json_ld_postings(soup)]
+        return [job for job in jobs if job and _passes_filter(job.title, job.snippet or "")]
+
+    listing_path = urlsplit(page_url).path.rstrip("/")
     jobs: list[RawJob] = []
-    search_terms = [
-        "accountant", "bookkeeper", "finance", "administration",
-        "back office", "customer service", "data entry", "office",
-    ]
-
-    for query in search_terms:
-        url = (
-            f"https://www.iamexpat.nl/career/jobs-netherlands"
-            f"?search={quote_plus(query)}"
-            f"&location=Haarlem"
-            f"&distance=25"
-        )
+    for card in cards:
+        href = _pick(card, spec.link)
+        if not href:
+            continue
+        href = urljoin(page_url, href)
+        if spec.strip_query:
+            href = href.split("?")[0]
+        # Links back to the listing itself (pagination, "all jobs") aren't cards
+        if urlsplit(href).path.rstrip("/") == listing_path:
+            continue
+
+        title = _pick(card, spec.title)
+        if not title or len(title) < spec.min_title_chars:
+            continue
+        location = _pick(card, spec.location)
+        # Cards read as a whole run the location into the title
+        if location and title.endswith(location) and title != location:
+            title = title[: -len(location)].strip()
+        snippet = _pick(card, spec.snippet)
+        if not _passes_filter(title, snippet or ""):
+            continue
+        jobs.append(RawJob(
+            title=title,
+            company=_pick(card, spec.company) or spec.default_company,
+            location=location,
+            snippet=snippet,
+            url=href,
+            source=spec.name,
+            date_posted=_pick(card, spec.date),
+        ))
+    return jobs
+
+
+# BeautifulSoup parsing is CPU-bound: it runs here so fetching the next page
+# (and serving API requests) carries on meanwhile
+_PARSE_POOL = ThreadPoolExecutor(max_workers=PARSE_WORKERS, thread_name_prefix="parse")
+
+
+def _timed_parse(spec: BoardSpec, html: str, page_url: str) -> tuple[list[RawJob], float]:
+    start = time.perf_counter()
+    jobs = _parse_listing(spec, html, page_url)
+    seconds = time.perf_counter() - start
+    SCRAPER_PARSE_SECONDS.observe(seconds, spec.name)
+    return jobs, seconds
+
+
+class _Throttle:
+    """Spaces consecutive requests to each host by a random interval from the
+    board's delay range; time spent parsing counts towards the wait."""
+
+    def __init__(self):
+        self._next: dict[str, float] = {}
+
+    async def wait(self, url: str, delay: tuple[float, float]):
+        host = urlsplit(url).netloc
+        now = asyncio.get_running_loop().time()
+        at = self._next.get(host, now)
+        self._next[host] = max(at, now) + random.uniform(*delay)
+        if at > now:
+            await asyncio.sleep(at - now)
+
+
+async def scrape_board(
+    client: httpx.AsyncClient,
+    spec: BoardSpec,
+    known: Optional[set[str]] = None,
+    throttle: Optional[_Throttle] = None,
+    plan: Optional[QueryPlan] = None,
+    stats: Optional[SourceStats] = None,
+) -> list[RawJob]:
+    """Fetch a board's listing pages and parse their cards.
+
+    Pages are requested one at a time per the board's delay while earlier pages
+    parse in the pool. Boards with stop_at_known parse each page before
+    deciding whether to fetch the next. With a query plan, its queries replace
+    the spec's and each query's yield is recorded on the plan. Parse time is
+    added to `stats`."""
+    throttle = throttle or _Throttle()
+    loop = asyncio.get_running_loop()
+    parsed: list[tuple[str, asyncio.Future]] = []
+
+    for query, page_url in spec.listing_pages(plan.queries if plan else None):
         try:
-            await _delay()
-            resp = await client.get(url, headers=_random_headers("https://www.iamexpat.nl/"), timeout=REQUEST_TIMEOUT)
+            await throttle.wait(page_url, spec.delay)
+            resp = await client.get(page_url, headers=_random_headers(spec.referer), timeout=REQUEST_TIMEOUT)
             if resp.status_code != 200:
-                logger.warning("IamExpat returned %s for %s", resp.status_code, query)
+                logger.warning("%s returned %s for %s", spec.name, resp.status_code, page_url)
                 continue
-
-            soup = BeautifulSoup(resp.text, "lxml")
-
-            # Cards are <a> tags linking to individual job pages
-            cards = soup.select("a[href*='/career/jobs-netherlands/']")
-            for card in cards:
-                href = card.get("href", "")
-                if not href or href.rstrip("/") == "/career/jobs-netherlands":
-                    continue
-                if not href.startswith("http"):
-                    href = urljoin("https://www.iamexpat.nl", href)
-
-                # Title is in span.title-7 inside the card
-                title_el = card.select_one("span.title-7")
-                if not title_el:
-                    # Fallback: try any heading or bold text
-                    title_el = card.select_one("h2, h3, h4, strong, span[class*='title']")
-                if not title_el:
-                    continue
-                title = _clean(title_el.get_text())
-                if not title or len(title) < 5:
-                    continue
-
-                # Location/date in div.JobBoardItemCard_jobInfoElement__*
-                info_els = card.select("div[class*='jobInfoElement'], div[class*='JobBoardItemCard_jobInfo']")
-                loc = None
-                date_str = None
-                for i, el in enumerate(info_els):
-                    text = _clean(el.get_text())
-                    if i == 0 and text:
-                        loc = text
-                    elif i == 1 and text:
-                        date_str = text
-
-                # Company from div.body-small or similar
-                company_el = card.select_one("div.body-small, span[class*='company'], div[class*='company']")
-                company = _clean(company_el.get_text()) if company_el else None
-
-                if not _passes_filter(title, ""):
-                    continue
-
-                jobs.append(RawJob(
-                    title=title, company=company, location=loc,
-                    snippet=None, url=href, source="iamexpat",
-                    date_posted=date_str,
-                ))
-
+            page = loop.run_in_executor(_PARSE_POOL, _timed_parse, spec, resp.text, page_url)
+            parsed.append((query, page))
+            if not spec.stop_at_known:
+                continue
+            page_jobs, _ = await page
+            if known is not None and page_jobs and all(j.external_id in known for j in page_jobs):
+                logger.info("%s: %s holds only known listings, stopping", spec.name, page_url)
+                break
+        except SourceUnavailable as e:
+            logger.warning("%s: %s, keeping the %d pages fetched", spec.name, e, len(parsed))
+            break
         except Exception as e:
-            logger.error("IamExpat scrape error for '%s': %s", query, e)
-
-    return _dedupe(jobs)
-
-
-# ---------------------------------------------------------------------------
-# Undutchables (corrected URL: /vacancies)
-# ---------------------------------------------------------------------------
+            logger.error("%s scrape error for %s: %s", spec.name, page_url, e)
 
-async def scrape_undutchables(client: httpx.AsyncClient) -> list[RawJob]:
-    """Scrape Undutchables — cards are a.vacancy-item with h4 title + div.location."""
     jobs: list[RawJob] = []
-    search_terms = [
-        "accountant", "bookkeeper", "finance", "administration",
-        "back office", "customer service", "data entry", "office",
-    ]
-
-    for query in search_terms:
-        url = (
-            f"https://undutchables.nl/vacancies"
-            f"?search={quote_plus(query)}"
-        )
+    seen: set[str] = set()
+    for query, page in parsed:
         try:
-            await _delay()
-            resp = await client.get(url, headers=_random_headers("https://undutchables.nl/"), timeout=REQUEST_TIMEOUT)
-            if resp.status_code != 200:
-                logger.warning("Undutchables returned %s for %s", resp.status_code, query)
-                continue
-            soup = BeautifulSoup(resp.text, "lxml")
-
-            # Primary: a.vacancy-item cards
-            cards = soup.select("a.vacancy-item")
-            # Fallback: any link to /vacancies/<slug>
-            if not cards:
-                cards = [
-                    a for a in soup.select("a[href*='/vacancies/']")
-                    if a.get("href", "").rstrip("/") != "/vacancies"
-                    and len(a.get_text(strip=True)) > 5
-                ]
-
-            for card in cards:
-                href = card.get("href", "")
-                if not href or href.rstrip("/") == "/vacancies":
-                    continue
-                if not href.startswith("http"):
-                    href = urljoin("https://undutchables.nl", href)
-
-                # Title in <h4> inside the card
-                title_el = card.select_one("h4")
-                if not title_el:
-                    title_el = card.select_one("h3, h2, strong")
-                if title_el:
-                    title = _clean(title_el.get_text())
-                else:
-                    # Last resort: full card text minus location
-                    title = _clean(card.get_text())
-                if not title or len(title) < 5:
-                    continue
-
-                # Location in div.location
-                loc_el = card.select_one("div.location, span.location, .vacancy-location")
-                loc = _clean(loc_el.get_text()) if loc_el else None
-
-                # Remove location text from title if it was concatenated
-                if loc and title.endswith(loc):
-                    title = title[: -len(loc)].strip()
-
-                company = None  # Undutchables doesn't show company on list page
-
-                if not _passes_filter(title, ""):
-                    continue
-
-                jobs.append(RawJob(
-                    title=title, company=company, location=loc,
-                    snippet=None, url=href, source="undutchables",
-                ))
-
+            page_jobs, seconds = await page
         except Exception as e:
-            logger.error("Undutchables scrape error for '%s': %s", query, e)
-
+            logger.error("%s parse error: %s", spec.name, e)
+            continue
+        if stats is not None:
+            stats.parse_seconds += seconds
+        jobs.extend(page_jobs)
+        ids = {job.external_id for job in page_jobs}
+        unique = ids - seen
+        seen |= ids
+        if plan is not None and query:
+            plan.record(query, ids, unique=len(unique), new=len(unique - plan.known))
     return _dedupe(jobs)
 
 
-# ---------------------------------------------------------------------------
-# LinkedIn (public search URL scraping)
-# ---------------------------------------------------------------------------
+IAMEXPAT = BoardSpec(
+    name="iamexpat",
+    url="https://www.iamexpat.nl/career/jobs-netherlands?search={query}&location=Haarlem&distance=25",
+    referer="https://www.iamexpat.nl/",
+    # Tailwind cards are links to the job pages
+    card=("a[href*='/career/jobs-netherlands/']",),
+    title=("span.title-7", "h2, h3, h4, strong, span[class*='title']"),
+    link=("@href",),
+    company=("div.body-small, span[class*='company'], div[class*='company']",),
+    # Info elements: location first, posting date second
+    location=("div[class*='jobInfoElement']",),
+    date=("div[class*='jobInfoElement'] ~ div[class*='jobInfoElement']",),
+)
 
-async def scrape_linkedin(client: httpx.AsyncClient) -> list[RawJob]:
-    """Scrape LinkedIn public job search pages."""
-    jobs: list[RawJob] = []
-    queries_to_use = [
+UNDUTCHABLES = BoardSpec(
+    name="undutchables",
+    url="https://undutchables.nl/vacancies?search={query}",
+    referer="https://undutchables.nl/",
+    card=("a.vacancy-item", "a[href*='/vacancies/']"),
+    # Last resort: the whole card text, location trimmed off
+    title=("h4", "h3, h2, strong", ""),
+    link=("@href",),
+    company=(),  # not shown on the list page
+    location=("div.location, span.location, .vacancy-location",),
+    date=(),
+)
+
+LINKEDIN = BoardSpec(
+    name="linkedin",
+    url=(
+        "https://www.linkedin.com/jobs/search/?keywords={query}"
+        f"&location={quote_plus('Haarlem, North Holland, Netherlands')}"
+        "&distance=25&f_TPR=r604800"  # past week
+    ),
+    queries=(
         "accountant english",
         "bookkeeper",
         "finance administrator",
         "office administrator english",
         "back office english",
         "customer service english",
-    ]
-
-    for query in queries_to_use:
-        url = (
-            f"https://www.linkedin.com/jobs/search/"
-            f"?keywords={quote_plus(query)}"
-            f"&location={quote_plus('Haarlem, North Holland, Netherlands')}"
-            f"&distance=25"
-            f"&f_TPR=r604800"  # past week
-        )
-        try:
-            await _delay()
-            resp = await client.get(url, headers=_random_headers("https://www.linkedin.com/"), timeout=REQUEST_TIMEOUT, follow_redirects=True)
-            if resp.status_code != 200:
-                logger.warning("LinkedIn returned %s for %s", resp.status_code, query)
-                continue
-            soup = BeautifulSoup(resp.text, "lxml")
-
-            cards = soup.select("div.base-card, li.result-card, div.job-search-card")
-            for card in cards:
-                title_el = card.select_one("h3.base-search-card__title, h3.result-card__title")
-                if not title_el:
-                    continue
-                title = _clean(title_el.get_text())
-                if not title:
-                    continue
-
-                link_el = card.select_one("a.base-card__full-link, a.result-card__full-card-link")
-                href = link_el.get("href", "") if link_el else ""
-                if "?" in href:
-                    href = href.split("?")[0]
-
-                company_el = card.select_one("h4.base-search-card__subtitle, h4.result-card__subtitle")
-                company = _clean(company_el.get_text()) if company_el else None
-
-                loc_el = card.select_one("span.job-search-card__location")
-                loc = _clean(loc_el.get_text()) if loc_el else None
-
-                date_el = card.select_one("time")
-                date_str = date_el.get("datetime") if date_el else None
-
-                if not _passes_filter(title, ""):
-                    continue
-
-                jobs.append(RawJob(
-                    title=title, company=company, location=loc,
-                    snippet=None, url=href or url, source="linkedin",
-                    date_posted=date_str,
-                ))
-
-        except Exception as e:
-            logger.error("LinkedIn scrape error for '%s': %s", query, e)
-
-    return _dedupe(jobs)
-
-
-# ---------------------------------------------------------------------------
-# Adams Recruitment (broader selectors)
-# ---------------------------------------------------------------------------
+    ),
+    referer="https://www.linkedin.com/",
+    card=("div.base-card, li.result-card, div.job-search-card",),
+    title=("h3.base-search-card__title, h3.result-card__title",),
+    link=("a.base-card__full-link@href", "a.result-card__full-card-link@href"),
+    company=("h4.base-search-card__subtitle, h4.result-card__subtitle",),
+    location=("span.job-search-card__location",),
+    date=("time@datetime",),
+    min_title_chars=1,
+    strip_query=True,
+)
 
-async def scrape_adams(client: httpx.AsyncClient) -> list[RawJob]:
-    """Scrape Adams Recruitment — article.matador-job cards from base /jobs/ page."""
-    jobs: list[RawJob] = []
-    # Adams redirects www to non-www and rate-limits aggressively.
-    # Use non-www domain and scrape base listing pages (no search params).
-    pages_to_scrape = [
+# Adams redirects www to non-www and rate-limits aggressively: base listing
+# pages only (no search parameters), with longer delays
+ADAMS = BoardSpec(
+    name="adams",
+    url="https://adamsrecruitment.com/jobs/",
+    pages=(
         "https://adamsrecruitment.com/jobs/",
         "https://adamsrecruitment.com/jobs/page/2/",
         "https://adamsrecruitment.com/jobs/page/3/",
-    ]
-
-    for page_url in pages_to_scrape:
-        try:
-            await asyncio.sleep(random.uniform(2.0, 3.5))  # longer delay for Adams rate limiting
-            resp = await client.get(page_url, headers=_random_headers("https://adamsrecruitment.com/"), timeout=REQUEST_TIMEOUT)
-            if resp.status_code != 200:
-                logger.warning("Adams returned %s for %s", resp.status_code, page_url)
-                continue
-            soup = BeautifulSoup(resp.text, "lxml")
-
-            # Primary: article.matador-job cards
-            cards = soup.select("article.matador-job")
-            if not cards:
-                # Fallback: any article with job links
-                cards = soup.select("article[class*='job'], div[class*='job-listing']")
-
-            for card in cards:
-                # Title: h3.matador-job-title a  or  h3.entry-title a
-                title_el = card.select_one(
-                    "h3.matador-job-title a, h3.entry-title a, h3 a, h2 a"
-                )
-                if not title_el:
-                    continue
-                title = _clean(title_el.get_text())
-                if not title or len(title) < 5:
-                    continue
-
-                href = title_el.get("href", "")
-                if href and not href.startswith("http"):
-                    href = urljoin("https://adamsrecruitment.com", href)
-
-                # Location: div.job-field.location .field-text
-                loc_el = card.select_one(
-                    "div.job-field.location .field-text, "
-                    "div.location .field-text, "
-                    "span.job-location, "
-                    "div.matador-job-location"
-                )
-                loc = _clean(loc_el.get_text()) if loc_el else None
-
-                # Salary: div.job-field.salary .field-text
-                salary_el = card.select_one(
-                    "div.job-field.salary .field-text, "
-                    "div.salary .field-text"
-                )
-                salary_text = _clean(salary_el.get_text()) if salary_el else None
-
-                # Type: div.job-field.type .field-text
-                type_el = card.select_one(
-                    "div.job-field.type .field-text, "
-                    "div.type .field-text"
-                )
+    ),
+    referer="https://adamsrecruitment.com/",
+    card=("article.matador-job", "article[class*='job'], div[class*='job-listing']"),
+    title=("h3.matador-job-title a, h3.entry-title a, h3 a, h2 a",),
+    link=("h3.matador-job-title a, h3.entry-title a, h3 a, h2 a@href",),
+    company=("div.job-field.company .field-text, span.company, div.employer",),
+    location=(
+        "div.job-field.location .field-text, div.location .field-text, "
+        "span.job-location, div.matador-job-location",
+    ),
+    date=(),
+    # The card's salary line is the only text besides the title
+    snippet=("div.job-field.salary .field-text, div.salary .field-text",),
+    default_company="Adams Recruitment",
+    delay=(2.0, 3.5),
+    stop_at_known=True,
+)
 
-                # Company from card metadata if available
-                company_el = card.select_one(
-                    "div.job-field.company .field-text, "
-                    "span.company, div.employer"
-                )
-                company = _clean(company_el.get_text()) if company_el else "Adams Recruitment"
 
-                snippet = salary_text or None
+def custom_board_source(name: str) -> str:
+    """Source key for a custom board's jobs."""
+    return re.sub(r"[^a-z0-9.]+", "-", name.lower()).strip("-.")
 
-                if not _passes_filter(title, snippet or ""):
-                    continue
 
-                jobs.append(RawJob(
-                    title=title, company=company, location=loc,
-                    snippet=snippet, url=href or page_url, source="adams",
-                ))
-
-        except Exception as e:
-            logger.error("Adams scrape error for %s: %s", page_url, e)
-
-    return _dedupe(jobs)
+def custom_board_spec(board: dict) -> Optional[BoardSpec]:
+    """BoardSpec for a row of custom_job_boards. Without a stored spec the
+    generic card selectors and JSON-LD job postings are used."""
+    url = (board.get("url") or board.get("name") or "").strip()
+    source = custom_board_source(board.get("name") or url)
+    if not url or not source:
+        return None
+    if "://" not in url:
+        url = f"https://{url}"
+    spec = board.get("spec") or {}
+    selectors = {
+        key: tuple([value] if isinstance(value, str) else value)
+        for key, value in (spec.get("selectors") or {}).items()
+        if key in SELECTOR_FIELDS
+    }
+    parts = urlsplit(url)
+    return BoardSpec(
+        name=source,
+        url=url,
+        queries=tuple(spec.get("queries") or SEARCH_QUERIES),
+        referer=f"{parts.scheme}://{parts.netloc}/",
+        json_ld=True,
+        **selectors,
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -442,10 +510,13 @@ async def scrape_welcome_to_nl(client: httpx.AsyncClient) -> list[RawJob]:
 # Remote OK (JSON API)
 # ---------------------------------------------------------------------------
 
+REMOTEOK_API_URL = "https://remoteok.com/api"
+
+
 async def scrape_remoteok(client: httpx.AsyncClient) -> list[RawJob]:
     """Scrape Remote OK via JSON API, filter for relevant roles."""
     jobs: list[RawJob] = []
-    url = "https://remoteok.com/api"
+    url = REMOTEOK_API_URL
     try:
         resp = await client.get(url, headers={
             "User-Agent": random.choice(USER_AGENTS),
@@ -503,17 +574,19 @@ async def scrape_remoteok(client: httpx.AsyncClient) -> list[RawJob]:
 # We Work Remotely (RSS feeds)
 # ---------------------------------------------------------------------------
 
+WWR_FEEDS = (
+    "https://weworkremotely.com/categories/remote-customer-support-jobs.rss",
+    "https://weworkremotely.com/categories/remote-management-and-finance-jobs.rss",
+)
+
+
 async def scrape_weworkremotely(client: httpx.AsyncClient) -> list[RawJob]:
     """Scrape We Work Remotely via RSS feeds for relevant categories."""
     jobs: list[RawJob] = []
-    feeds = [
-        "https://weworkremotely.com/categories/remote-customer-support-jobs.rss",
-        "https://weworkremotely.com/categories/remote-management-and-finance-jobs.rss",
-    ]
 
-    for feed_url in feeds:
+    for feed_url in WWR_FEEDS:
         try:
-            await _delay()
+            await _delay(client)
             resp = await client.get(feed_url, headers={
                 "User-Agent": random.choice(USER_AGENTS),
                 "Accept": "application/rss+xml,application/xml,text/xml",
@@ -587,61 +660,287 @@ def _dedupe(jobs: list[RawJob]) -> list[RawJob]:
     return unique
 
 
-async def scrape_all() -> dict[str, int]:
-    """Run all scrapers and return counts of new jobs per source."""
-    from app.database import upsert_job
+def _scored_fields(job: RawJob) -> dict:
+    """Columns derived from the job's text by the scorer."""
+    sal = job.salary
+    return {
+        "score": job.score,
+        "salary_min": sal["min"] if sal else None,
+        "salary_max": sal["max"] if sal else None,
+        "salary_raw": sal["raw"] if sal else None,
+        "salary_period": sal["period"] if sal else None,
+        "category": classify_category(job.title, job.text),
+        "dutch_level": job.dutch_level,
+        "work_model": job.detected_work_model,
+    }
+
 
-    results: dict[str, int] = {}
+async def _enrich_details(
+    client: httpx.AsyncClient,
+    pending: list[tuple[int, RawJob]],
+    emit: Callable[[str, dict], None],
+    deadline: Optional[float] = None,
+):
+    """Fetch descriptions for jobs with thin card text (in the order given, within
+    the per-scan budget and before `deadline`) and rescore the jobs that got one."""
+    from app.database import update_job_details
+    from app.details import fetch_descriptions
+
+    descriptions, stats = await fetch_descriptions(client, [job for _, job in pending], deadline=deadline)
+    rescored = 0
+    for job_id, job in pending:
+        job.description = descriptions.get(job.url)
+        if job.description:
+            update_job_details(job_id, job.description, **_scored_fields(job))
+            rescored += 1
+    logger.info(
+        "  details: %d fetched, %d cached, %d failed, %d over budget, %d out of time, %d jobs rescored",
+        stats["fetched"], stats["cached"], stats["failed"], stats["skipped"], stats["out_of_time"], rescored,
+    )
+    emit("details_done", {**stats, "rescored": rescored})
+
+
+# HTML boards are BoardSpecs run by scrape_board; the rest are code scrapers
+# taking the shared client
+SCRAPERS: dict[str, BoardSpec | Callable] = {
+    "indeed": scrape_indeed,
+    "iamexpat": IAMEXPAT,
+    "undutchables": UNDUTCHABLES,
+    "linkedin": LINKEDIN,
+    "adams": ADAMS,
+    "welcometonl": scrape_welcome_to_nl,
+    "remoteok": scrape_remoteok,
+    "weworkremotely": scrape_weworkremotely,
+}
+
+# Pseudo-source naming every board in custom_job_boards
+CUSTOM_SOURCE = "custom"
+
+
+def custom_board_conflict(name: str, url: str = "") -> Optional[str]:
+    """Why a custom board can't be added as `name`, or None. Its source key
+    must not be empty, a built-in source, "custom" or another board's key.
+    Adding an existing board again is fine; it is reported as existing."""
+    from app.database import get_custom_job_boards
+
+    name = name.strip()
+    source = custom_board_source(name or url.strip())
+    if not source:
+        return "Board name needs letters or digits"
+    if source in SCRAPERS or source == CUSTOM_SOURCE:
+        return f"'{name}' is a reserved source name"
+    boards = get_custom_job_boards()
+    if any(board["name"] == name for board in boards):
+        return None
+    for board in boards:
+        if custom_board_source(board["name"] or board["url"]) == source:
+            return f"'{name}' is too close to the existing board '{board['name']}' (both are source '{source}')"
+    return None
+
+
+def _selected_boards(sources: Optional[set[str]]) -> dict[str, BoardSpec | Callable]:
+    """Built-in scrapers and custom boards to run: all of them when sources is None."""
+    from app.database import get_custom_job_boards
+
+    boards = {name: s for name, s in SCRAPERS.items() if sources is None or name in sources}
+    if sources is not None and not (sources - set(SCRAPERS)):
+        return boards
+    # Oldest first: boards added before names were checked keep their source
+    for board in reversed(get_custom_job_boards()):
+        spec = custom_board_spec(board)
+        if spec is None:
+            continue
+        if spec.name in SCRAPERS or spec.name == CUSTOM_SOURCE or spec.name in boards:
+            logger.warning("Custom board %s skipped: source %s is taken", board["name"], spec.name)
+            continue
+        if sources is None or CUSTOM_SOURCE in sources or spec.name in sources:
+            boards[spec.name] = spec
+    return boards
+
+
+async def scrape_all(
+    on_progress: Optional[Callable[[str, dict], None]] = None,
+    sources: Optional[Iterable[str]] = None,
+    incremental: Optional[bool] = None,
+    details: Optional[bool] = None,
+    budget: Optional[float] = None,
+    scan_id: Optional[str] = None,
+) -> dict[str, int]:
+    """Run the scrapers and custom boards (all, or just `sources`; "custom" selects
+    every custom board) and return counts of new jobs per source.
+
+    `on_progress(event, data)` is called as each source starts, for every newly
+    inserted job, when each source finishes or fails, and once the detail stage
+    is done, and when a source is skipped because its circuit breaker is open
+    (see app/breaker.py). Incremental scans (the default, see INCREMENTAL_SCAN) skip scoring
+    listings already stored. With `details` (default DETAIL_FETCH_ENABLED) the
+    sources' jobs with little card text and no description yet, new or left over
+    from earlier scans, get their detail page fetched and are rescored.
+
+    The scan stops after `budget` seconds (default SCAN_BUDGET_SECONDS) and each
+    source after SOURCE_BUDGET_SECONDS: in-flight requests are cancelled, the
+    jobs collected so far are stored, and source_done reports `truncated`.
+    Sources not reached in time emit source_skipped.
+
+    With a `scan_id` (a row started with start_scan_run) each source's requests,
+    bytes, status codes, stage timings and yield are stored for /api/scan-trends."""
+    from app.database import (
+        get_archived_external_ids, get_custom_keywords, get_known_external_ids, record_seen,
+        record_source_stats, upsert_job,
+    )
+    from app.details import jobs_needing_details
 
+    results: dict[str, int] = {}
+    emit = on_progress or (lambda event, data: None)
+    boards = _selected_boards(set(sources) if sources is not None else None)
+    if incremental is None:
+        incremental = INCREMENTAL_SCAN
+    if details is None:
+        details = DETAIL_FETCH_ENABLED
+    # Known ids feed query yield on every scan; only incremental scans skip them
+    known_ids = get_known_external_ids(set(boards))
+    known = known_ids if incremental else None
+    # Archived listings are never reinserted; checked here once, not per insert
+    archived = get_archived_external_ids(set(boards))
+    keywords = [k["keyword"] for k in get_custom_keywords()]
+    throttle = _Throttle()
+    loop = asyncio.get_running_loop()
+    scan_deadline = loop.time() + (budget if budget is not None else SCAN_BUDGET_SECONDS)
+
+    def record_source(name: str, status: str, stats: Optional[SourceStats] = None, **outcome):
+        if scan_id is not None:
+            record_source_stats(scan_id, name, {**(stats or SourceStats()).as_row(), "status": status, **outcome})
+
+    # One client for the whole scan, so connections to each board are reused
     async with httpx.AsyncClient(follow_redirects=True) as client:
-        scrapers = {
-            "indeed": scrape_indeed,
-            "iamexpat": scrape_iamexpat,
-            "undutchables": scrape_undutchables,
-            "linkedin": scrape_linkedin,
-            "adams": scrape_adams,
-            "welcometonl": scrape_welcome_to_nl,
-            "remoteok": scrape_remoteok,
-            "weworkremotely": scrape_weworkremotely,
-        }
-
-        for name, scraper_fn in scrapers.items():
+        for name, scraper in boards.items():
+            if loop.time() >= scan_deadline:
+                logger.warning("Skipping %s: scan budget spent", name)
+                results[name] = 0
+                emit("source_skipped", {"source": name, "reason": "out_of_time"})
+                record_source(name, "skipped", truncated=True, error="out of time")
+                continue
+            breaker = CircuitBreaker.load(name)
+            if not breaker.allow():
+                logger.info("Skipping %s: circuit open until %s (%s)", name, breaker.retry_at, breaker.last_error)
+                results[name] = 0
+                emit("source_skipped", {
+                    "source": name, "reason": "circuit_open",
+                    "retry_at": breaker.retry_at, "error": breaker.last_error,
+                })
+                record_source(name, "skipped", error=f"circuit open: {breaker.last_error}")
+                continue
+            # Requests go through the source's breaker, with retries on transient
+            # failures, and stop at whichever budget runs out first
+            source_client = SourceClient(
+                client, breaker, deadline=min(loop.time() + SOURCE_BUDGET_SECONDS, scan_deadline),
+            )
+            stats = source_client.stats
+            outcome = {"status": "failed", "found": 0, "new": 0, "error": None}
+            started = time.perf_counter()
             try:
                 logger.info("Scraping %s...", name)
-                raw_jobs = await scraper_fn(client)
+                emit("source_start", {"source": name})
+                plan = None
+                if isinstance(scraper, BoardSpec):
+                    if scraper.searchable:
+                        # Full scans run every query so skipped ones get re-measured
+                        plan = plan_queries(name, scraper.queries, keywords, known_ids, allow_skip=incremental)
+                    raw_jobs = await scrape_board(
+                        source_client, scraper, known=known, throttle=throttle, plan=plan, stats=stats,
+                    )
+                    if plan is not None:
+                        with stats.timing("write"):
+                            plan.save()
+                else:
+                    raw_jobs = await scraper(source_client)
+                    stats.parse_seconds = (
+                        time.perf_counter() - started - stats.fetch_seconds - source_client.waited
+                    )
                 new_count = 0
+                known_count = 0
                 for job in raw_jobs:
-                    sal = job.salary
-                    cat = classify_category(job.title, job.snippet or "")
-                    city = extract_city(job.location or "")
-                    ptype = detect_posting_type(job.company or "", job.source)
-                    dl = job.dutch_level
-                    wm = job.detected_work_model
-                    inserted = upsert_job(
-                        external_id=job.external_id,
-                        title=job.title,
-                        company=job.company,
-                        location=job.location,
-                        snippet=job.snippet,
-                        url=job.url,
-                        source=job.source,
-                        score=job.score,
-                        date_posted=job.date_posted,
-                        salary_min=sal["min"] if sal else None,
-                        salary_max=sal["max"] if sal else None,
-                        salary_raw=sal["raw"] if sal else None,
-                        category=cat,
-                        city=city,
-                        posting_type=ptype,
-                        dutch_level=dl,
-                        work_model=wm,
-                    )
-                    if inserted:
+                    if (known is not None and job.external_id in known) or job.external_id in archived:
+                        known_count += 1
+                        continue
+                    with stats.timing("score"):
+                        fields = _scored_fields(job)
+                        fields["city"] = extract_city(job.location or "")
+                        fields["posting_type"] = detect_posting_type(job.company or "", job.source)
+                    with stats.timing("write"):
+                        job_id = upsert_job(
+                            external_id=job.external_id,
+                            title=job.title,
+                            company=job.company,
+                            location=job.location,
+                            snippet=job.snippet,
+                            url=job.url,
+                            source=job.source,
+                            date_posted=job.date_posted,
+                            check_archive=False,
+                            **fields,
+                        )
+                    if job_id:
                         new_count += 1
+                        emit("job", {
+                            "source": name, "id": job_id, "title": job.title,
+                            "company": job.company, "score": fields["score"],
+                        })
                 results[name] = new_count
-                logger.info("  %s: %d jobs found, %d new", name, len(raw_jobs), new_count)
+                # Paginated sources that could stop early only vouch for the pages they read
+                with stats.timing("write"):
+                    liveness = record_seen(
+                        name, [job.external_id for job in raw_jobs],
+                        partial=known is not None and isinstance(scraper, BoardSpec) and scraper.stop_at_known,
+                        # Listings behind failed requests, or ones the breaker or budget
+                        # cut short, weren't looked for
+                        count_missed=not (source_client.truncated or source_client.failed)
+                        and breaker.state == "closed",
+                        # Nor those only the skipped queries return
+                        queries=list(plan.yields) if plan and plan.skipped else None,
+                    )
+                outcome.update(status="done", found=len(raw_jobs), new=new_count)
+                logger.info(
+                    "  %s: %d jobs found, %d new, %d known, %d closed%s",
+                    name, len(raw_jobs), new_count, known_count, liveness["closed"],
+                    " (out of time)" if source_client.truncated else "",
+                )
+                emit("source_done", {
+                    "source": name, "found": len(raw_jobs), "new": new_count,
+                    "known": known_count, "closed": liveness["closed"],
+                    "queries": len(plan.yields) if plan else None,
+                    "queries_skipped": len(plan.skipped) if plan else 0,
+                    "breaker": breaker.state,
+                    "truncated": source_client.truncated,
+                })
+            except DeadlineExceeded as e:
+                # Raised only by scrapers that don't keep partial results
+                logger.warning("Scraper %s: %s", name, e)
+                results[name] = 0
+                outcome.update(status="done", error=str(e))
+                emit("source_done", {
+                    "source": name, "found": 0, "new": 0, "breaker": breaker.state, "truncated": True,
+                })
             except Exception as e:
                 logger.error("Scraper %s failed: %s", name, e)
                 results[name] = 0
+                outcome["error"] = str(e)
+                emit("source_failed", {"source": name, "error": str(e)})
+            finally:
+                breaker.save()
+                record_source(
+                    name, stats=stats, total_seconds=round(time.perf_counter() - started, 4),
+                    truncated=source_client.truncated, **outcome,
+                )
+
+        if details:
+            try:
+                # From the database rather than this scan's inserts, so jobs an
+                # earlier scan had no budget or time for get their turn
+                pending = jobs_needing_details(boards)
+                if pending:
+                    await _enrich_details(client, pending, emit, deadline=scan_deadline)
+            except Exception as e:
+                logger.error("Detail enrichment failed: %s", e)
 
     return results
@@ -16,6 +16,9 @@ const activeFilters = {
 
 // Filter counts data
 let filterData = null;
+
+// Fit/commute/score enrichment per job id, fetched in one batch per page
+const enrichment = {};
 const isMobile = () => window.innerWidth <= 768;
 
 // Dutch filter — default 'hide_required', stored in cookie
@@ -198,10 +201,14 @@ async function loadJobs(append = false) {
     const search = document.getElementById("search-input").value.trim();
     const onlyNew = document.getElementById("toggle-new").checked;
     const sort = document.getElementById("sort-select").value;
+    const freshness = document.getElementById("freshness-select").value;
+    const maxKm = document.getElementById("distance-select").value;
 
-    const params = new URLSearchParams({ limit: PAGE_SIZE, offset: currentOffset, sort });
+    const params = new URLSearchParams({ limit: PAGE_SIZE, offset: currentOffset, sort, view: "card", collapse: "true" });
     if (search) params.set("search", search);
     if (onlyNew) params.set("only_new", "true");
+    if (freshness) params.set("max_age_days", freshness);
+    if (maxKm) params.set("max_km", maxKm);
     if (dutchFilter && dutchFilter !== "all") params.set("dutch_filter", dutchFilter);
     if (activeFilters.category) params.set("category", activeFilters.category);
     if (activeFilters.city) params.set("city", activeFilters.city);
@@ -228,6 +235,7 @@ async function loadJobs(append = false) {
 
     emptyState.style.display = "none";
     data.jobs.forEach(job => container.appendChild(createJobCard(job)));
+    prefetchEnrichment(data.jobs.map(job => job.id));
 
     const shown = currentOffset + data.jobs.length;
     loadMoreContainer.style.display = shown < currentTotal ? "block" : "none";
@@ -249,13 +257,15 @@ function mapsUrl(location) {
 
 // ——— Score breakdown popup ———
 
-function showScorePopup(job, event) {
+async function showScorePopup(job, event) {
     event.stopPropagation();
     const popup = document.getElementById("score-popup");
     const overlay = document.getElementById("score-popup-overlay");
     const body = document.getElementById("score-popup-body");
 
-    const breakdown = job.score_breakdown;
+    // Card payloads leave the breakdown to the batch enrichment prefetch
+    if (!job.score_breakdown && !enrichment[job.id]) await prefetchEnrichment([job.id]);
+    const breakdown = job.score_breakdown || (enrichment[job.id] || {}).score_breakdown;
     if (!breakdown || !breakdown.components) return;
 
     let html = '<ul class="score-breakdown-list">';
@@ -288,12 +298,15 @@ function createJobCard(job) {
     const sourceClass = `source-${job.source}`;
 
     // Salary display
+    // Amounts are normalised to monthly gross; hover shows the original wording
     let salaryHtml;
     if (job.salary_min && job.salary_max) {
+        const approx = job.salary_period && job.salary_period !== "month" ? "\u2248 " : "";
+        const rawTitle = job.salary_raw ? ` title="${escHtml(job.salary_raw)}"` : "";
         if (job.salary_min === job.salary_max) {
-            salaryHtml = `<div class="job-salary has-salary">\u20AC${job.salary_min.toLocaleString()}/month</div>`;
+            salaryHtml = `<div class="job-salary has-salary"${rawTitle}>${approx}\u20AC${job.salary_min.toLocaleString()}/month</div>`;
         } else {
-            salaryHtml = `<div class="job-salary has-salary">\u20AC${job.salary_min.toLocaleString()} \u2013 \u20AC${job.salary_max.toLocaleString()}/month</div>`;
+            salaryHtml = `<div class="job-salary has-salary"${rawTitle}>${approx}\u20AC${job.salary_min.toLocaleString()} \u2013 \u20AC${job.salary_max.toLocaleString()}/month</div>`;
         }
     } else {
         salaryHtml = `<div class="job-salary no-salary">${escHtml(t('salary-not-listed'))}</div>`;
@@ -346,6 +359,12 @@ function createJobCard(job) {
         dutchBadge = `<span class="badge-dutch-required">${escHtml(t('badge-dutch-required'))}</span>`;
     }
 
+    // Same vacancy listed on other boards (collapsed into this card)
+    let dupBadge = "";
+    if (job.cluster_size > 1) {
+        dupBadge = `<span class="badge-duplicates">${escHtml(t('badge-duplicates', { n: job.cluster_size - 1 }))}</span>`;
+    }
+
     // Work model badge
     let workModelBadge = "";
     if (job.work_model === "remote") {
@@ -366,12 +385,13 @@ function createJobCard(job) {
         </div>
         <div class="job-meta">
             ${job.company ? `<span>\uD83C\uDFE2 ${escHtml(job.company)}</span>` : ""}
-            ${job.location ? `<span>\uD83D\uDCCD ${escHtml(job.location)}</span>` : ""}
+            ${job.location ? `<span>\uD83D\uDCCD ${escHtml(job.location)}${job.distance_km != null ? ` (${job.distance_km} km)` : ""}</span>` : ""}
             ${ageHtml}
             ${typeBadge}
             ${categoryBadge}
             ${dutchBadge}
             ${workModelBadge}
+            ${dupBadge}
         </div>
         ${salaryHtml}
         ${commuteHtml}
@@ -410,6 +430,33 @@ function createJobCard(job) {
     return card;
 }
 
+// ——— Batch enrichment ———
+
+async function prefetchEnrichment(ids) {
+    const wanted = ids.filter(id => !enrichment[id]);
+    if (wanted.length === 0) return;
+    try {
+        const data = await api("/api/jobs/enrich", {
+            method: "POST",
+            headers: { "Content-Type": "application/json" },
+            body: JSON.stringify({ ids: wanted }),
+        });
+        Object.assign(enrichment, data.results || {});
+    } catch (err) {
+        // Cards fall back to the per-job /api/fit call
+    }
+}
+
+function renderFit(fitEl, fit) {
+    fitEl.innerHTML = `
+        <p class="job-fit-tagline">${escHtml(fit.tagline)}</p>
+        <ul class="job-fit-bullets">
+            ${fit.bullets.map(b => `<li>${escHtml(b)}</li>`).join("")}
+        </ul>
+    `;
+    fitEl.dataset.loaded = "1";
+}
+
 // ——— Toggle fit analysis ———
 
 async function toggleFit(job) {
@@ -425,6 +472,12 @@ async function toggleFit(job) {
         return;
     }
 
+    if (enrichment[job.id]) {
+        renderFit(fitEl, enrichment[job.id].fit);
+        fitEl.classList.add("open");
+        return;
+    }
+
     fitEl.innerHTML = `<p class="job-fit-loading">${escHtml(t('analysing-fit'))}</p>`;
     fitEl.classList.add("open");
 
@@ -434,14 +487,7 @@ async function toggleFit(job) {
             snippet: job.snippet || "",
             location: job.location || "",
         });
-        const data = await api(`/api/fit?${params}`);
-        fitEl.innerHTML = `
-            <p class="job-fit-tagline">${escHtml(data.tagline)}</p>
-            <ul class="job-fit-bullets">
-                ${data.bullets.map(b => `<li>${escHtml(b)}</li>`).join("")}
-            </ul>
-        `;
-        fitEl.dataset.loaded = "1";
+        renderFit(fitEl, await api(`/api/fit?${params}`));
     } catch (err) {
         fitEl.innerHTML = `<p class="job-fit-loading">${escHtml(t('fit-error'))}</p>`;
     }
@@ -454,7 +500,8 @@ async function saveJob(jobId) {
     const btn = document.getElementById(`save-${jobId}`);
     if (btn) {
         btn.classList.add("saved");
-        btn.textContent = data.status === "created" ? t('btn-saved') : t('btn-already-saved');
+        btn.textContent = data.status === "created" ? t('btn-saved')
+            : data.status === "archived" ? t('btn-archived') : t('btn-already-saved');
     }
 }
 
@@ -557,26 +604,65 @@ async function startScrape() {
     statusBar.style.display = "flex";
     statusText.textContent = t('scanning-text-8');
 
-    try {
-        const data = await api("/api/scrape", { method: "POST" });
-        if (data.status === "completed") {
-            const parts = Object.entries(data.results)
-                .map(([src, count]) => `${src}: ${t('scrape-new', { count: count })}`)
-                .join(", ");
-            statusText.textContent = t('scrape-done', { details: parts });
-        } else {
-            statusText.textContent = t('scrape-running');
-        }
-        loadStats();
-        loadFilters();
-        loadJobs();
-    } catch (err) {
-        statusText.textContent = t('scrape-error');
-    } finally {
+    const finish = (text) => {
+        statusText.textContent = text;
         btn.disabled = false;
         btn.classList.remove("spinning");
         setTimeout(() => { statusBar.style.display = "none"; }, 5000);
+    };
+
+    let data;
+    try {
+        data = await api("/api/scrape", { method: "POST" });
+    } catch (err) {
+        finish(t('scrape-error'));
+        return;
     }
+    // A scan already running (e.g. started in another tab) is followed the same way
+    if (!data.scan_id) {
+        finish(t('scrape-running'));
+        return;
+    }
+    followScan(data.scan_id, statusText, finish);
+}
+
+function followScan(scanId, statusText, finish) {
+    const counts = {};
+    const summary = () => Object.entries(counts)
+        .map(([src, count]) => `${src}: ${t('scrape-new', { count: count })}`)
+        .join(", ");
+    // New jobs land in the list as each source finishes, not after the slowest one
+    let refreshTimer = null;
+    const refresh = () => {
+        clearTimeout(refreshTimer);
+        refreshTimer = setTimeout(() => { loadStats(); loadFilters(); loadJobs(); }, 500);
+    };
+
+    const events = new EventSource(`/api/scans/${scanId}/events`);
+    events.addEventListener("source_start", (e) => {
+        const { source } = JSON.parse(e.data);
+        counts[source] = counts[source] || 0;
+        statusText.textContent = t('scrape-progress', { details: summary() });
+    });
+    events.addEventListener("job", (e) => {
+        const { source } = JSON.parse(e.data);
+        counts[source] = (counts[source] || 0) + 1;
+        statusText.textContent = t('scrape-progress', { details: summary() });
+    });
+    events.addEventListener("source_done", (e) => {
+        if (JSON.parse(e.data).new > 0) refresh();
+    });
+    events.addEventListener("done", (e) => {
+        events.close();
+        const { status, results } = JSON.parse(e.data);
+        Object.assign(counts, results);
+        refresh();
+        finish(status === "completed" ? t('scrape-done', { details: summary() }) : t('scrape-error'));
+    });
+    events.onerror = () => {
+        // The browser reconnects on its own; give up only once the stream is closed
+        if (events.readyState === EventSource.CLOSED) finish(t('scrape-error'));
+    };
 }
 
 async function hideJob(jobId) {
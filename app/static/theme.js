@@ -36,10 +36,22 @@ const TRANSLATIONS = {
         'sort-newest': 'Newest first',
         'sort-score': 'Best match',
         'sort-oldest': 'Oldest first',
+        'fresh-any': 'Any time',
+        'fresh-1': 'Past 24 hours',
+        'fresh-3': 'Past 3 days',
+        'fresh-7': 'Past week',
+        'fresh-14': 'Past 2 weeks',
+        'dist-any': 'Any distance',
+        'dist-5': 'Within 5 km',
+        'dist-10': 'Within 10 km',
+        'dist-15': 'Within 15 km',
+        'dist-25': 'Within 25 km',
+        'sort-distance': 'Nearest first',
         'btn-load-more': 'Load more',
         'btn-save': 'Save',
         'btn-saved': 'Saved!',
         'btn-already-saved': 'Already saved',
+        'btn-archived': 'Archived',
         'btn-hide': 'Hide',
         'btn-view': 'View \u2192',
         'salary-not-listed': 'Salary not listed',
@@ -49,12 +61,14 @@ const TRANSLATIONS = {
         'analysing-fit': 'Analysing fit...',
         'fit-error': 'Could not load analysis.',
         'posted-on': 'Posted on {source}',
+        'badge-duplicates': '+{n} more listings',
         'empty-title': 'No jobs yet',
         'empty-text': 'Click <strong>Scan for Jobs</strong> to search all job boards.',
         'scanning-text': 'Scanning 6 job boards... this may take a minute.',
         'scanning-text-8': 'Scanning 8 job boards... this may take a minute.',
         'scrape-done': 'Done! {details}',
         'scrape-running': 'Scrape is already running.',
+        'scrape-progress': 'Scanning... {details}',
         'scrape-error': 'Error scanning. Try again later.',
         'scrape-new': '{count} new',
         'col-interested': 'Interested',
@@ -147,10 +161,22 @@ const TRANSLATIONS = {
         'sort-newest': '\u0421\u043D\u0430\u0447\u0430\u043B\u0430 \u043D\u043E\u0432\u044B\u0435',
         'sort-score': '\u041B\u0443\u0447\u0448\u0435\u0435 \u0441\u043E\u0432\u043F\u0430\u0434\u0435\u043D\u0438\u0435',
         'sort-oldest': '\u0421\u043D\u0430\u0447\u0430\u043B\u0430 \u0441\u0442\u0430\u0440\u044B\u0435',
+        'fresh-any': '\u041B\u044E\u0431\u0430\u044F \u0434\u0430\u0442\u0430',
+        'fresh-1': '\u0417\u0430 24 \u0447\u0430\u0441\u0430',
+        'fresh-3': '\u0417\u0430 3 \u0434\u043D\u044F',
+        'fresh-7': '\u0417\u0430 \u043D\u0435\u0434\u0435\u043B\u044E',
+        'fresh-14': '\u0417\u0430 2 \u043D\u0435\u0434\u0435\u043B\u0438',
+        'dist-any': '\u041B\u044E\u0431\u043E\u0435 \u0440\u0430\u0441\u0441\u0442\u043E\u044F\u043D\u0438\u0435',
+        'dist-5': '\u0414\u043E 5 \u043A\u043C',
+        'dist-10': '\u0414\u043E 10 \u043A\u043C',
+        'dist-15': '\u0414\u043E 15 \u043A\u043C',
+        'dist-25': '\u0414\u043E 25 \u043A\u043C',
+        'sort-distance': '\u0421\u043D\u0430\u0447\u0430\u043B\u0430 \u0431\u043B\u0438\u0436\u0430\u0439\u0448\u0438\u0435',
         'btn-load-more': '\u0417\u0430\u0433\u0440\u0443\u0437\u0438\u0442\u044C \u0435\u0449\u0451',
         'btn-save': '\u0421\u043E\u0445\u0440\u0430\u043D\u0438\u0442\u044C',
         'btn-saved': '\u0421\u043E\u0445\u0440\u0430\u043D\u0435\u043D\u043E!',
         'btn-already-saved': '\u0423\u0436\u0435 \u0441\u043E\u0445\u0440\u0430\u043D\u0435\u043D\u043E',
+        'btn-archived': '\u0412 \u0430\u0440\u0445\u0438\u0432\u0435',
         'btn-hide': '\u0421\u043A\u0440\u044B\u0442\u044C',
         'btn-view': '\u0421\u043C\u043E\u0442\u0440\u0435\u0442\u044C \u2192',
         'salary-not-listed': '\u0417\u0430\u0440\u043F\u043B\u0430\u0442\u0430 \u043D\u0435 \u0443\u043A\u0430\u0437\u0430\u043D\u0430',
@@ -160,12 +186,14 @@ const TRANSLATIONS = {
         'analysing-fit': '\u0410\u043D\u0430\u043B\u0438\u0437\u0438\u0440\u0443\u0435\u043C...',
         'fit-error': '\u041D\u0435 \u0443\u0434\u0430\u043B\u043E\u0441\u044C \u0437\u0430\u0433\u0440\u0443\u0437\u0438\u0442\u044C \u0430\u043D\u0430\u043B\u0438\u0437.',
         'posted-on': '\u0420\u0430\u0437\u043C\u0435\u0449\u0435\u043D\u043E \u043D\u0430 {source}',
+        'badge-duplicates': '+{n} \u043F\u043E\u0445\u043E\u0436\u0438\u0445',
         'empty-title': '\u041F\u043E\u043A\u0430 \u043D\u0435\u0442 \u0432\u0430\u043A\u0430\u043D\u0441\u0438\u0439',
         'empty-text': '\u041D\u0430\u0436\u043C\u0438\u0442\u0435 <strong>\u041F\u043E\u0438\u0441\u043A \u0432\u0430\u043A\u0430\u043D\u0441\u0438\u0439</strong>, \u0447\u0442\u043E\u0431\u044B \u043D\u0430\u0439\u0442\u0438 \u0440\u0430\u0431\u043E\u0442\u0443 \u043D\u0430 \u0432\u0441\u0435\u0445 \u0441\u0430\u0439\u0442\u0430\u0445.',
         'scanning-text': '\u0421\u043A\u0430\u043D\u0438\u0440\u0443\u0435\u043C 6 \u0441\u0430\u0439\u0442\u043E\u0432 \u0441 \u0432\u0430\u043A\u0430\u043D\u0441\u0438\u044F\u043C\u0438... \u044D\u0442\u043E \u043C\u043E\u0436\u0435\u0442 \u0437\u0430\u043D\u044F\u0442\u044C \u043C\u0438\u043D\u0443\u0442\u0443.',
         'scanning-text-8': '\u0421\u043A\u0430\u043D\u0438\u0440\u0443\u0435\u043C 8 \u0441\u0430\u0439\u0442\u043E\u0432 \u0441 \u0432\u0430\u043A\u0430\u043D\u0441\u0438\u044F\u043C\u0438... \u044D\u0442\u043E \u043C\u043E\u0436\u0435\u0442 \u0437\u0430\u043D\u044F\u0442\u044C \u043C\u0438\u043D\u0443\u0442\u0443.',
         'scrape-done': '\u0413\u043E\u0442\u043E\u0432\u043E! {details}',
         'scrape-running': '\u041F\u043E\u0438\u0441\u043A \u0443\u0436\u0435 \u0437\u0430\u043F\u0443\u0449\u0435\u043D.',
+        'scrape-progress': '\u041F\u043E\u0438\u0441\u043A... {details}',
         'scrape-error': '\u041E\u0448\u0438\u0431\u043A\u0430 \u0441\u043A\u0430\u043D\u0438\u0440\u043E\u0432\u0430\u043D\u0438\u044F. \u041F\u043E\u043F\u0440\u043E\u0431\u0443\u0439\u0442\u0435 \u043F\u043E\u0437\u0436\u0435.',
         'scrape-new': '{count} \u043D\u043E\u0432\u044B\u0445',
         'col-interested': '\u0418\u043D\u0442\u0435\u0440\u0435\u0441\u043D\u043E',
@@ -258,10 +286,22 @@ const TRANSLATIONS = {
         'sort-newest': '\u0421\u043F\u043E\u0447\u0430\u0442\u043A\u0443 \u043D\u043E\u0432\u0456',
         'sort-score': '\u041D\u0430\u0439\u043A\u0440\u0430\u0449\u0438\u0439 \u0437\u0431\u0456\u0433',
         'sort-oldest': '\u0421\u043F\u043E\u0447\u0430\u0442\u043A\u0443 \u0441\u0442\u0430\u0440\u0456',
+        'fresh-any': '\u0411\u0443\u0434\u044C-\u044F\u043A\u0430 \u0434\u0430\u0442\u0430',
+        'fresh-1': '\u0417\u0430 24 \u0433\u043E\u0434\u0438\u043D\u0438',
+        'fresh-3': '\u0417\u0430 3 \u0434\u043D\u0456',
+        'fresh-7': '\u0417\u0430 \u0442\u0438\u0436\u0434\u0435\u043D\u044C',
+        'fresh-14': '\u0417\u0430 2 \u0442\u0438\u0436\u043D\u0456',
+        'dist-any': '\u0411\u0443\u0434\u044C-\u044F\u043A\u0430 \u0432\u0456\u0434\u0441\u0442\u0430\u043D\u044C',
+        'dist-5': '\u0414\u043E 5 \u043A\u043C',
+        'dist-10': '\u0414\u043E 10 \u043A\u043C',
+        'dist-15': '\u0414\u043E 15 \u043A\u043C',
+        'dist-25': '\u0414\u043E 25 \u043A\u043C',
+        'sort-distance': '\u0421\u043F\u043E\u0447\u0430\u0442\u043A\u0443 \u043D\u0430\u0439\u0431\u043B\u0438\u0436\u0447\u0456',
         'btn-load-more': '\u0417\u0430\u0432\u0430\u043D\u0442\u0430\u0436\u0438\u0442\u0438 \u0449\u0435',
         'btn-save': '\u0417\u0431\u0435\u0440\u0435\u0433\u0442\u0438',
         'btn-saved': '\u0417\u0431\u0435\u0440\u0435\u0436\u0435\u043D\u043E!',
         'btn-already-saved': '\u0412\u0436\u0435 \u0437\u0431\u0435\u0440\u0435\u0436\u0435\u043D\u043E',
+        'btn-archived': '\u0412 \u0430\u0440\u0445\u0456\u0432\u0456',
         'btn-hide': '\u041F\u0440\u0438\u0445\u043E\u0432\u0430\u0442\u0438',
         'btn-view': '\u0414\u0438\u0432\u0438\u0442\u0438\u0441\u044C \u2192',
         'salary-not-listed': '\u0417\u0430\u0440\u043F\u043B\u0430\u0442\u0430 \u043D\u0435 \u0432\u043A\u0430\u0437\u0430\u043D\u0430',
@@ -271,12 +311,14 @@ const TRANSLATIONS = {
         'analysing-fit': '\u0410\u043D\u0430\u043B\u0456\u0437\u0443\u0454\u043C\u043E...',
         'fit-error': '\u041D\u0435 \u0432\u0434\u0430\u043B\u043E\u0441\u044F \u0437\u0430\u0432\u0430\u043D\u0442\u0430\u0436\u0438\u0442\u0438 \u0430\u043D\u0430\u043B\u0456\u0437.',
         'posted-on': '\u0420\u043E\u0437\u043C\u0456\u0449\u0435\u043D\u043E \u043D\u0430 {source}',
+        'badge-duplicates': '+{n} \u0441\u0445\u043E\u0436\u0438\u0445',
         'empty-title': '\u041F\u043E\u043A\u0438 \u043D\u0435\u043C\u0430\u0454 \u0432\u0430\u043A\u0430\u043D\u0441\u0456\u0439',
         'empty-text': '\u041D\u0430\u0442\u0438\u0441\u043D\u0456\u0442\u044C <strong>\u041F\u043E\u0448\u0443\u043A \u0432\u0430\u043A\u0430\u043D\u0441\u0456\u0439</strong>, \u0449\u043E\u0431 \u0437\u043D\u0430\u0439\u0442\u0438 \u0440\u043E\u0431\u043E\u0442\u0443 \u043D\u0430 \u0432\u0441\u0456\u0445 \u0441\u0430\u0439\u0442\u0430\u0445.',
         'scanning-text': '\u0421\u043A\u0430\u043D\u0443\u0454\u043C\u043E 6 \u0441\u0430\u0439\u0442\u0456\u0432 \u0437 \u0432\u0430\u043A\u0430\u043D\u0441\u0456\u044F\u043C\u0438... \u0446\u0435 \u043C\u043E\u0436\u0435 \u0437\u0430\u0439\u043D\u044F\u0442\u0438 \u0445\u0432\u0438\u043B\u0438\u043D\u0443.',
         'scanning-text-8': '\u0421\u043A\u0430\u043D\u0443\u0454\u043C\u043E 8 \u0441\u0430\u0439\u0442\u0456\u0432 \u0437 \u0432\u0430\u043A\u0430\u043D\u0441\u0456\u044F\u043C\u0438... \u0446\u0435 \u043C\u043E\u0436\u0435 \u0437\u0430\u0439\u043D\u044F\u0442\u0438 \u0445\u0432\u0438\u043B\u0438\u043D\u0443.',
         'scrape-done': '\u0413\u043E\u0442\u043E\u0432\u043E! {details}',
         'scrape-running': '\u041F\u043E\u0448\u0443\u043A \u0432\u0436\u0435 \u0437\u0430\u043F\u0443\u0449\u0435\u043D\u043E.',
+        'scrape-progress': '\u041F\u043E\u0448\u0443\u043A... {details}',
         'scrape-error': '\u041F\u043E\u043C\u0438\u043B\u043A\u0430 \u0441\u043A\u0430\u043D\u0443\u0432\u0430\u043D\u043D\u044F. \u0421\u043F\u0440\u043E\u0431\u0443\u0439\u0442\u0435 \u043F\u0456\u0437\u043D\u0456\u0448\u0435.',
         'scrape-new': '{count} \u043D\u043E\u0432\u0438\u0445',
         'col-interested': '\u0426\u0456\u043A\u0430\u0432\u043E',
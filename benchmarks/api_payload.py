@@ -0,0 +1,81 @@
+"""Serialization time and bytes on the wire for a 500-job /api/jobs page.
+
+Builds a synthetic page shaped like the real response (full rows, snippet,
+nested score_breakdown) and compares FastAPI's default encoder path with
+orjson, plus gzip at the configured level.
+
+    python -m benchmarks.api_payload
+"""
+
+import gzip
+import json
+import random
+import time
+
+import orjson
+from fastapi.encoders import jsonable_encoder
+
+from app.config import GZIP_LEVEL
+from app.scorer import enrich_job
+
+PAGE_SIZE = 500
+ROUNDS = 20
+
+_TITLES = ["Accountant", "Junior Bookkeeper", "Accounts Payable Specialist", "Office Administrator",
+           "Customer Service Agent (English)", "Back Office Medewerker", "Payroll Administrator"]
+_CITIES = ["Haarlem", "Amsterdam", "Hoofddorp", "Leiden", "Schiphol", "Amstelveen", "Zaandam"]
+
+
+def build_page(rng: random.Random) -> dict:
+    jobs = []
+    for i in range(PAGE_SIZE):
+        title = rng.choice(_TITLES)
+        city = rng.choice(_CITIES)
+        snippet = " ".join(rng.choice(["english", "team", "invoices", "experience", "international",
+                                       "finance", "support", "hybrid", "salary", "growth"]) for _ in range(60))
+        jobs.append({
+            "id": i + 1, "external_id": f"{i:032x}", "title": title, "company": f"Company {i % 40}",
+            "location": f"{city}, Noord-Holland", "snippet": snippet, "url": f"https://example.com/jobs/{i}",
+            "source": rng.choice(["iamexpat", "linkedin", "adams"]), "score": rng.randint(20, 150),
+            "salary_min": 3000, "salary_max": 3800, "salary_raw": "€3.000 - €3.800", "salary_period": "month",
+            "date_posted": "2 days ago", "posted_at": "2026-10-17T10:00:00+00:00",
+            "date_scraped": "2026-10-19T10:00:00.123456+00:00", "is_new": 1, "is_hidden": 0,
+            "category": "Finance & Accounting", "city": city, "posting_type": "direct",
+            "dutch_level": "english_ok", "work_model": "hybrid", "lat": 52.38, "lng": 4.64, "distance_km": 3.2,
+            "age_days": 2, "posting_age_text": "2 days ago", "posting_age_color": "green",
+            "score_breakdown": enrich_job(title, "", city, snippet, "english_ok")["score_breakdown"],
+        })
+    return {"jobs": jobs, "total": 1234}
+
+
+def stdlib_render(page: dict) -> bytes:
+    # What JSONResponse does for a plain dict returned from an endpoint
+    return json.dumps(jsonable_encoder(page), ensure_ascii=False, allow_nan=False,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def orjson_render(page: dict) -> bytes:
+    return orjson.dumps(page, option=orjson.OPT_NON_STR_KEYS)
+
+
+def timed(fn, *args) -> tuple[float, bytes]:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        out = fn(*args)
+    return (time.perf_counter() - start) / ROUNDS * 1000, out
+
+
+def main():
+    page = build_page(random.Random(7))
+    print(f"{PAGE_SIZE}-job page, {ROUNDS} rounds")
+    for name, fn in (("jsonable_encoder + json", stdlib_render), ("orjson", orjson_render)):
+        ms, body = timed(fn, page)
+        print(f"  {name:<24} {ms:7.2f} ms   {len(body):>9,} bytes")
+    body = orjson_render(page)
+    gz_ms, gz = timed(gzip.compress, body, GZIP_LEVEL)
+    print(f"  gzip level {GZIP_LEVEL:<13} {gz_ms:7.2f} ms   {len(gz):>9,} bytes on the wire "
+          f"({len(gz) / len(body):.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Accuracy and speed benchmark for Dutch language detection.
+
+Runs the labeled fixture corpus through the previous word-loop detector and the
+current single-pass detector (with and without the trigram model).
+
+    python -m benchmarks.dutch_detection
+"""
+
+import json
+import time
+from pathlib import Path
+
+from app.config import (
+    DUTCH_WORDS,
+    DUTCH_WORD_THRESHOLD_TITLE,
+    DUTCH_WORD_THRESHOLD_BODY,
+    DUTCH_PREFERRED_SIGNALS,
+    EXCLUDE_KEYWORDS,
+)
+from app.scorer import _WORD_SPLIT, detect_dutch
+
+CORPUS = Path(__file__).parent / "fixtures" / "dutch_corpus.jsonl"
+ROUNDS = 200
+
+
+def _legacy_count(text: str) -> int:
+    words = set(_WORD_SPLIT.split(text.lower()))
+    text_lower = text.lower()
+    hits = 0
+    for dw in DUTCH_WORDS:
+        if " " in dw:
+            if dw in text_lower:
+                hits += 1
+        elif dw in words:
+            hits += 1
+    return hits
+
+
+def _legacy_detect(title: str, description: str = "") -> str:
+    """The detector as it was before the single-pass rewrite (reference only)."""
+    desc_lower = (description or "").lower()
+    combined = f"{title.lower()} {desc_lower}"
+    for kw in EXCLUDE_KEYWORDS:
+        if any(m in kw for m in ("dutch", "nederland", "vloeiend", "taaleis", "beheersing")) and kw in combined:
+            return "dutch_required"
+    title_hits = _legacy_count(title)
+    if title_hits >= DUTCH_WORD_THRESHOLD_TITLE:
+        return "dutch_required"
+    body_hits = _legacy_count(description) if description else 0
+    if description:
+        words = set(_WORD_SPLIT.split(desc_lower))
+        dutch_pct = body_hits / max(len([w for w in words if len(w) > 2]), 1) * 100
+    else:
+        dutch_pct = 0
+    if dutch_pct > 30 or body_hits >= DUTCH_WORD_THRESHOLD_BODY or (title_hits >= 1 and body_hits >= 3):
+        return "dutch_required"
+    if any(s in combined for s in DUTCH_PREFERRED_SIGNALS):
+        return "dutch_preferred"
+    if dutch_pct > 10 or body_hits >= 3:
+        return "dutch_preferred"
+    return "english_ok"
+
+
+def load_corpus() -> list[dict]:
+    with CORPUS.open(encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def run(name: str, fn, corpus: list[dict]) -> dict:
+    correct = sum(1 for row in corpus if fn(row["title"], row["description"]) == row["label"])
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for row in corpus:
+            fn(row["title"], row["description"])
+    elapsed = time.perf_counter() - start
+    return {
+        "detector": name,
+        "accuracy": round(correct / len(corpus), 3),
+        "us_per_call": round(elapsed / (ROUNDS * len(corpus)) * 1e6, 2),
+    }
+
+
+def main():
+    corpus = load_corpus()
+    # Bypass the lru_cache so every call does the full work
+    uncached = detect_dutch.__wrapped__
+    results = [
+        run("legacy word loop", _legacy_detect, corpus),
+        run("single pass", lambda t, d: uncached(t, d, False).label, corpus),
+        run("single pass + trigrams", lambda t, d: uncached(t, d, True).label, corpus),
+    ]
+    print(f"{len(corpus)} labeled samples, {ROUNDS} rounds")
+    for r in results:
+        print(f"  {r['detector']:<24} accuracy {r['accuracy']:.3f}   {r['us_per_call']:>8.2f} us/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Accuracy, fuzz and speed benchmark for salary extraction.
+
+Checks the labeled corpus against the previous four-regex extractor and the
+current single-scan extractor, then fuzzes the extractor with generated salary
+phrases embedded in noise and reports per-call time.
+
+    python -m benchmarks.salary_extraction
+"""
+
+import json
+import random
+import re
+import time
+from pathlib import Path
+
+from app.scorer import extract_salary
+
+CORPUS = Path(__file__).parent / "fixtures" / "salary_corpus.jsonl"
+ROUNDS = 500
+FUZZ_CASES = 5000
+
+_LEGACY_NUM = r"(\d[\d.,]*\d|\d+)"
+_LEGACY_PATTERNS = [
+    re.compile(r"(?:€|EUR)\s*" + _LEGACY_NUM + r"\s*[-–—to]+\s*(?:€|EUR)?\s*" + _LEGACY_NUM, re.IGNORECASE),
+    re.compile(_LEGACY_NUM + r"\s*[-–—to]+\s*" + _LEGACY_NUM + r"\s*(?:euro|eur|per\s+m)", re.IGNORECASE),
+    re.compile(r"(?:€|EUR)\s*" + _LEGACY_NUM, re.IGNORECASE),
+    re.compile(r"salary[:\s]+(\d{3,6})", re.IGNORECASE),
+]
+
+
+def _legacy_extract(text: str):
+    """The extractor as it was before the single-scan rewrite (reference only)."""
+    for pat in _LEGACY_PATTERNS:
+        m = pat.search(text)
+        if m:
+            vals = [int(g.replace(".", "").replace(",", "")) for g in m.groups()]
+            if all(500 <= v <= 20000 for v in vals):
+                return {"min": vals[0], "max": vals[-1], "period": "month"}
+    return None
+
+
+def _matches(got, expected) -> bool:
+    if expected is None or got is None:
+        return got is None and expected is None
+    return all(got[k] == expected[k] for k in ("min", "max", "period"))
+
+
+_NOISE = [
+    "We are looking for an accountant.", "Hybrid, 2 days office.", "Founded in 1998.",
+    "Team of 25.", "Apply before 1 March.", "English speaking environment.", "32-40 hours.",
+]
+_TEMPLATES = [
+    ("€{lo} - €{hi} per month", "month"), ("€{lo}/hour", "hour"),
+    ("EUR {lo}k - {hi}k per year", "year"), ("salary: {lo}", "month"),
+    ("€{lo} per uur", "hour"), ("{lo} - {hi} euro bruto per maand", "month"),
+]
+_RANGES = {"month": (1800, 6000), "hour": (14, 40), "year": (25, 80)}
+
+
+def fuzz(rng: random.Random) -> dict:
+    """Generated salary phrases in noise: extractor must not crash, must keep
+    min <= max within bounds, and must recover the generated period."""
+    failures = 0
+    for _ in range(FUZZ_CASES):
+        template, period = rng.choice(_TEMPLATES)
+        lo = rng.randint(*_RANGES[period])
+        hi = lo + rng.randint(0, _RANGES[period][0] // 4)
+        phrase = template.format(lo=f"{lo:,}".replace(",", rng.choice([".", ",", ""])), hi=hi)
+        parts = rng.sample(_NOISE, 3) + [phrase]
+        rng.shuffle(parts)
+        got = extract_salary(" ".join(parts))
+        if not got or got["period"] != period or not (500 <= got["min"] <= got["max"] <= 20000):
+            failures += 1
+    return {"cases": FUZZ_CASES, "failures": failures}
+
+
+def timeit(fn, texts: list[str]) -> float:
+    start = time.perf_counter()
+    for _ in range(ROUNDS):
+        for t in texts:
+            fn(t)
+    return (time.perf_counter() - start) / (ROUNDS * len(texts)) * 1e6
+
+
+def main():
+    with CORPUS.open(encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+    texts = [row["text"] for row in corpus]
+
+    print(f"{len(corpus)} labeled samples")
+    for name, fn in (("legacy four regexes", _legacy_extract), ("single scan", extract_salary)):
+        correct = sum(1 for row in corpus if _matches(fn(row["text"]), row["expected"]))
+        print(f"  {name:<20} accuracy {correct / len(corpus):.3f}   {timeit(fn, texts):>7.2f} us/call")
+
+    result = fuzz(random.Random(42))
+    print(f"fuzz: {result['cases']} generated cases, {result['failures']} failures")
+    for row in corpus:
+        got = extract_salary(row["text"])
+        if not _matches(got, row["expected"]):
+            print(f"  MISMATCH {row['text']!r}: got {got}, expected {row['expected']}")
+
+
+if __name__ == "__main__":
+    main()
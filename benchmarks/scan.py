@@ -0,0 +1,334 @@
+"""End-to-end scan benchmark against recorded pages served locally.
+
+Serves the fixture pages in fixtures/scan/ from a local HTTP server, points
+every built-in source (IamExpat, Undutchables, LinkedIn, Adams, Remote OK, We
+Work Remotely) at it with delays off, and runs scrape_all into a fresh
+database per round, detail stage included. No network is touched.
+
+Each listing page gets its own job links ("__PAGE__" in a fixture is replaced
+by a hash of the requested URL), so every query yields new listings as it would
+live, and "__BASE__" by the server's address. Every other path serves the
+detail page.
+
+Reports total scan time, time per stage (fetch, parse, score, write, details)
+and per source, jobs per second and peak memory as JSON, one file per commit.
+With --compare the run is checked against an earlier report and exits 1 when
+the scan or a stage got slower than --threshold allows.
+
+    python -m benchmarks.scan
+    python -m benchmarks.scan --compare benchmarks/results/scan-<commit>.json
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import platform
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from dataclasses import replace
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from unittest import mock
+from urllib.parse import urlsplit
+
+from app import database, details, scrapers
+from app.config import DETAIL_MAX_PER_SCAN
+
+FIXTURES = Path(__file__).parent / "fixtures" / "scan"
+RESULTS = Path(__file__).parent / "results"
+ROUNDS = 5
+THRESHOLD = 0.2
+
+# Source -> (fixture, content type); the source name prefixes its listing paths
+PAGES = {
+    "iamexpat": ("iamexpat.html", "text/html; charset=utf-8"),
+    "undutchables": ("undutchables.html", "text/html; charset=utf-8"),
+    "linkedin": ("linkedin.html", "text/html; charset=utf-8"),
+    "adams": ("adams.html", "text/html; charset=utf-8"),
+    "remoteok": ("remoteok.json", "application/json"),
+    "weworkremotely": ("weworkremotely.rss", "application/rss+xml; charset=utf-8"),
+}
+DETAIL_PAGE = ("detail.html", "text/html; charset=utf-8")
+SOURCES = tuple(PAGES)
+STAGES = ("fetch", "parse", "score", "write")
+
+
+# --------------------------------------------------------------------------
+# Fixture server
+# --------------------------------------------------------------------------
+
+class _FixtureHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, as the boards serve it
+    # Headers and body go out in separate writes: without this each response
+    # waits out the client's delayed ACK
+    disable_nagle_algorithm = True
+    templates: dict[str, tuple[bytes, str]] = {}
+    base = ""
+
+    def do_GET(self):
+        source = self.path.split("/")[1]
+        body, content_type = self.templates.get(source) or self.templates["detail"]
+        page = hashlib.md5(self.path.encode()).hexdigest()[:8]
+        body = body.replace(b"__BASE__", self.base.encode()).replace(b"__PAGE__", page.encode())
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server() -> ThreadingHTTPServer:
+    """Serve the fixtures on a free local port from a daemon thread."""
+    templates = {"detail": ((FIXTURES / DETAIL_PAGE[0]).read_bytes(), DETAIL_PAGE[1])}
+    for source, (name, content_type) in PAGES.items():
+        templates[source] = ((FIXTURES / name).read_bytes(), content_type)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _FixtureHandler)
+    server.daemon_threads = True
+    _FixtureHandler.templates = templates
+    _FixtureHandler.base = f"http://127.0.0.1:{server.server_port}"
+    threading.Thread(target=server.serve_forever, name="fixtures", daemon=True).start()
+    return server
+
+
+def _local(base: str, source: str, url: str) -> str:
+    parts = urlsplit(url)
+    return f"{base}/{source}{parts.path}" + (f"?{parts.query}" if parts.query else "")
+
+
+def local_sources(base: str) -> list:
+    """Patches pointing every benchmarked source at the fixture server, delays off."""
+    boards = {
+        name: replace(
+            spec, url=_local(base, name, spec.url), pages=tuple(_local(base, name, u) for u in spec.pages),
+            referer="", delay=(0.0, 0.0),
+        )
+        for name, spec in scrapers.SCRAPERS.items()
+        if isinstance(spec, scrapers.BoardSpec)
+    }
+
+    async def no_delay(client=None):
+        pass
+
+    return [
+        mock.patch.dict(scrapers.SCRAPERS, boards),
+        mock.patch.object(scrapers, "REMOTEOK_API_URL", _local(base, "remoteok", scrapers.REMOTEOK_API_URL)),
+        mock.patch.object(scrapers, "WWR_FEEDS", tuple(_local(base, "weworkremotely", u) for u in scrapers.WWR_FEEDS)),
+        mock.patch.object(scrapers, "_delay", no_delay),
+        mock.patch.object(details, "_delay", no_delay),
+    ]
+
+
+# --------------------------------------------------------------------------
+# Rounds
+# --------------------------------------------------------------------------
+
+def run_scan(directory: str, n: int) -> dict:
+    """One scan of every source into a fresh database."""
+    os.environ["DATABASE_PATH"] = os.path.join(directory, f"round-{n}.db")
+    database.init_db()
+    scan_id = f"bench-{n}"
+    database.start_scan_run(scan_id, "benchmark")
+    marks: dict[str, float] = {}
+
+    def on_progress(event: str, data: dict):
+        if event in ("source_done", "source_failed", "source_skipped"):
+            marks["sources_done"] = time.perf_counter()
+        elif event == "details_done":
+            marks["details_done"] = time.perf_counter()
+            marks["details"] = data
+
+    start = time.perf_counter()
+    asyncio.run(scrapers.scrape_all(on_progress, sources=SOURCES, incremental=True, details=True, scan_id=scan_id))
+    seconds = time.perf_counter() - start
+    database.finish_scan_run(scan_id, "done", seconds)
+
+    with database.get_db() as conn:
+        rows = [dict(r) for r in conn.execute("SELECT * FROM scan_source_stats WHERE scan_id = ?", (scan_id,))]
+    sources = {}
+    for row in rows:
+        sources[row["source"]] = {
+            "status": row["status"],
+            "requests": row["requests"],
+            "bytes": row["bytes"],
+            "found": row["found"],
+            "new": row["new"],
+            "seconds": row["total_seconds"],
+            **{stage: row[f"{stage}_seconds"] for stage in STAGES},
+        }
+    stages = {stage: sum(s[stage] for s in sources.values()) for stage in STAGES}
+    stages["details"] = marks["details_done"] - marks["sources_done"] if "details_done" in marks else 0.0
+    return {
+        "seconds": seconds,
+        "found": sum(s["found"] for s in sources.values()),
+        "new": sum(s["new"] for s in sources.values()),
+        "stages": stages,
+        "sources": sources,
+        "details": marks.get("details", {}),
+    }
+
+
+def _summary(values: list[float]) -> dict:
+    return {
+        "median": round(statistics.median(values), 4),
+        "min": round(min(values), 4),
+        "max": round(max(values), 4),
+    }
+
+
+def _median(values: list[float]) -> float:
+    return round(statistics.median(values), 4)
+
+
+def benchmark(rounds: int) -> dict:
+    server = start_server()
+    patches = local_sources(_FixtureHandler.base)
+    for patch in patches:
+        patch.start()
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            run_scan(directory, 0)  # warm-up: imports, lru caches, the parse pool
+            runs = [run_scan(directory, n) for n in range(1, rounds + 1)]
+            # Tracing allocations slows the scan: a round of its own, not timed
+            tracemalloc.start()
+            run_scan(directory, rounds + 1)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    finally:
+        for patch in reversed(patches):
+            patch.stop()
+        server.shutdown()
+
+    # Every round scans the same pages into an empty database: counts don't vary
+    found, new = runs[0]["found"], runs[0]["new"]
+    seconds = _summary([r["seconds"] for r in runs])
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return {
+        "rounds": rounds,
+        "scan": {
+            "seconds": seconds,
+            "found": found,
+            "new": new,
+            "found_per_second": round(found / seconds["median"], 1),
+            "new_per_second": round(new / seconds["median"], 1),
+        },
+        "stages": {stage: _summary([r["stages"][stage] for r in runs]) for stage in (*STAGES, "details")},
+        "sources": {
+            name: {
+                **{k: v for k, v in source.items() if k not in ("seconds", *STAGES)},
+                "seconds": _median([r["sources"][name]["seconds"] for r in runs]),
+                **{stage: _median([r["sources"][name][stage] for r in runs]) for stage in STAGES},
+            }
+            for name, source in runs[0]["sources"].items()
+        },
+        "details": runs[0]["details"],
+        "memory": {
+            "python_peak_bytes": peak,
+            # Kilobytes on Linux, bytes on macOS
+            "max_rss_bytes": max_rss if sys.platform == "darwin" else max_rss * 1024,
+        },
+    }
+
+
+# --------------------------------------------------------------------------
+# Reports
+# --------------------------------------------------------------------------
+
+def _git(*args: str) -> str:
+    try:
+        return subprocess.run(
+            ["git", *args], capture_output=True, text=True, check=True, cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def report(rounds: int) -> dict:
+    return {
+        "benchmark": "scan",
+        "commit": _git("rev-parse", "--short", "HEAD") or "unknown",
+        "dirty": bool(_git("status", "--porcelain", "--untracked-files=no")),
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "machine": f"{platform.system()} {platform.machine()}, {os.cpu_count()} CPUs",
+        "detail_max_per_scan": DETAIL_MAX_PER_SCAN,
+        **benchmark(rounds),
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list[str]:
+    """Print the change in scan and stage medians; return the regressions."""
+    rows = [("scan", baseline["scan"]["seconds"]["median"], current["scan"]["seconds"]["median"])]
+    rows += [
+        (stage, baseline["stages"][stage]["median"], current["stages"][stage]["median"])
+        for stage in current["stages"] if stage in baseline.get("stages", {})
+    ]
+    print(f"\nvs {baseline['commit']} ({baseline['created_at'][:10]}), threshold +{threshold:.0%}")
+    regressions = []
+    for name, before, after in rows:
+        change = (after - before) / before if before else 0.0
+        # Stages under 10 ms are mostly noise at this size
+        slower = change > threshold and after - before > 0.01
+        print(f"  {name:<8} {before:8.3f} s -> {after:8.3f} s  {change:+7.1%}{'  REGRESSION' if slower else ''}")
+        if slower:
+            regressions.append(name)
+    if current["scan"]["found"] != baseline["scan"]["found"]:
+        print(f"  found    {baseline['scan']['found']} -> {current['scan']['found']} jobs: "
+              "the parsers changed, timings are not comparable")
+    return regressions
+
+
+def print_report(result: dict):
+    scan = result["scan"]
+    print(f"Scan of {len(result['sources'])} sources, {result['rounds']} rounds (commit {result['commit']}"
+          f"{', dirty' if result['dirty'] else ''})")
+    print(f"  total    {scan['seconds']['median']:8.3f} s median ({scan['seconds']['min']:.3f} - "
+          f"{scan['seconds']['max']:.3f}), {scan['found']} found, {scan['new']} new, "
+          f"{scan['found_per_second']:.0f} found/s")
+    for stage, times in result["stages"].items():
+        print(f"  {stage:<8} {times['median']:8.3f} s")
+    for name, source in result["sources"].items():
+        print(f"    {name:<15} {source['seconds']:7.3f} s  {source['requests']:>4} requests  "
+              f"{source['bytes']:>9,} bytes  {source['found']:>4} found")
+    memory = result["memory"]
+    print(f"  memory   {memory['python_peak_bytes'] / 2**20:.1f} MiB Python peak, "
+          f"{memory['max_rss_bytes'] / 2**20:.1f} MiB max RSS")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=ROUNDS)
+    parser.add_argument("--output", type=Path, help="report path (default: results/scan-<commit>.json)")
+    parser.add_argument("--compare", type=Path, help="earlier report to check against")
+    parser.add_argument("--threshold", type=float, default=THRESHOLD, help="allowed slowdown (0.2 = 20%%)")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.ERROR)
+
+    result = report(args.rounds)
+    print_report(result)
+    output = args.output or RESULTS / f"scan-{result['commit']}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(result, indent=2) + "\n")
+    print(f"\nReport written to {output}")
+
+    if args.compare:
+        regressions = compare(result, json.loads(args.compare.read_text()), args.threshold)
+        if regressions:
+            print(f"Slower than allowed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()